@@ -0,0 +1,44 @@
+"""Measure the memory held by 100k missing-test results.
+
+Compares the ``list[Path]`` that ``find_missing_tests`` used to return with a
+``MirrorReport`` holding the same entries. Run with::
+
+    python benchmarks/report_memory.py [ENTRIES]
+"""
+
+import sys
+import tracemalloc
+from pathlib import Path
+
+from pytest_mirror.report import MirrorReport
+
+# Module-specific constants
+DEFAULT_ENTRIES = 100_000
+ROOT = Path("/project/tests")
+
+
+def traced_bytes(build) -> int:
+    """Return the bytes still allocated by build's result once it returns."""
+    tracemalloc.start()
+    value = build()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del value
+    return size
+
+
+def main(entries: int = DEFAULT_ENTRIES) -> None:
+    """Print memory per 100k entries for both result types."""
+    # The strings already exist in the mirror map, so neither side pays for them.
+    names = [f"pkg{i % 100}/sub{i % 7}/test_mod{i}.py" for i in range(entries)]
+    scale = 100_000 / entries
+    results = {
+        "list[Path]": traced_bytes(lambda: [ROOT / name for name in names]),
+        "MirrorReport": traced_bytes(lambda: MirrorReport(ROOT, names)),
+    }
+    for label, size in results.items():
+        print(f"{label:>12}: {size * scale / 2**20:8.2f} MiB per 100k entries")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_ENTRIES)
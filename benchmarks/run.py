@@ -0,0 +1,299 @@
+"""Benchmark pytest-mirror on synthetic trees and compare against a baseline.
+
+Each benchmark runs twice per tree: once untraced for wall time, and once
+under ``tracemalloc`` with file-system calls counted, for peak memory and
+syscall counts. Run from the repository root::
+
+    python benchmarks/run.py --output results.json
+    python benchmarks/run.py --sizes 1000,10000 --baseline results.json
+
+The exit status is 1 when any metric regressed past the threshold.
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections import Counter
+from collections.abc import Callable
+from pathlib import Path
+from typing import Self
+
+import pytest
+from trees import SHAPES, Tree, build_tree, write_tests
+
+from pytest_mirror import cli, find_missing_tests, generate_missing_tests
+
+# Module-specific constants
+DEFAULT_SIZES = (1_000, 10_000, 100_000)
+DEFAULT_THRESHOLD = 0.2
+DEFAULT_REPEAT = 3
+RESULTS_VERSION = 1
+# Noise floors below which differences are not treated as regressions.
+MIN_WALL_S = 0.01
+MIN_PEAK_MIB = 1.0
+MIN_SYSCALLS = 100
+COUNTED_AUDIT_EVENTS = frozenset({"open", "os.scandir", "os.listdir", "os.mkdir"})
+
+
+class SyscallCounter:
+    """Count file-system calls made through ``os`` while active.
+
+    ``stat``-family calls are counted by wrapping the ``os`` functions, the
+    rest through audit events, which cannot be removed once installed, so a
+    single hook is shared and only counts while a counter is active.
+    """
+
+    _active: "SyscallCounter | None" = None
+    _hook_installed = False
+
+    def __init__(self) -> None:
+        """Create an inactive counter."""
+        self.counts: Counter[str] = Counter()
+        self._originals: dict[str, Callable] = {}
+
+    @classmethod
+    def _audit(cls, event: str, args: tuple) -> None:
+        """Count audited events while a counter is active."""
+        if cls._active is not None and event in COUNTED_AUDIT_EVENTS:
+            cls._active.counts[event.removeprefix("os.")] += 1
+
+    def _wrap(self, name: str) -> Callable:
+        """Return a counting wrapper around the saved ``os`` function."""
+        original = self._originals[name]
+        counts = self.counts
+
+        def counted(*args, **kwargs):
+            counts[name] += 1
+            return original(*args, **kwargs)
+
+        return counted
+
+    def __enter__(self) -> Self:
+        """Start counting."""
+        if not SyscallCounter._hook_installed:
+            sys.addaudithook(SyscallCounter._audit)
+            SyscallCounter._hook_installed = True
+        for name in ("stat", "lstat"):
+            self._originals[name] = getattr(os, name)
+            setattr(os, name, self._wrap(name))
+        SyscallCounter._active = self
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        """Stop counting and restore the wrapped functions."""
+        SyscallCounter._active = None
+        for name, original in self._originals.items():
+            setattr(os, name, original)
+
+
+def measure(
+    run: Callable[[], object],
+    setup: Callable[[], object] | None = None,
+    repeat: int = DEFAULT_REPEAT,
+) -> dict:
+    """Return wall time, peak traced memory and syscall counts of run.
+
+    Wall time is the best of repeat untraced runs; setup runs untimed before
+    every run.
+    """
+    sink = io.StringIO()
+    with contextlib.redirect_stdout(sink), contextlib.redirect_stderr(sink):
+        wall = float("inf")
+        for _ in range(repeat):
+            if setup is not None:
+                setup()
+            start = time.perf_counter()
+            run()
+            wall = min(wall, time.perf_counter() - start)
+        if setup is not None:
+            setup()
+        with SyscallCounter() as counter:
+            tracemalloc.start()
+            try:
+                run()
+                peak = tracemalloc.get_traced_memory()[1]
+            finally:
+                tracemalloc.stop()
+    return {
+        "wall_s": round(wall, 6),
+        "peak_mib": round(peak / 2**20, 3),
+        "syscalls": dict(sorted(counter.counts.items())),
+    }
+
+
+def _run_cli(tree: Tree) -> None:
+    """Run ``pytest-mirror validate`` in-process."""
+    argv = sys.argv
+    sys.argv = [
+        "pytest-mirror",
+        "validate",
+        "--package-dir",
+        str(tree.package_dir),
+        "--tests-dir",
+        str(tree.tests_dir),
+    ]
+    try:
+        cli.main(cwd=tree.root)
+    finally:
+        sys.argv = argv
+
+
+def _run_plugin(tree: Tree) -> None:
+    """Run a pytest session that only validates, measuring plugin overhead."""
+    pytest.main(
+        [
+            "-q",
+            "-p",
+            "no:mirror",
+            "-p",
+            "pytest_mirror.plugin",
+            "-p",
+            "no:cacheprovider",
+            "--rootdir",
+            str(tree.root),
+            "--mirror-only",
+            "--mirror-full",
+            "--mirror-no-generate",
+            "--mirror-package-dir",
+            str(tree.package_dir),
+            "--mirror-tests-dir",
+            str(tree.tests_dir),
+            str(tree.tests_dir),
+        ]
+    )
+
+
+def benchmark_tree(tree: Tree, repeat: int = DEFAULT_REPEAT) -> dict[str, dict]:
+    """Run every benchmark against one tree."""
+    return {
+        "find_missing_tests": measure(
+            lambda: find_missing_tests(tree.package_dir, tree.tests_dir),
+            repeat=repeat,
+        ),
+        "cli_validate": measure(lambda: _run_cli(tree), repeat=repeat),
+        "plugin_sessionstart": measure(lambda: _run_plugin(tree), repeat=repeat),
+        "generate_missing_tests": measure(
+            lambda: generate_missing_tests(tree.package_dir, tree.tests_dir),
+            setup=lambda: write_tests(tree),
+            repeat=repeat,
+        ),
+    }
+
+
+def run(
+    sizes: list[int], shapes: list[str], workdir: Path, repeat: int = DEFAULT_REPEAT
+) -> dict:
+    """Build each tree under workdir, benchmark it and return all results."""
+    results: dict[str, dict] = {}
+    for size in sizes:
+        for shape in shapes:
+            case = f"{shape}-{size}"
+            print(f"[bench] {case}", file=sys.stderr)
+            tree = build_tree(workdir / case, size, shape)
+            for name, metrics in benchmark_tree(tree, repeat).items():
+                results[f"{case}/{name}"] = metrics
+    return {
+        "version": RESULTS_VERSION,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results,
+    }
+
+
+def compare(current: dict, baseline: dict, threshold: float) -> list[str]:
+    """Return a description of every metric that regressed past threshold.
+
+    Values under the noise floors are raised to them first, so tiny absolute
+    changes on fast benchmarks are not reported.
+    """
+    regressions = []
+    for key, metrics in current["results"].items():
+        base = baseline.get("results", {}).get(key)
+        if base is None:
+            continue
+        pairs = {
+            "wall_s": (metrics["wall_s"], base["wall_s"], MIN_WALL_S),
+            "peak_mib": (metrics["peak_mib"], base["peak_mib"], MIN_PEAK_MIB),
+            "syscalls": (
+                sum(metrics["syscalls"].values()),
+                sum(base["syscalls"].values()),
+                MIN_SYSCALLS,
+            ),
+        }
+        for metric, (value, reference, floor) in pairs.items():
+            if max(value, floor) > max(reference, floor) * (1 + threshold):
+                regressions.append(
+                    f"{key} {metric}: {reference} -> {value} "
+                    f"(+{(value / max(reference, floor) - 1):.0%})"
+                )
+    return regressions
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    """Parse benchmark command-line arguments."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--sizes",
+        default=",".join(map(str, DEFAULT_SIZES)),
+        help="Comma-separated module counts (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--shapes",
+        default=",".join(SHAPES),
+        help="Comma-separated tree shapes (default: %(default)s)",
+    )
+    parser.add_argument("--output", type=Path, help="Write results to this JSON file")
+    parser.add_argument(
+        "--baseline", type=Path, help="Compare against this saved results file"
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help="Allowed relative growth before a metric counts as a regression "
+        "(default: %(default)s)",
+    )
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=DEFAULT_REPEAT,
+        help="Timed runs per benchmark; the fastest counts (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--workdir", type=Path, help="Build trees here instead of a temp directory"
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Run the benchmarks and return the process exit status."""
+    args = parse_args(argv)
+    sizes = [int(size) for size in args.sizes.split(",")]
+    shapes = args.shapes.split(",")
+    with tempfile.TemporaryDirectory(prefix="pytest-mirror-bench-") as tmp:
+        current = run(sizes, shapes, args.workdir or Path(tmp), args.repeat)
+
+    text = json.dumps(current, indent=2)
+    if args.output:
+        args.output.write_text(text + "\n")
+    else:
+        print(text)
+
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text())
+        regressions = compare(current, baseline, args.threshold)
+        for line in regressions:
+            print(f"[regression] {line}", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,112 @@
+"""Synthetic package/tests trees for the pytest-mirror benchmarks.
+
+A tree has a package of empty modules, a tests tree mirroring every other
+module, and gitignored noise directories full of Python files that a walker
+must prune without listing.
+"""
+
+import shutil
+from dataclasses import dataclass
+from pathlib import Path
+
+# Module-specific constants
+SHAPES = ("shallow", "deep")
+SHALLOW_FILES_PER_DIR = 100
+DEEP_FANOUT = 4
+DEEP_DEPTH = 6
+NOISE_DIRS = ("build", ".venv")
+NOISE_RATIO = 0.5
+GITIGNORE = "".join(f"{name}/\n" for name in NOISE_DIRS) + "__pycache__/\n"
+PACKAGE_NAME = "pkg"
+TESTS_NAME = "tests"
+
+
+@dataclass(frozen=True)
+class Tree:
+    """Locations and parameters of a generated tree."""
+
+    root: Path
+    modules: int
+    shape: str
+
+    @property
+    def package_dir(self) -> Path:
+        """Return the mirrored package directory."""
+        return self.root / "src" / PACKAGE_NAME
+
+    @property
+    def tests_dir(self) -> Path:
+        """Return the tests directory."""
+        return self.root / TESTS_NAME
+
+
+def module_paths(modules: int, shape: str) -> list[str]:
+    """Return POSIX module paths relative to the package for a shape.
+
+    ``shallow`` puts 100 modules in each top-level subpackage; ``deep`` spreads
+    them over subpackages six levels deep with a fan-out of four.
+
+    Raises:
+        ValueError: If shape is unknown.
+    """
+    if shape == "shallow":
+        return [f"sub{i // SHALLOW_FILES_PER_DIR}/mod{i}.py" for i in range(modules)]
+    if shape == "deep":
+        return [
+            "/".join(
+                f"d{(i // DEEP_FANOUT**level) % DEEP_FANOUT}"
+                for level in range(DEEP_DEPTH)
+            )
+            + f"/mod{i}.py"
+            for i in range(modules)
+        ]
+    raise ValueError(f"Unknown tree shape {shape!r} (use {', '.join(SHAPES)})")
+
+
+def _touch(path: Path, created: set[Path]) -> None:
+    """Create an empty file, creating its parent directories once."""
+    if path.parent not in created:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        created.add(path.parent)
+    path.touch()
+
+
+def _write_noise(directory: Path, paths: list[str], created: set[Path]) -> None:
+    """Fill the gitignored noise directories below directory."""
+    for i, module in enumerate(paths[: int(len(paths) * NOISE_RATIO)]):
+        _touch(directory / NOISE_DIRS[i % len(NOISE_DIRS)] / module, created)
+
+
+def write_tests(tree: Tree) -> None:
+    """(Re)create the tests tree with a test for every other module."""
+    shutil.rmtree(tree.tests_dir, ignore_errors=True)
+    created: set[Path] = set()
+    paths = module_paths(tree.modules, tree.shape)
+    for i, module in enumerate(paths):
+        if i % 2 == 0:
+            head, _, name = module.rpartition("/")
+            _touch(tree.tests_dir / head / f"test_{name}", created)
+    _write_noise(tree.tests_dir, paths, created)
+
+
+def build_tree(root: Path, modules: int, shape: str) -> Tree:
+    """Generate a package, half of its tests and ignored noise under root.
+
+    Args:
+        root (Path): Empty directory to build in; it becomes a git work tree.
+        modules (int): Number of package modules.
+        shape (str): One of ``SHAPES``.
+
+    Returns:
+        Tree: The generated tree.
+    """
+    tree = Tree(root, modules, shape)
+    (root / ".git").mkdir(parents=True, exist_ok=True)
+    (root / ".gitignore").write_text(GITIGNORE)
+    created: set[Path] = set()
+    paths = module_paths(modules, shape)
+    for module in paths:
+        _touch(tree.package_dir / module, created)
+    _write_noise(tree.package_dir, paths, created)
+    write_tests(tree)
+    return tree
@@ -1,9 +1,50 @@
 """pytest-mirror package root module.
 
 Provides test structure mirroring and validation plugin for pytest.
-Exposes main API functions for programmatic use.
+Exposes main API functions for programmatic use. They are imported on first
+access, so loading the pytest plugin does not pay for the whole package.
 """
 
-from .core import find_missing_tests, generate_missing_tests
+import importlib
 
-__all__ = ["generate_missing_tests", "find_missing_tests"]
+# Module-specific constants
+_LAZY_EXPORTS = {
+    "MirrorReport": ".report",
+    "build_import_graph": ".core",
+    "find_mirror_coverage": ".core",
+    "find_missing_tests": ".core",
+    "find_module_durations": ".core",
+    "find_untested_symbols": ".core",
+    "generate_missing_tests": ".core",
+    "prune_orphaned_tests": ".core",
+}
+
+__all__ = [
+    "MirrorReport",
+    "build_import_graph",
+    "find_mirror_coverage",
+    "find_missing_tests",
+    "find_module_durations",
+    "find_untested_symbols",
+    "generate_missing_tests",
+    "prune_orphaned_tests",
+]
+
+
+def __getattr__(name: str) -> object:
+    """Import a public API name on first access.
+
+    Raises:
+        AttributeError: If name is not part of the API.
+    """
+    module = _LAZY_EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    """List the module attributes, including not yet imported API names."""
+    return sorted({*globals(), *__all__})
@@ -0,0 +1,108 @@
+"""On-disk cache helpers for pytest-mirror.
+
+Cache files live next to pytest's own cache, in ``.pytest_cache/d/pytest-mirror``,
+so the CLI and the pytest plugin share them and ``pytest --cache-clear`` style
+cleanups remove them along with pytest's data.
+"""
+
+import json
+import os
+import tempfile
+from pathlib import Path
+
+from .constants import PROJECT_NAME
+
+# Module-specific constants
+PYTEST_CACHE_DIR_NAME = ".pytest_cache"
+CACHE_SUBDIR = Path("d") / PROJECT_NAME
+CACHE_DIR_INI_OPTION = "cache_dir"
+DEFAULT_FILE_MODE = 0o666
+
+
+def default_cache_dir(root: Path | None = None) -> Path:
+    """Return the pytest-mirror cache directory for a project root.
+
+    Args:
+        root (Path | None): Project root; defaults to the current directory.
+
+    Returns:
+        Path: ``<root>/.pytest_cache/d/pytest-mirror`` (not created).
+    """
+    if root is None:
+        root = Path.cwd()
+    return root / PYTEST_CACHE_DIR_NAME / CACHE_SUBDIR
+
+
+def project_cache_dir(start: Path, pytest_cache_dir: Path | None = None) -> Path:
+    """Return the pytest-mirror cache directory pytest uses for start.
+
+    The plugin stores its data in pytest's cache, which lives in the
+    ``cache_dir`` ini option, relative to the project root, or in
+    ``.pytest_cache`` there. The project root is the directory of the nearest
+    ``pyproject.toml``, or start itself.
+
+    Args:
+        start (Path): A directory inside the project.
+        pytest_cache_dir (Path | None): pytest's cache directory, overriding
+            the configured one.
+
+    Returns:
+        Path: ``<pytest cache>/d/pytest-mirror`` (not created).
+    """
+    from .config import find_pyproject, read_pytest_option
+
+    if pytest_cache_dir is not None:
+        return pytest_cache_dir / CACHE_SUBDIR
+    pyproject = find_pyproject(start)
+    if pyproject is None:
+        return default_cache_dir(start)
+    root = pyproject.parent
+    value = read_pytest_option(pyproject, CACHE_DIR_INI_OPTION)
+    if value is None:
+        return default_cache_dir(root)
+    return root / Path(os.path.expandvars(value)).expanduser() / CACHE_SUBDIR
+
+
+def _umask() -> int:
+    """Return the process umask, which can only be read by setting it."""
+    mask = os.umask(0)
+    os.umask(mask)
+    return mask
+
+
+def atomic_write_text(path: Path, text: str) -> None:
+    """Write text so readers see either the old or the new file, never a mix.
+
+    The data goes to a temporary file in the same directory, which then
+    replaces path in a single rename. The temporary file is created private,
+    so it gets the mode a plain ``open`` would have given path before the
+    rename, keeping e.g. metrics files readable by their collector.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.")
+    try:
+        if hasattr(os, "fchmod"):
+            os.fchmod(fd, DEFAULT_FILE_MODE & ~_umask())
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(text)
+        Path(tmp_name).replace(path)
+    except BaseException:
+        Path(tmp_name).unlink(missing_ok=True)
+        raise
+
+
+def load_json(path: Path) -> object | None:
+    """Load a JSON cache file, or None if it is missing or unreadable."""
+    try:
+        with path.open(encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def save_json(path: Path, data: object) -> None:
+    """Atomically write a JSON cache file, ignoring unwritable locations."""
+    try:
+        atomic_write_text(path, json.dumps(data, separators=(",", ":")))
+    except OSError:
+        pass
@@ -1,37 +1,114 @@
 """Command-line interface for pytest-mirror.
 
 Provides commands to generate and validate mirrored test structure for a package.
+Walking, mapping and plugin manager code is imported when a command runs, so
+``--help`` and usage errors stay fast.
 """
 
 import argparse
 import sys
-import tomllib
 from pathlib import Path
+from typing import TYPE_CHECKING
 
-from .constants import MIRROR_PREFIX
-from .core import generate_missing_tests
-from .plugin_manager import get_plugin_manager
+from .config import load_config
+from .constants import (
+    DEFAULT_TREND_RUNS,
+    MIRROR_PREFIX,
+    STUB_MODE_PLACEHOLDER,
+    STUB_MODES,
+)
+from .profiling import (
+    COUNTER_MISSING,
+    PHASE_AUTO_DETECTION,
+    PHASE_PATH_RESOLUTION,
+    PHASE_PLUGIN_MANAGER,
+    PhaseProfile,
+    activate,
+    active,
+    count,
+    phase,
+)
+from .report import MirrorReport
+
+if TYPE_CHECKING:
+    import pluggy
 
 # Module-specific constants
 ERROR_PREFIX = "[ERROR]"
+PROFILE_HEADER = f"{MIRROR_PREFIX} Profile:"
 USAGE_MESSAGE = (
-    "usage: pytest-mirror [generate|validate] [--package-dir ...] [--tests-dir ...]"
+    "usage: pytest-mirror [generate|validate|prune|stale|coverage|durations] "
+    "[--package-dir ...] "
+    "[--tests-dir ...]"
+)
+ORPHANS_MESSAGE = "Orphaned tests (no mirrored source module):"
+PLACEHOLDERS_MESSAGE = "Unmodified placeholder tests:"
+STALE_TESTS_MESSAGE = "Modules modified after their mirrored tests:"
+NO_STALE_TESTS_MESSAGE = "No module was modified after its mirrored tests."
+COVERAGE_MESSAGE = (
+    "Lines executed by the mirrored tests, of those the whole run executed:"
 )
+UNCOVERED_MESSAGE = "Mirrored tests below {min_percent:g}% of their module:"
+NO_COVERAGE_MESSAGE = "No mirrored test has coverage data."
+DURATIONS_MESSAGE = "Slowest mirrored tests, latest run (trend over recent runs):"
+NO_DURATIONS_MESSAGE = "No test durations recorded; run pytest with --mirror-durations."
+DEFAULT_TOP = 10
+PRUNE_SUMMARY = "{removed} placeholder orphan(s) {action}; {kept} orphan(s) kept."
+
+
+def _plugin_manager() -> "pluggy.PluginManager":
+    """Create the plugin manager, timing its hooks when profiling."""
+    with phase(PHASE_PLUGIN_MANAGER):
+        from .plugin_manager import get_plugin_manager
+
+        pm = get_plugin_manager()
+    profile = active()
+    if profile is not None:
+        profile.monitor_hooks(pm)
+    return pm
+
+
+def _find_report(
+    package_dir: Path,
+    tests_dir: Path,
+    stale: bool = False,
+    placeholders: bool = False,
+) -> MirrorReport:
+    """Return missing and orphaned tests from every validation hook."""
+    pm = _plugin_manager()
+    missing_tests_nested = pm.hook.validate_test_structure(
+        package_dir=package_dir,
+        tests_dir=tests_dir,
+        test_files=None,
+        stale=stale,
+        placeholders=placeholders,
+    )
+    missing_tests = MirrorReport.combine(missing_tests_nested)
+    count(COUNTER_MISSING, len(missing_tests))
+    return missing_tests
 
 
-def validate_missing_tests(package_dir: Path, tests_dir: Path) -> None:
+def validate_missing_tests(
+    package_dir: Path,
+    tests_dir: Path,
+    symbols: bool = False,
+    placeholders: bool = False,
+    pytest_cache_dir: Path | None = None,
+) -> None:
     """Validate if any tests are missing without generating files.
 
     Args:
         package_dir (Path): Path to the package directory to check.
         tests_dir (Path): Path to the tests directory to check against.
+        symbols (bool): Also check that every public function, class and
+            method has a test named after it.
+        placeholders (bool): Also list the test files that are still
+            unmodified placeholder stubs.
+        pytest_cache_dir (Path | None): pytest's cache directory, holding the
+            symbol cache; defaults to the one pytest uses for the current
+            directory.
     """
-    pm = get_plugin_manager()
-    missing_tests_nested = pm.hook.validate_test_structure(
-        package_dir=package_dir,
-        tests_dir=tests_dir,
-    )
-    missing_tests = [item for sublist in missing_tests_nested for item in sublist]
+    missing_tests = _find_report(package_dir, tests_dir, placeholders=placeholders)
 
     if missing_tests:
         print(f"{MIRROR_PREFIX} Missing tests detected:")
@@ -39,53 +116,194 @@ def validate_missing_tests(package_dir: Path, tests_dir: Path) -> None:
             print(f"  - {path}")
     else:
         print(f"{MIRROR_PREFIX} All tests are in place!")
+    if missing_tests.orphans:
+        print(f"{MIRROR_PREFIX} {ORPHANS_MESSAGE}")
+        for path in missing_tests.orphans:
+            print(f"  - {path}")
+    if missing_tests.placeholders:
+        print(f"{MIRROR_PREFIX} {PLACEHOLDERS_MESSAGE}")
+        for path in missing_tests.placeholders:
+            print(f"  - {path}")
+
+    if symbols:
+        from .cache import project_cache_dir
+        from .core import find_untested_symbols
+
+        cache_dir = project_cache_dir(Path.cwd(), pytest_cache_dir)
+        print_untested_symbols(
+            find_untested_symbols(package_dir, tests_dir, cache_dir=cache_dir)
+        )
+
+
+def prune_orphans(package_dir: Path, tests_dir: Path, dry_run: bool = False) -> None:
+    """Delete orphaned tests that still contain only the placeholder stub.
+
+    Args:
+        package_dir (Path): Path to the package directory.
+        tests_dir (Path): Path to the tests directory to prune.
+        dry_run (bool): List the files instead of deleting them.
+    """
+    from .core import prune_orphaned_tests
+
+    orphans = _find_report(package_dir, tests_dir).orphans
+    removed = prune_orphaned_tests(orphans, dry_run=dry_run)
+    for path in removed:
+        print(f"{'Would remove' if dry_run else 'Removed'}: {path}")
+    print(
+        f"{MIRROR_PREFIX} "
+        + PRUNE_SUMMARY.format(
+            removed=len(removed),
+            action="to remove" if dry_run else "removed",
+            kept=len(orphans) - len(removed),
+        )
+    )
+
+
+def print_stale_tests(package_dir: Path, tests_dir: Path, rank: bool = False) -> None:
+    """Print the modules modified after their mirrored tests.
+
+    Args:
+        package_dir (Path): Path to the package directory.
+        tests_dir (Path): Path to the tests directory.
+        rank (bool): Order by how stale the tests are instead of by path.
+    """
+    stale = _find_report(package_dir, tests_dir, stale=True).stale
+    if not stale:
+        print(f"{MIRROR_PREFIX} {NO_STALE_TESTS_MESSAGE}")
+        return
+    if rank:
+        stale = sorted(stale, key=lambda entry: entry.lag, reverse=True)
+    print(f"{MIRROR_PREFIX} {STALE_TESTS_MESSAGE}")
+    for entry in stale:
+        print(f"  - {entry.format()}")
 
 
-def _find_subdirs(path: Path, exclude_names: set[str] | None = None) -> list[Path]:
-    """Find non-hidden subdirectories, excluding specified names."""
-    if exclude_names is None:
-        exclude_names = set()
-    return [
-        d
-        for d in path.iterdir()
-        if d.is_dir() and not d.name.startswith(".") and d.name not in exclude_names
+def print_mirror_coverage(
+    package_dir: Path,
+    tests_dir: Path,
+    data_file: Path | None = None,
+    min_percent: float = 0.0,
+) -> None:
+    """Print each module's coverage by its mirrored tests and flag the low ones.
+
+    Tests that execute none of their module's lines are always flagged.
+
+    Args:
+        package_dir (Path): Path to the package directory.
+        tests_dir (Path): Path to the tests directory.
+        data_file (Path | None): coverage.py data file recorded with test
+            contexts; defaults to ``$COVERAGE_FILE`` or ``.coverage``.
+        min_percent (float): Flag mirrored tests below this share.
+    """
+    from .core import find_mirror_coverage
+    from .coverage_data import default_data_file
+    from .mapping import hook_strategy
+
+    if data_file is None:
+        data_file = default_data_file()
+    pm = _plugin_manager()
+    mapping = hook_strategy(pm.hook.mirror_map_test_paths, package_dir, tests_dir)
+    try:
+        entries = find_mirror_coverage(
+            package_dir, tests_dir, data_file, mapping=mapping
+        )
+    except (FileNotFoundError, ValueError) as exc:
+        print(f"{ERROR_PREFIX} {exc}", file=sys.stderr)
+        sys.exit(1)
+    if not entries:
+        print(f"{MIRROR_PREFIX} {NO_COVERAGE_MESSAGE}")
+        return
+    print(f"{MIRROR_PREFIX} {COVERAGE_MESSAGE}")
+    for entry in entries:
+        print(f"  - {entry.format()}")
+    low = [
+        entry
+        for entry in entries
+        if not entry.test_lines or entry.percent < min_percent
     ]
+    if low:
+        print(f"{MIRROR_PREFIX} {UNCOVERED_MESSAGE.format(min_percent=min_percent)}")
+        for entry in low:
+            print(f"  - {entry.format()}")
 
 
-def detect_default_package_dir() -> Path:
+def print_module_durations(
+    package_dir: Path,
+    tests_dir: Path,
+    runs: int,
+    top: int = DEFAULT_TOP,
+    pytest_cache_dir: Path | None = None,
+) -> None:
+    """Print the modules whose mirrored tests took longest, with their trend.
+
+    Args:
+        package_dir (Path): Path to the package directory.
+        tests_dir (Path): Path to the tests directory.
+        runs (int): Number of recent runs shown per module.
+        top (int): Number of modules listed; 0 lists all of them.
+        pytest_cache_dir (Path | None): pytest's cache directory; defaults to
+            the one pytest uses for the current directory.
+    """
+    from .cache import project_cache_dir
+    from .core import find_module_durations
+    from .mapping import hook_strategy
+
+    pm = _plugin_manager()
+    mapping = hook_strategy(pm.hook.mirror_map_test_paths, package_dir, tests_dir)
+    entries = find_module_durations(
+        package_dir,
+        tests_dir,
+        runs=runs,
+        cache_dir=project_cache_dir(Path.cwd(), pytest_cache_dir),
+        mapping=mapping,
+    )
+    if not entries:
+        print(f"{MIRROR_PREFIX} {NO_DURATIONS_MESSAGE}")
+        return
+    print(f"{MIRROR_PREFIX} {DURATIONS_MESSAGE}")
+    for entry in entries[:top] if top else entries:
+        print(f"  - {entry.format()}")
+
+
+def _positive_int(value: str) -> int:
+    """Parse a strictly positive integer option value."""
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {value}")
+    return number
+
+
+def print_untested_symbols(untested: dict[Path, list[str]]) -> None:
+    """Print untested public symbols grouped by source module."""
+    if not untested:
+        print(f"{MIRROR_PREFIX} All public symbols have tests!")
+        return
+    print(f"{MIRROR_PREFIX} Untested symbols detected:")
+    for module, names in untested.items():
+        print(f"  - {module}: {', '.join(names)}")
+
+
+def detect_default_package_dir(pytest_cache_dir: Path | None = None) -> Path:
     """Detect the default package directory to mirror.
 
+    Args:
+        pytest_cache_dir (Path | None): pytest's cache directory; defaults to
+            the one pytest uses for the current directory.
+
     Returns:
-        Path: Path to the detected package directory.
+        Path: Path to the detected package directory, cached in the project
+        cache of the current directory.
     """
+    from .cache import project_cache_dir
+    from .layout import cached_package_dir
+
     cwd = Path.cwd()
-    src = cwd / "src"
-    if src.exists() and src.is_dir():
-        subdirs = _find_subdirs(src)
-        if subdirs:
-            return subdirs[0]
-    # fallback: first subdir in cwd (excluding src)
-    subdirs = _find_subdirs(cwd, exclude_names={"src"})
-    if subdirs:
-        return subdirs[0]
-    # fallback: cwd
-    return cwd
+    return cached_package_dir(cwd, project_cache_dir(cwd, pytest_cache_dir))
 
 
 def _get_pyproject_config(cwd: Path | None = None) -> dict:
-    """Read pytest-mirror config from pyproject.toml if present."""
-    if cwd is None:
-        cwd = Path.cwd()
-    pyproject = cwd / "pyproject.toml"
-
-    if not pyproject.exists():
-        return {}
-    try:
-        with pyproject.open("rb") as f:
-            data = tomllib.load(f)
-        return data.get("tool", {}).get("pytest-mirror", {})
-    except (OSError, tomllib.TOMLDecodeError):
-        return {}
+    """Return the pytest-mirror settings that apply to cwd."""
+    return load_config(Path.cwd() if cwd is None else cwd)
 
 
 def parse_cli_args(cwd: Path | None = None) -> argparse.Namespace:
@@ -102,27 +320,141 @@ def parse_cli_args(cwd: Path | None = None) -> argparse.Namespace:
     default_command = config.get("default-command")
     parser.add_argument(
         "command",
-        choices=["generate", "validate"],
+        choices=["generate", "validate", "prune", "stale", "coverage", "durations"],
         nargs="?",
         default=default_command,
-        help="Command to run: 'generate' missing tests or 'validate' only.",
+        help="Command to run: 'generate' missing tests, 'validate' only, "
+        "'prune' orphaned tests that still hold only the placeholder stub, "
+        "list 'stale' tests whose module changed after them, report the "
+        "'coverage' each module gets from its mirrored tests, or list the "
+        "modules whose tests take longest with their 'durations' trend.",
     )
 
+    # Directory defaults are resolved after parsing, only when still needed.
     parser.add_argument(
         "--package-dir",
         type=Path,
-        default=config.get("package-dir", detect_default_package_dir()),
         help="Path to the main package directory (default: first subdir in ./src or ./)",
     )
 
     parser.add_argument(
         "--tests-dir",
         type=Path,
-        default=config.get("tests-dir", Path.cwd() / "tests"),
         help="Path to the tests directory (default: ./tests)",
     )
 
-    return parser.parse_args()
+    parser.add_argument(
+        "--symbols",
+        action="store_true",
+        default=config.get("symbols", False),
+        help="With validate, also require a test named after every public "
+        "function, class and method",
+    )
+
+    parser.add_argument(
+        "--placeholders",
+        action="store_true",
+        default=config.get("placeholders", False),
+        help="With validate, also list test files that are still unmodified "
+        "placeholder stubs",
+    )
+
+    parser.add_argument(
+        "--stub-mode",
+        choices=STUB_MODES,
+        default=config.get("stub-mode", STUB_MODE_PLACEHOLDER),
+        help="Content of generated tests: a 'placeholder' test, or 'ast' for one "
+        "test per public function or class (default: placeholder)",
+    )
+
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="With prune, list the files that would be deleted",
+    )
+
+    parser.add_argument(
+        "--rank",
+        action="store_true",
+        help="With stale, list the most stale modules first",
+    )
+
+    parser.add_argument(
+        "--coverage-file",
+        type=Path,
+        metavar="PATH",
+        help="With coverage, the coverage.py data file recorded with test "
+        "contexts (default: $COVERAGE_FILE or .coverage)",
+    )
+
+    parser.add_argument(
+        "--min-coverage",
+        type=float,
+        default=0.0,
+        metavar="PERCENT",
+        help="With coverage, flag mirrored tests that execute less than "
+        "PERCENT of the lines the whole run executes in their module",
+    )
+
+    parser.add_argument(
+        "--runs",
+        type=_positive_int,
+        default=DEFAULT_TREND_RUNS,
+        metavar="N",
+        help="With durations, show the trend over the last N recorded runs "
+        f"(default: {DEFAULT_TREND_RUNS})",
+    )
+
+    parser.add_argument(
+        "--top",
+        type=int,
+        default=DEFAULT_TOP,
+        metavar="K",
+        help=f"With durations, list the K slowest modules; 0 lists all "
+        f"(default: {DEFAULT_TOP})",
+    )
+
+    parser.add_argument(
+        "--cache-dir",
+        type=Path,
+        metavar="DIR",
+        help="pytest's cache directory, shared with the plugin for parse "
+        "results, durations and the detected package directory (default: the "
+        "cache_dir option pytest reads from pyproject.toml, or .pytest_cache "
+        "in the project root)",
+    )
+
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Print how long each phase of the run took",
+    )
+
+    parser.add_argument(
+        "--profile-json",
+        type=Path,
+        metavar="PATH",
+        help="Write the phase timings to PATH as JSON",
+    )
+
+    parser.add_argument(
+        "--metrics",
+        type=Path,
+        metavar="PATH",
+        help="Write run metrics to PATH: JSON for a .json suffix, OpenMetrics "
+        "(e.g. a node-exporter .prom textfile) otherwise",
+    )
+
+    args = parser.parse_args()
+    if args.package_dir is None:
+        if "package-dir" in config:
+            args.package_dir = Path(config["package-dir"])
+        else:
+            with phase(PHASE_AUTO_DETECTION):
+                args.package_dir = detect_default_package_dir(args.cache_dir)
+    if args.tests_dir is None:
+        args.tests_dir = Path(config.get("tests-dir", Path.cwd() / "tests"))
+    return args
 
 
 def process_command(args: argparse.Namespace) -> None:
@@ -132,9 +464,50 @@ def process_command(args: argparse.Namespace) -> None:
         sys.exit(2)
     match args.command:
         case "generate":
-            generate_missing_tests(args.package_dir, args.tests_dir)
+            from .cache import project_cache_dir
+            from .core import generate_missing_tests
+            from .mapping import hook_strategy
+            from .stubs import hook_renderer
+
+            pm = _plugin_manager()
+            mapping = hook_strategy(
+                pm.hook.mirror_map_test_paths, args.package_dir, args.tests_dir
+            )
+            renderer = hook_renderer(
+                pm.hook.mirror_render_stubs, args.package_dir, args.stub_mode
+            )
+            generate_missing_tests(
+                args.package_dir,
+                args.tests_dir,
+                mapping=mapping,
+                stub_mode=args.stub_mode,
+                renderer=renderer,
+                cache_dir=project_cache_dir(Path.cwd(), args.cache_dir),
+            )
         case "validate":
-            validate_missing_tests(args.package_dir, args.tests_dir)
+            validate_missing_tests(
+                args.package_dir,
+                args.tests_dir,
+                args.symbols,
+                args.placeholders,
+                args.cache_dir,
+            )
+        case "prune":
+            prune_orphans(args.package_dir, args.tests_dir, args.dry_run)
+        case "stale":
+            print_stale_tests(args.package_dir, args.tests_dir, args.rank)
+        case "coverage":
+            print_mirror_coverage(
+                args.package_dir, args.tests_dir, args.coverage_file, args.min_coverage
+            )
+        case "durations":
+            print_module_durations(
+                args.package_dir,
+                args.tests_dir,
+                args.runs,
+                args.top,
+                args.cache_dir,
+            )
         case _:
             print(f"{ERROR_PREFIX} Unknown command: {args.command}", file=sys.stderr)
             sys.exit(2)
@@ -143,12 +516,37 @@ def process_command(args: argparse.Namespace) -> None:
 def main(cwd: Path | None = None) -> None:
     """CLI entry point for pytest-mirror.
 
-    Handles argument parsing and dispatches to generate or validate commands.
+    Handles argument parsing and dispatches to the generate, validate, prune,
+    stale, coverage or durations commands.
     Optionally specify cwd for testability.
     """
-    args = parse_cli_args(cwd=cwd)
+    profile = PhaseProfile()
+    activate(profile)
+    try:
+        with phase(PHASE_PATH_RESOLUTION):
+            args = parse_cli_args(cwd=cwd)
+
+        print(f"{MIRROR_PREFIX} Using package_dir: {args.package_dir}")
+        print(f"{MIRROR_PREFIX} Using tests_dir: {args.tests_dir}")
+
+        from .mapping import MappingCollision
+        from .walker import FileLimitExceeded
+
+        try:
+            process_command(args)
+        except (FileLimitExceeded, MappingCollision) as exc:
+            print(f"{ERROR_PREFIX} {exc}", file=sys.stderr)
+            sys.exit(1)
+    finally:
+        activate(None)
 
-    print(f"{MIRROR_PREFIX} Using package_dir: {args.package_dir}")
-    print(f"{MIRROR_PREFIX} Using tests_dir: {args.tests_dir}")
+    if args.profile:
+        print(PROFILE_HEADER)
+        for line in profile.format_lines():
+            print(f"  {line}")
+    if args.profile_json:
+        profile.write_json(args.profile_json)
+    if args.metrics:
+        from .metrics import write_metrics
 
-    process_command(args)
+        write_metrics(args.metrics, profile)
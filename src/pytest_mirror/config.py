@@ -0,0 +1,125 @@
+"""Configuration loading for pytest-mirror.
+
+Settings live in the ``[tool.pytest-mirror]`` table of the ``pyproject.toml``
+nearest to the mirrored package, so each subproject of a monorepo can carry its
+own. The CLI, the pytest plugin and the Python API all read them through
+``load_config``, which parses each file once per process and again only when
+its modification time or size changes.
+
+Recognized keys:
+
+- ``package-dir``, ``tests-dir``: directories to mirror (CLI and plugin)
+- ``mapping``: source-to-test mapping strategy
+- ``max-files``: file ceiling of a walk; 0 disables it
+- ``symbols``: also require tests named after public symbols
+- ``placeholders``: also list unmodified placeholder tests (CLI validate)
+- ``durations``: record test durations per mirrored module (plugin)
+- ``stub-mode``: content of generated tests (CLI)
+- ``default-command``: command run by a bare ``pytest-mirror`` (CLI)
+- ``auto-generate``, ``disable-auto-generate``: stub generation (plugin)
+"""
+
+import threading
+from pathlib import Path
+
+# Module-specific constants
+PYPROJECT_FILE_NAME = "pyproject.toml"
+TOOL_SECTION = "pytest-mirror"
+PYTEST_SECTION = "pytest"
+PYTEST_INI_OPTIONS = "ini_options"
+
+_cache: dict[Path, tuple[tuple[int, int], dict]] = {}
+_cache_lock = threading.Lock()
+
+
+def find_pyproject(start: Path) -> Path | None:
+    """Return the nearest ``pyproject.toml`` at or above start, if any."""
+    start = start.absolute()
+    for directory in (start, *start.parents):
+        candidate = directory / PYPROJECT_FILE_NAME
+        if candidate.is_file():
+            return candidate
+    return None
+
+
+def _parse_tool_config(pyproject: Path) -> dict:
+    """Parse the ``[tool.pytest-mirror]`` table, or an empty dict on any error."""
+    import tomllib
+
+    try:
+        with pyproject.open("rb") as f:
+            data = tomllib.load(f)
+    except (OSError, tomllib.TOMLDecodeError):
+        return {}
+    table = data.get("tool", {}).get(TOOL_SECTION, {})
+    return table if isinstance(table, dict) else {}
+
+
+def read_pytest_option(pyproject: Path, name: str) -> str | None:
+    """Return a pytest ini option set in pyproject, if any.
+
+    Options are read from ``[tool.pytest.ini_options]``, or from pytest's
+    native ``[tool.pytest]`` table.
+    """
+    import tomllib
+
+    try:
+        with pyproject.open("rb") as f:
+            data = tomllib.load(f)
+    except (OSError, tomllib.TOMLDecodeError):
+        return None
+    table = data.get("tool", {}).get(PYTEST_SECTION, {})
+    if not isinstance(table, dict):
+        return None
+    ini_options = table.get(PYTEST_INI_OPTIONS)
+    if isinstance(ini_options, dict) and name in ini_options:
+        table = ini_options
+    value = table.get(name)
+    return value if isinstance(value, str) else None
+
+
+def read_tool_config(pyproject: Path) -> dict:
+    """Return the ``[tool.pytest-mirror]`` table of pyproject.
+
+    Parsed tables are cached by path and reused while the file's modification
+    time and size are unchanged; callers must not modify the returned dict.
+
+    Returns:
+        dict: The table, or an empty dict if the file is missing or malformed.
+    """
+    try:
+        st = pyproject.stat()
+    except OSError:
+        return {}
+    key = pyproject.absolute()
+    stamp = (st.st_mtime_ns, st.st_size)
+    with _cache_lock:
+        cached = _cache.get(key)
+    if cached is not None and cached[0] == stamp:
+        return cached[1]
+    table = _parse_tool_config(pyproject)
+    with _cache_lock:
+        _cache[key] = (stamp, table)
+    return table
+
+
+def load_config(start: Path) -> dict:
+    """Return the settings that apply to start.
+
+    Args:
+        start (Path): A package, tests or project directory.
+
+    Returns:
+        dict: The ``[tool.pytest-mirror]`` table of the nearest
+        ``pyproject.toml`` at or above start, or an empty dict.
+    """
+    pyproject = find_pyproject(start)
+    if pyproject is None:
+        return {}
+    return read_tool_config(pyproject)
+
+
+def clear_cache() -> None:
+    """Forget every parsed file, forcing the next read to parse again."""
+    with _cache_lock:
+        _cache.clear()
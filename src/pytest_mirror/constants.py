@@ -7,6 +7,9 @@ PACKAGE_NAME = "pytest_mirror"  # Python package name (for pluggy)
 # Logging prefixes
 MIRROR_PREFIX = "[MIRROR]"
 
+# Recorded runs the durations trend covers by default
+DEFAULT_TREND_RUNS = 5
+
 # Default test file content
 DEFAULT_TEST_CONTENT = """import pytest
 
@@ -14,3 +17,17 @@ DEFAULT_TEST_CONTENT = """import pytest
 def test_placeholder():
     assert False, 'This is a placeholder test. Please implement.'
 """
+
+# Content of generated tests: the placeholder, or one test per public symbol
+STUB_MODE_PLACEHOLDER = "placeholder"
+STUB_MODE_AST = "ast"
+STUB_MODES = (STUB_MODE_PLACEHOLDER, STUB_MODE_AST)
+
+# AST skeleton test content, one test per public function or class
+SKELETON_HEADER = """import pytest
+"""
+SKELETON_TEST_TEMPLATE = """
+
+def test_{test_name}():
+    assert False, 'Test for {symbol} is not implemented.'
+"""
@@ -1,13 +1,42 @@
 """Core logic for pytest-mirror: validation and generation of test structure."""
 
+import os
+from collections.abc import Iterable
 from pathlib import Path
 
-from .constants import DEFAULT_TEST_CONTENT
+from .config import load_config
+from .coverage_data import MirrorCoverage, mirror_coverage
+from .durations import (
+    DEFAULT_TREND_RUNS,
+    DurationHistory,
+    ModuleDuration,
+    module_durations,
+)
+from .imports import ImportGraph, load_import_graph
+from .mapping import MappingStrategy, MirrorMap, resolve_strategy
+from .profiling import (
+    COUNTER_DIRS_PRUNED,
+    COUNTER_GENERATED,
+    COUNTER_MISSING,
+    COUNTER_MODULES_SCANNED,
+    COUNTER_TESTS_FOUND,
+    PHASE_SOURCE_WALK,
+    PHASE_STUB_RENDER,
+    PHASE_STUB_WRITES,
+    PHASE_TESTS_WALK,
+    count,
+    phase,
+)
+from .report import MirrorReport, StaleTest
+from .stubs import STUB_MODE_PLACEHOLDER, Renderer, is_placeholder, render_stubs
+from .symbols import SymbolCache, index_test_names, parse_modules, untested_symbols
+from .walker import DEFAULT_MAX_FILES, SymlinkPolicy, TreeWalker
 
 # Module-specific constants
 INIT_FILE_NAME = "__init__.py"
-TEST_FILE_PREFIX = "test_"
 ALL_TESTS_PRESENT_MESSAGE = "All tests are in place"
+MAX_FILES_CONFIG_KEY = "max-files"
+NANOSECONDS = 1e9
 
 
 def _validate_package_dir(package_dir: Path) -> None:
@@ -23,23 +52,422 @@ def _validate_package_dir(package_dir: Path) -> None:
         raise NotADirectoryError(f"Package directory is not a directory: {package_dir}")
 
 
-def _get_test_path(py_file: Path, package_dir: Path, tests_dir: Path) -> Path:
-    """Generate the corresponding test file path for a Python module."""
-    relative = py_file.relative_to(package_dir)
-    return tests_dir.joinpath(relative.parent, f"{TEST_FILE_PREFIX}{relative.name}")
+def _make_walker(
+    package_dir: Path,
+    respect_gitignore: bool,
+    symlinks: SymlinkPolicy | str,
+    max_files: int | None,
+) -> TreeWalker:
+    """Create a walker whose file ceiling defaults to the configured one."""
+    if max_files is None:
+        max_files = load_config(package_dir).get(
+            MAX_FILES_CONFIG_KEY, DEFAULT_MAX_FILES
+        )
+    return TreeWalker(
+        respect_gitignore=respect_gitignore, symlinks=symlinks, max_files=max_files
+    )
 
 
-def find_missing_tests(package_dir: Path, tests_dir: Path) -> list[Path]:
-    """Return missing test file paths for all modules in package_dir."""
+def _record_stat(
+    stats: dict[str, os.stat_result], rel_path: str, entry: os.DirEntry
+) -> None:
+    """Store the entry's stat data, which it caches after the first call."""
+    try:
+        stats[rel_path] = entry.stat()
+    except OSError:
+        pass
+
+
+def _collect_modules(
+    package_dir: Path,
+    walker: TreeWalker,
+    stats: dict[str, os.stat_result] | None = None,
+) -> list[str]:
+    """Return relative paths of all non-``__init__`` modules in package_dir.
+
+    If stats is given, it is filled with each module's stat data.
+    """
+    pruned = walker.dirs_pruned
+    with phase(PHASE_SOURCE_WALK):
+        if stats is None:
+            modules = [
+                rel_path
+                for rel_path, entry in walker.iter_files(package_dir)
+                if entry.name != INIT_FILE_NAME
+            ]
+        else:
+            modules = []
+            for rel_path, entry in walker.iter_files(package_dir):
+                if entry.name != INIT_FILE_NAME:
+                    modules.append(rel_path)
+                    _record_stat(stats, rel_path, entry)
+    count(COUNTER_DIRS_PRUNED, walker.dirs_pruned - pruned)
+    return modules
+
+
+def _exclude_tests(
+    modules: list[str], package_dir: Path, tests_dir: Path, strategy: MappingStrategy
+) -> list[str]:
+    """Drop test files from modules when tests live inside package_dir."""
+    if tests_dir == package_dir:
+        return [module for module in modules if not strategy.is_test_file(module)]
+    if tests_dir.is_relative_to(package_dir):
+        prefix = tests_dir.relative_to(package_dir).as_posix() + "/"
+        return [module for module in modules if not module.startswith(prefix)]
+    return modules
+
+
+def _collect_test_files(
+    tests_dir: Path,
+    walker: TreeWalker,
+    stats: dict[str, os.stat_result] | None = None,
+) -> set[str]:
+    """Return relative paths of all Python files present in tests_dir.
+
+    If stats is given, it is filled with each file's stat data.
+    """
+    pruned = walker.dirs_pruned
+    with phase(PHASE_TESTS_WALK):
+        if stats is None:
+            files = {rel_path for rel_path, _ in walker.iter_files(tests_dir)}
+        else:
+            files = set()
+            for rel_path, entry in walker.iter_files(tests_dir):
+                files.add(rel_path)
+                _record_stat(stats, rel_path, entry)
+    count(COUNTER_DIRS_PRUNED, walker.dirs_pruned - pruned)
+    count(COUNTER_TESTS_FOUND, len(files))
+    return files
+
+
+def _find_pruned_tests(
+    tests_dir: Path, mirror_map: MirrorMap, existing: set[str]
+) -> set[str]:
+    """Return mapped test files the tests walk pruned but that exist.
+
+    A test file in a directory ``.gitignore`` excludes is still present, so
+    the mapped test paths the walk did not list are stat'ed before being
+    reported missing; only called when the walk pruned a directory.
+    """
+    return {
+        test for test in mirror_map.missing(existing) if (tests_dir / test).is_file()
+    }
+
+
+def _walk_trees(
+    package_dir: Path,
+    tests_dir: Path,
+    walker: TreeWalker,
+    mapping: MappingStrategy | str | dict | None,
+) -> tuple[set[str], MirrorMap]:
+    """Return the test files present in tests_dir and the mirror map."""
+    pruned = walker.dirs_pruned
+    existing = _collect_test_files(tests_dir, walker)
+    walk_pruned = walker.dirs_pruned > pruned
+    mirror_map = build_mirror_map(package_dir, tests_dir, walker, mapping)
+    if walk_pruned:
+        existing |= _find_pruned_tests(tests_dir, mirror_map, existing)
+    return existing, mirror_map
+
+
+def build_mirror_map(
+    package_dir: Path,
+    tests_dir: Path,
+    walker: TreeWalker,
+    mapping: MappingStrategy | str | dict | None = None,
+    stats: dict[str, os.stat_result] | None = None,
+) -> MirrorMap:
+    """Walk package_dir and compile its modules into a source <-> test table.
+
+    Args:
+        package_dir (Path): Path to the main package directory.
+        tests_dir (Path): Path to the tests directory.
+        walker (TreeWalker): Walker used for the source tree.
+        mapping (MappingStrategy | str | dict | None): Mapping strategy; None
+            uses the ``mapping`` configured in the nearest ``pyproject.toml``.
+        stats (dict[str, os.stat_result] | None): Filled with the stat data
+            of every module, taken from the walk's directory entries.
+
+    Returns:
+        MirrorMap: Table of every mirrored module.
+    """
+    strategy = resolve_strategy(mapping, package_dir)
+    modules = _exclude_tests(
+        _collect_modules(package_dir, walker, stats), package_dir, tests_dir, strategy
+    )
+    count(COUNTER_MODULES_SCANNED, len(modules))
+    return MirrorMap.build(strategy, modules)
+
+
+def find_missing_tests(
+    package_dir: Path,
+    tests_dir: Path,
+    *,
+    respect_gitignore: bool = True,
+    symlinks: SymlinkPolicy | str = SymlinkPolicy.FOLLOW_ONCE,
+    mapping: MappingStrategy | str | dict | None = None,
+    test_files: Iterable[str] | None = None,
+    max_files: int | None = None,
+    stale: bool = False,
+    placeholders: bool = False,
+) -> MirrorReport:
+    """Return missing test file paths for all modules in package_dir.
+
+    Both trees are walked once; directories ignored by ``.gitignore`` are pruned
+    unless respect_gitignore is False, and symlinked directories are handled
+    according to symlinks. Each module is reported at most once. The mapping
+    defaults to the one configured in ``pyproject.toml``. When test_files (POSIX
+    paths relative to tests_dir) is given, it replaces the walk of tests_dir.
+    The result is a ``MirrorReport`` rooted at tests_dir, which compares equal
+    to the equivalent ``list[Path]``; its ``orphans`` are the test files no
+    module maps onto, found from the same two inventories.
+
+    The walks abort with ``FileLimitExceeded`` after listing more than
+    max_files files; it defaults to ``max-files`` in ``pyproject.toml``, or
+    ``DEFAULT_MAX_FILES``, and 0 disables the limit.
+
+    With stale, the report's ``stale`` lists the modules modified after their
+    mirrored tests; with placeholders, its ``placeholders`` lists the test
+    files still holding the unmodified placeholder stub. Both use the stat
+    data of the walks' directory entries, so no file is looked up by path a
+    second time, and only files of the placeholder's size are read. Only
+    test_files, which replace the tests walk, are stat'ed directly.
+    """
     _validate_package_dir(package_dir)
-    missing_tests: list[Path] = []
-    for py_file in package_dir.rglob("*.py"):
-        if py_file.name == INIT_FILE_NAME:
+    walker = _make_walker(package_dir, respect_gitignore, symlinks, max_files)
+    source_stats: dict[str, os.stat_result] | None = {} if stale else None
+    test_stats: dict[str, os.stat_result] | None = {} if stale or placeholders else None
+    pruned = walker.dirs_pruned
+    if test_files is None:
+        existing = _collect_test_files(tests_dir, walker, test_stats)
+    else:
+        existing = set(test_files)
+        count(COUNTER_TESTS_FOUND, len(existing))
+        if test_stats is not None:
+            test_stats = _stat_files(tests_dir, existing)
+    walk_pruned = walker.dirs_pruned > pruned
+    mirror_map = build_mirror_map(package_dir, tests_dir, walker, mapping, source_stats)
+    if walk_pruned:
+        found = _find_pruned_tests(tests_dir, mirror_map, existing)
+        existing |= found
+        if test_stats is not None:
+            test_stats.update(_stat_files(tests_dir, found))
+    stale_tests: list[StaleTest] = []
+    if stale:
+        lags = mirror_map.stale(
+            {source: st.st_mtime_ns for source, st in source_stats.items()},
+            {test: st.st_mtime_ns for test, st in test_stats.items()},
+        )
+        stale_tests = [
+            StaleTest(package_dir / source, tests_dir / test, lag / NANOSECONDS)
+            for source, test, lag in lags
+        ]
+    placeholder_tests: list[str] = []
+    if placeholders:
+        placeholder_tests = sorted(
+            test
+            for test, st in test_stats.items()
+            if is_placeholder(tests_dir / test, st.st_size)
+        )
+    return MirrorReport(
+        tests_dir,
+        mirror_map.missing(existing),
+        mirror_map.orphans(existing),
+        stale_tests,
+        placeholder_tests,
+    )
+
+
+def _stat_files(tests_dir: Path, tests: Iterable[str]) -> dict[str, os.stat_result]:
+    """Return the stat data of test files that were not walked."""
+    stats = {}
+    for test in tests:
+        try:
+            stats[test] = (tests_dir / test).stat()
+        except OSError:
             continue
-        test_path = _get_test_path(py_file, package_dir, tests_dir)
-        if not test_path.exists():
-            missing_tests.append(test_path)
-    return missing_tests
+    return stats
+
+
+def find_untested_symbols(
+    package_dir: Path,
+    tests_dir: Path,
+    *,
+    respect_gitignore: bool = True,
+    symlinks: SymlinkPolicy | str = SymlinkPolicy.FOLLOW_ONCE,
+    mapping: MappingStrategy | str | dict | None = None,
+    cache_dir: Path | None = None,
+    workers: int | None = None,
+    max_files: int | None = None,
+) -> dict[Path, list[str]]:
+    """Return public symbols that no mirrored test is named after, per module.
+
+    Source modules and their mirrored test modules are parsed with ``ast`` in
+    one batch, in parallel for large batches, through the content-hash symbol
+    cache in cache_dir, so a warm run only parses files that changed.
+
+    Args:
+        package_dir (Path): Path to the main package directory.
+        tests_dir (Path): Path to the tests directory.
+        respect_gitignore (bool): Prune directories ignored by ``.gitignore``.
+        symlinks (SymlinkPolicy | str): Policy for symlinked directories.
+        mapping (MappingStrategy | str | dict | None): Mapping strategy; None
+            uses the one configured in ``pyproject.toml``.
+        cache_dir (Path | None): Directory of the persistent symbol cache.
+        workers (int | None): Process pool size for parsing large batches.
+        max_files (int | None): File ceiling of the walks, as in
+            ``find_missing_tests``.
+
+    Returns:
+        dict[Path, list[str]]: Untested ``func``, ``Class`` and
+        ``Class.method`` names keyed by source module path, for modules with
+        at least one untested symbol.
+    """
+    _validate_package_dir(package_dir)
+    walker = _make_walker(package_dir, respect_gitignore, symlinks, max_files)
+    existing, mirror_map = _walk_trees(package_dir, tests_dir, walker, mapping)
+
+    # Several test files may mirror one module (e.g. the package strategy).
+    tests_by_key: dict[str, list[str]] = {}
+    for test in sorted(existing):
+        key = mirror_map.strategy.canonical_test_path(test)
+        if key in mirror_map.reverse:
+            tests_by_key.setdefault(key, []).append(test)
+    sources = list(mirror_map.forward)
+    test_files = [test for tests in tests_by_key.values() for test in tests]
+
+    cache = SymbolCache(cache_dir)
+    parsed = parse_modules(
+        [package_dir / source for source in sources]
+        + [tests_dir / test for test in test_files],
+        cache,
+        workers=workers,
+    )
+    cache.save()
+    test_symbols = dict(zip(test_files, parsed[len(sources) :], strict=True))
+
+    report: dict[Path, list[str]] = {}
+    for source, symbols in zip(sources, parsed, strict=False):
+        tests = tests_by_key.get(mirror_map.forward[source], [])
+        tokens = index_test_names([test_symbols[test] for test in tests])
+        untested = untested_symbols(symbols, tokens)
+        if untested:
+            report[package_dir / source] = untested
+    return report
+
+
+def find_mirror_coverage(
+    package_dir: Path,
+    tests_dir: Path,
+    data_file: Path,
+    *,
+    respect_gitignore: bool = True,
+    symlinks: SymlinkPolicy | str = SymlinkPolicy.FOLLOW_ONCE,
+    mapping: MappingStrategy | str | dict | None = None,
+    max_files: int | None = None,
+) -> list[MirrorCoverage]:
+    """Return how many of each module's executed lines its mirrored tests run.
+
+    Lines are read from a coverage.py data file recorded with test contexts
+    and attributed to test files through the mirror mapping; see
+    ``coverage_data.mirror_coverage``. Walks are limited by max_files as in
+    ``find_missing_tests``.
+
+    Args:
+        package_dir (Path): Path to the main package directory.
+        tests_dir (Path): Path to the tests directory.
+        data_file (Path): The ``.coverage`` SQLite database.
+        respect_gitignore (bool): Prune directories ignored by ``.gitignore``.
+        symlinks (SymlinkPolicy | str): Policy for symlinked directories.
+        mapping (MappingStrategy | str | dict | None): Mapping strategy; None
+            uses the one configured in ``pyproject.toml``.
+        max_files (int | None): File ceiling of the walks.
+
+    Returns:
+        list[MirrorCoverage]: One entry per module with a mirrored test.
+    """
+    _validate_package_dir(package_dir)
+    walker = _make_walker(package_dir, respect_gitignore, symlinks, max_files)
+    existing, mirror_map = _walk_trees(package_dir, tests_dir, walker, mapping)
+    return mirror_coverage(data_file, package_dir, tests_dir, mirror_map, existing)
+
+
+def find_module_durations(
+    package_dir: Path,
+    tests_dir: Path,
+    *,
+    runs: int = DEFAULT_TREND_RUNS,
+    cache_dir: Path | None = None,
+    respect_gitignore: bool = True,
+    symlinks: SymlinkPolicy | str = SymlinkPolicy.FOLLOW_ONCE,
+    mapping: MappingStrategy | str | dict | None = None,
+    max_files: int | None = None,
+) -> list[ModuleDuration]:
+    """Return how long the tests mirroring each module took in recent runs.
+
+    Durations are recorded by the pytest plugin with ``--mirror-durations``
+    and attributed to modules through the mirror mapping, so only the source
+    tree is walked. Walks are limited by max_files as in
+    ``find_missing_tests``.
+
+    Args:
+        package_dir (Path): Path to the main package directory.
+        tests_dir (Path): Path to the tests directory.
+        runs (int): Number of recent runs to report per module.
+        cache_dir (Path | None): Directory of the duration history.
+        respect_gitignore (bool): Prune directories ignored by ``.gitignore``.
+        symlinks (SymlinkPolicy | str): Policy for symlinked directories.
+        mapping (MappingStrategy | str | dict | None): Mapping strategy; None
+            uses the one configured in ``pyproject.toml``.
+        max_files (int | None): File ceiling of the walk.
+
+    Returns:
+        list[ModuleDuration]: One entry per module with recorded durations,
+        slowest first.
+    """
+    _validate_package_dir(package_dir)
+    walker = _make_walker(package_dir, respect_gitignore, symlinks, max_files)
+    mirror_map = build_mirror_map(package_dir, tests_dir, walker, mapping)
+    return module_durations(DurationHistory(cache_dir), package_dir, mirror_map, runs)
+
+
+def build_import_graph(
+    package_dir: Path,
+    *,
+    respect_gitignore: bool = True,
+    symlinks: SymlinkPolicy | str = SymlinkPolicy.FOLLOW_ONCE,
+    cache_dir: Path | None = None,
+    workers: int | None = None,
+    max_files: int | None = None,
+) -> ImportGraph:
+    """Parse the imports between the modules of package_dir into a graph.
+
+    The graph is cached in cache_dir with every module's modification time
+    and size, and only modules that changed since the last run are read and
+    resolved again, so a warm run on an unchanged tree costs the walk and one
+    cache read.
+
+    Args:
+        package_dir (Path): Path to the main package directory.
+        respect_gitignore (bool): Prune directories ignored by ``.gitignore``.
+        symlinks (SymlinkPolicy | str): Policy for symlinked directories.
+        cache_dir (Path | None): Directory of the persistent import cache.
+        workers (int | None): Process pool size for parsing large batches.
+        max_files (int | None): File ceiling of the walk, as in
+            ``find_missing_tests``.
+
+    Returns:
+        ImportGraph: Graph of every module, ``__init__.py`` files included.
+    """
+    _validate_package_dir(package_dir)
+    walker = _make_walker(package_dir, respect_gitignore, symlinks, max_files)
+    stats: dict[str, os.stat_result] = {}
+    pruned = walker.dirs_pruned
+    with phase(PHASE_SOURCE_WALK):
+        for rel_path, entry in walker.iter_files(package_dir):
+            _record_stat(stats, rel_path, entry)
+    count(COUNTER_DIRS_PRUNED, walker.dirs_pruned - pruned)
+    return load_import_graph(package_dir, stats, cache_dir, workers)
 
 
 def _ensure_test_dir_structure(test_dir: Path, created_dirs: set[Path]) -> None:
@@ -52,24 +480,88 @@ def _ensure_test_dir_structure(test_dir: Path, created_dirs: set[Path]) -> None:
         created_dirs.add(test_dir)
 
 
-def generate_missing_tests(package_dir: Path, tests_dir: Path) -> None:
-    """Generate missing test files and mirror package structure in tests."""
+def generate_missing_tests(
+    package_dir: Path,
+    tests_dir: Path,
+    *,
+    respect_gitignore: bool = True,
+    symlinks: SymlinkPolicy | str = SymlinkPolicy.FOLLOW_ONCE,
+    mapping: MappingStrategy | str | dict | None = None,
+    stub_mode: str = STUB_MODE_PLACEHOLDER,
+    renderer: Renderer | None = None,
+    cache_dir: Path | None = None,
+    max_files: int | None = None,
+) -> None:
+    """Generate missing test files and mirror package structure in tests.
+
+    All new files are rendered in one batch: by renderer if given and it
+    returns a result, otherwise by the built-in renderer for stub_mode. The
+    ``ast`` mode parses modules in parallel and caches the results in
+    cache_dir, keyed by content hash. max_files caps the walks as in
+    ``find_missing_tests``.
+    """
     _validate_package_dir(package_dir)
+    walker = _make_walker(package_dir, respect_gitignore, symlinks, max_files)
+    existing = _collect_test_files(tests_dir, walker)
+    mirror_map = build_mirror_map(package_dir, tests_dir, walker, mapping)
+    missing = set(mirror_map.missing(existing))
+    count(COUNTER_MISSING, len(missing))
     created_dirs: set[Path] = set()
-    created_any = False
+    to_create: dict[Path, str] = {}
 
-    for py_file in package_dir.rglob("*.py"):
-        if py_file.name == INIT_FILE_NAME:
-            continue
-        test_path = _get_test_path(py_file, package_dir, tests_dir)
+    for source, test_rel_path in mirror_map.forward.items():
+        test_path = tests_dir / test_rel_path
         test_dir = test_path.parent
 
         _ensure_test_dir_structure(test_dir, created_dirs)
 
-        if not test_path.exists():
-            test_path.write_text(DEFAULT_TEST_CONTENT)
-            print(f"Created: {test_path}")
-            created_any = True
+        # Ignored test files are absent from the walk; never overwrite them.
+        if (
+            test_rel_path in missing
+            and test_path not in to_create
+            and not test_path.exists()
+        ):
+            to_create[test_path] = source
 
-    if not created_any:
+    if not to_create:
         print(ALL_TESTS_PRESENT_MESSAGE)
+        return
+
+    sources = list(to_create.values())
+    count(COUNTER_GENERATED, len(to_create))
+    with phase(PHASE_STUB_RENDER):
+        contents = renderer(sources) if renderer is not None else None
+        if contents is None:
+            contents = render_stubs(
+                package_dir, sources, stub_mode, cache_dir=cache_dir
+            )
+    with phase(PHASE_STUB_WRITES):
+        for test_path, content in zip(to_create, contents, strict=True):
+            test_path.write_text(content)
+            print(f"Created: {test_path}")
+
+
+def prune_orphaned_tests(
+    orphans: Iterable[Path], *, dry_run: bool = False
+) -> list[Path]:
+    """Delete orphaned test files that still contain only the placeholder stub.
+
+    Orphans with any other content are kept: they may hold real tests that
+    belong elsewhere.
+
+    Args:
+        orphans (Iterable[Path]): Orphaned test files, e.g. the ``orphans`` of
+            a ``find_missing_tests`` report.
+        dry_run (bool): Only report what would be deleted.
+
+    Returns:
+        list[Path]: The files deleted, or that would be deleted.
+    """
+    removed = []
+    for path in orphans:
+        if not is_placeholder(path):
+            continue
+        if not dry_run:
+            path.unlink()
+        removed.append(path)
+    return removed
@@ -0,0 +1,265 @@
+"""Per-module coverage of mirrored tests from a coverage.py data file.
+
+A mirrored ``test_foo.py`` existing says nothing about whether it runs
+``foo.py``. When tests are recorded with coverage contexts (pytest-cov's
+``--cov-context=test``, or ``dynamic_context = test_function``), the
+``.coverage`` SQLite database tells which test executed which lines, so each
+module's lines can be attributed to the test files mirroring it.
+
+The database is read directly with ``sqlite3``, so coverage.py does not have
+to be installed. The mirrored modules and the module each context's test
+mirrors are loaded into temporary tables, and a few aggregate queries count
+the executed lines of every module at once, rather than one load per file.
+Arc data is reduced to distinct lines and counted entirely inside SQLite.
+"""
+
+import os
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+from typing import TYPE_CHECKING, NamedTuple
+
+from .mapping import MirrorMap
+
+if TYPE_CHECKING:
+    import sqlite3
+
+# Module-specific constants
+DEFAULT_DATA_FILE = ".coverage"
+NOT_COVERAGE_DATA_MESSAGE = "{path} is not a coverage.py data file"
+NO_CONTEXTS_MESSAGE = (
+    "{path} has no test contexts; record them with pytest-cov's "
+    "--cov-context=test or coverage.py's dynamic_context = test_function"
+)
+CONTEXT_PHASE_SEPARATOR = "|"
+NODE_ID_SEPARATOR = "::"
+PY_SUFFIX = ".py"
+
+
+class MirrorCoverage(NamedTuple):
+    """Lines of a source module executed by its mirrored tests."""
+
+    source: Path
+    test: Path
+    test_lines: int
+    """Lines of the module executed while its mirrored tests ran."""
+    suite_lines: int
+    """Lines of the module executed by the whole recorded run."""
+
+    @property
+    def percent(self) -> float:
+        """Return the share of the suite's executed lines the tests reach."""
+        if not self.suite_lines:
+            return 0.0
+        return 100 * self.test_lines / self.suite_lines
+
+    def format(self) -> str:
+        """Return a one-line description for reports."""
+        return (
+            f"{self.source}: {self.test_lines}/{self.suite_lines} lines "
+            f"({self.percent:.0f}%) from {self.test}"
+        )
+
+
+def _numbits_lines(numbits: bytes) -> Iterator[int]:
+    """Yield the line numbers set in a coverage.py numbits blob."""
+    for index, byte in enumerate(numbits):
+        if byte:
+            base = index * 8
+            for bit in range(8):
+                if byte & (1 << bit):
+                    yield base + bit
+
+
+def _dotted(context: str) -> list[str]:
+    """Split a context into dotted name parts.
+
+    Handles pytest-cov node IDs (``tests/test_a.py::test_x|run``) as well as
+    coverage.py's ``module.qualname`` test function contexts.
+    """
+    name = context.split(CONTEXT_PHASE_SEPARATOR, 1)[0]
+    path = name.split(NODE_ID_SEPARATOR, 1)[0]
+    if path.endswith(PY_SUFFIX):
+        name = path.removesuffix(PY_SUFFIX).replace("/", ".").replace("\\", ".")
+    return name.split(".")
+
+
+def _match_test(parts: list[str], modules: dict[str, str]) -> str | None:
+    """Return the mirror key of the longest test module name found in parts.
+
+    Leading parts may be missing from, or added to, the recorded name, since
+    contexts are relative to the project root and test files to tests_dir.
+    """
+    for start in range(len(parts)):
+        for end in range(len(parts), start, -1):
+            test = modules.get(".".join(parts[start:end]))
+            if test is not None:
+                return test
+    return None
+
+
+def _source_ids(
+    conn: "sqlite3.Connection", data_file: Path, package_dir: Path, sources: set[str]
+) -> dict[int, str]:
+    """Return the coverage file IDs of the mirrored source modules."""
+    base = package_dir.resolve()
+    data_dir = data_file.parent.resolve()
+    ids = {}
+    for file_id, recorded in conn.execute("SELECT id, path FROM file"):
+        path = Path(recorded)
+        if not path.is_absolute():
+            path = data_dir / path
+        if not path.is_relative_to(base):
+            continue
+        source = path.relative_to(base).as_posix()
+        if source in sources:
+            ids[file_id] = source
+    return ids
+
+
+def _load_targets(
+    conn: "sqlite3.Connection",
+    file_ids: dict[int, str],
+    context_files: list[tuple[int, int]],
+) -> None:
+    """Store the wanted files and the files each context mirrors in temp tables."""
+    conn.execute("CREATE TEMP TABLE mirror_file (file_id INTEGER PRIMARY KEY)")
+    conn.execute(
+        "CREATE TEMP TABLE mirror_context ("
+        "context_id INTEGER, file_id INTEGER, PRIMARY KEY (context_id, file_id))"
+    )
+    conn.executemany(
+        "INSERT INTO mirror_file VALUES (?)", ((file_id,) for file_id in file_ids)
+    )
+    conn.executemany("INSERT INTO mirror_context VALUES (?, ?)", context_files)
+
+
+def _line_counts(conn: "sqlite3.Connection") -> dict[int, tuple[int, int]]:
+    """Return ``(suite_lines, mirrored_lines)`` per wanted file ID.
+
+    A data file holds either line or arc data. Arcs are counted as distinct
+    lines inside SQLite, with the mirrored contexts looked up through the
+    arc table's ``(file_id, context_id)`` index; line numbits are decoded
+    here, one row per file and context.
+    """
+    counts: dict[int, tuple[int, int]] = {}
+    suite: dict[int, set[int]] = {}
+    mirrored: dict[int, set[int]] = {}
+    rows = conn.execute(
+        "SELECT lb.file_id, lb.numbits, mc.file_id IS NOT NULL FROM line_bits lb "
+        "JOIN mirror_file mf ON mf.file_id = lb.file_id "
+        "LEFT JOIN mirror_context mc "
+        "ON mc.context_id = lb.context_id AND mc.file_id = lb.file_id"
+    )
+    for file_id, numbits, is_mirrored in rows:
+        lines = set(_numbits_lines(numbits))
+        suite.setdefault(file_id, set()).update(lines)
+        if is_mirrored:
+            mirrored.setdefault(file_id, set()).update(lines)
+    for file_id, lines in suite.items():
+        counts[file_id] = (len(lines), len(mirrored.get(file_id, ())))
+    # Every executed line is the destination of an arc; negative numbers
+    # mark code object entries and exits.
+    suite_rows = conn.execute(
+        "SELECT a.file_id, COUNT(DISTINCT a.tono) FROM mirror_file mf "
+        "JOIN arc a ON a.file_id = mf.file_id WHERE a.tono > 0 GROUP BY a.file_id"
+    ).fetchall()
+    mirrored_rows = dict(
+        conn.execute(
+            "SELECT a.file_id, COUNT(DISTINCT a.tono) FROM mirror_context mc "
+            "JOIN arc a ON a.file_id = mc.file_id AND a.context_id = mc.context_id "
+            "WHERE a.tono > 0 GROUP BY a.file_id"
+        )
+    )
+    for file_id, suite_lines in suite_rows:
+        counts[file_id] = (suite_lines, mirrored_rows.get(file_id, 0))
+    return counts
+
+
+def mirror_coverage(
+    data_file: Path,
+    package_dir: Path,
+    tests_dir: Path,
+    mirror_map: MirrorMap,
+    tests: Iterable[str],
+) -> list[MirrorCoverage]:
+    """Attribute each mirrored module's executed lines to its mirrored tests.
+
+    Args:
+        data_file (Path): coverage.py SQLite data file recorded with contexts.
+        package_dir (Path): Path to the main package directory.
+        tests_dir (Path): Path to the tests directory.
+        mirror_map (MirrorMap): Table of the mirrored modules.
+        tests (Iterable[str]): Existing test files relative to tests_dir.
+
+    Returns:
+        list[MirrorCoverage]: One entry per module that has an existing
+        mirrored test and was executed in the recorded run, in source order.
+
+    Raises:
+        FileNotFoundError: If data_file does not exist.
+        ValueError: If data_file is not a coverage.py database, or holds no
+            test contexts.
+    """
+    # Imported here so validation runs do not pay for sqlite3.
+    import sqlite3
+
+    if not data_file.is_file():
+        raise FileNotFoundError(f"Coverage data file does not exist: {data_file}")
+    canonical = mirror_map.strategy.canonical_test_path
+    tests_by_key: dict[str, list[str]] = {}
+    modules: dict[str, str] = {}
+    for test in sorted(tests):
+        key = canonical(test)
+        if key in mirror_map.reverse:
+            tests_by_key.setdefault(key, []).append(test)
+            modules[test.removesuffix(PY_SUFFIX).replace("/", ".")] = key
+    sources = {
+        source for source, key in mirror_map.forward.items() if key in tests_by_key
+    }
+
+    conn = sqlite3.connect(f"{data_file.resolve().as_uri()}?mode=ro", uri=True)
+    try:
+        try:
+            conn.execute("SELECT version FROM coverage_schema").fetchone()
+            contexts = conn.execute("SELECT id, context FROM context").fetchall()
+        except sqlite3.DatabaseError as exc:
+            raise ValueError(NOT_COVERAGE_DATA_MESSAGE.format(path=data_file)) from exc
+        context_keys = {
+            context_id: _match_test(_dotted(context), modules)
+            for context_id, context in contexts
+            if context
+        }
+        if not context_keys:
+            raise ValueError(NO_CONTEXTS_MESSAGE.format(path=data_file))
+        file_ids = _source_ids(conn, data_file, package_dir, sources)
+        files_by_source = {source: file_id for file_id, source in file_ids.items()}
+        context_files = []
+        for context_id, key in context_keys.items():
+            file_id = files_by_source.get(mirror_map.reverse.get(key))
+            if file_id is not None:
+                context_files.append((context_id, file_id))
+        _load_targets(conn, file_ids, context_files)
+        counts = _line_counts(conn)
+    finally:
+        conn.close()
+
+    return [
+        MirrorCoverage(
+            package_dir / source,
+            tests_dir / tests_by_key[key][0],
+            counts[files_by_source[source]][1],
+            counts[files_by_source[source]][0],
+        )
+        for source, key in mirror_map.forward.items()
+        if files_by_source.get(source) in counts
+    ]
+
+
+def default_data_file(root: Path | None = None) -> Path:
+    """Return coverage.py's data file for a project root.
+
+    Honors the ``COVERAGE_FILE`` environment variable like coverage.py does.
+    """
+    if root is None:
+        root = Path.cwd()
+    return root / os.environ.get("COVERAGE_FILE", DEFAULT_DATA_FILE)
@@ -0,0 +1,167 @@
+"""Test durations attributed to the source modules their tests mirror.
+
+Every mirrored test file belongs to one source module, so the time its tests
+take is the cost of testing that module. The plugin sums the setup, call and
+teardown durations of each test per mirrored module, keyed by the module's
+canonical test path, and appends one entry per session to a short history in
+``.pytest_cache``. Sessions that run part of the suite only record the
+modules they ran, so each module's history holds the runs it was part of.
+"""
+
+from collections.abc import Mapping
+from pathlib import Path
+from typing import TYPE_CHECKING, NamedTuple
+
+from .cache import default_cache_dir, load_json, save_json
+from .constants import DEFAULT_TREND_RUNS
+
+if TYPE_CHECKING:
+    from .mapping import MirrorMap
+
+# Module-specific constants
+DURATIONS_CACHE_FILE_NAME = "durations.json"
+DURATIONS_CACHE_VERSION = 1
+MAX_RECORDED_RUNS = 50
+DURATIONS_FILE_MISSING_MESSAGE = "Durations file does not exist: {path}"
+NOT_DURATIONS_FILE_MESSAGE = "{path} is not a pytest-mirror durations file"
+
+
+class ModuleDuration(NamedTuple):
+    """Time the tests mirroring a source module took over recent runs."""
+
+    source: Path
+    seconds: tuple[float, ...]
+    """Durations of the runs that included the module, oldest first."""
+
+    @property
+    def latest(self) -> float:
+        """Return the duration of the most recent run."""
+        return self.seconds[-1]
+
+    @property
+    def change(self) -> float:
+        """Return the change from the oldest to the latest run, in percent."""
+        first = self.seconds[0]
+        if not first:
+            return 0.0
+        return 100 * (self.latest - first) / first
+
+    def format(self) -> str:
+        """Return a one-line description for reports."""
+        line = f"{self.source}: {self.latest:.2f}s"
+        if len(self.seconds) > 1:
+            trend = " -> ".join(f"{seconds:.2f}s" for seconds in self.seconds)
+            line += f" ({trend}, {self.change:+.0f}%)"
+        return line
+
+
+class DurationHistory:
+    """Per-session durations of mirrored modules, oldest session first."""
+
+    def __init__(self, cache_dir: Path | None = None) -> None:
+        """Load the history, starting empty if it is missing or outdated.
+
+        Args:
+            cache_dir (Path | None): Directory holding the cache file; defaults
+                to the project cache directory under the current directory.
+        """
+        if cache_dir is None:
+            cache_dir = default_cache_dir()
+        self.path = cache_dir / DURATIONS_CACHE_FILE_NAME
+        self.runs: list[dict[str, float]] = _read_runs(load_json(self.path)) or []
+
+    def record(self, durations: Mapping[str, float]) -> None:
+        """Append a session, keeping the last ``MAX_RECORDED_RUNS``.
+
+        Args:
+            durations (Mapping[str, float]): Seconds per canonical test path.
+        """
+        self.runs.append(dict(durations))
+        del self.runs[:-MAX_RECORDED_RUNS]
+
+    def save(self) -> None:
+        """Write the history back."""
+        save_json(self.path, {"version": DURATIONS_CACHE_VERSION, "runs": self.runs})
+
+    def history(self, runs: int = DEFAULT_TREND_RUNS) -> dict[str, list[float]]:
+        """Return each module's durations in its last runs, oldest first."""
+        history: dict[str, list[float]] = {}
+        for run in reversed(self.runs):
+            for key, seconds in run.items():
+                durations = history.setdefault(key, [])
+                if len(durations) < runs:
+                    durations.append(seconds)
+        for durations in history.values():
+            durations.reverse()
+        return history
+
+    def latest(self) -> dict[str, float]:
+        """Return each module's duration in the last run that included it."""
+        return _latest(self.runs)
+
+
+def _read_runs(data: object) -> list[dict[str, float]] | None:
+    """Return the runs of loaded history data, or None if it is not current."""
+    if not isinstance(data, dict) or data.get("version") != DURATIONS_CACHE_VERSION:
+        return None
+    runs = data.get("runs", [])
+    return runs if isinstance(runs, list) else None
+
+
+def _latest(runs: list[dict[str, float]]) -> dict[str, float]:
+    """Return each key's value in the last run that has it."""
+    latest: dict[str, float] = {}
+    for run in runs:
+        latest.update(run)
+    return latest
+
+
+def load_durations(path: Path) -> dict[str, float]:
+    """Return each module's latest duration from a saved history file.
+
+    Unlike the history in the project cache, which every recording session
+    rewrites, the file is only read, so machines given the same file see the
+    same durations.
+
+    Args:
+        path (Path): A ``durations.json`` copied from a project cache.
+
+    Returns:
+        dict[str, float]: Seconds per canonical test path.
+
+    Raises:
+        FileNotFoundError: If path does not exist.
+        ValueError: If path is not a current duration history.
+    """
+    if not path.is_file():
+        raise FileNotFoundError(DURATIONS_FILE_MISSING_MESSAGE.format(path=path))
+    runs = _read_runs(load_json(path))
+    if runs is None:
+        raise ValueError(NOT_DURATIONS_FILE_MESSAGE.format(path=path))
+    return _latest(runs)
+
+
+def module_durations(
+    history: DurationHistory,
+    package_dir: Path,
+    mirror_map: "MirrorMap",
+    runs: int = DEFAULT_TREND_RUNS,
+) -> list[ModuleDuration]:
+    """Attribute recorded durations to the source modules of a mirror map.
+
+    Args:
+        history (DurationHistory): The recorded sessions.
+        package_dir (Path): Path to the main package directory.
+        mirror_map (MirrorMap): Table of the mirrored modules.
+        runs (int): Number of recent runs to keep per module.
+
+    Returns:
+        list[ModuleDuration]: One entry per module with recorded durations,
+        slowest first in the latest run; tests without a module are left out.
+    """
+    entries = [
+        ModuleDuration(package_dir / source, tuple(seconds))
+        for key, seconds in history.history(runs).items()
+        if (source := mirror_map.reverse.get(key)) is not None
+    ]
+    return sorted(entries, key=lambda entry: (-entry.latest, entry.source))
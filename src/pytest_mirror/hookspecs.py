@@ -8,6 +8,7 @@ from pathlib import Path
 import pluggy
 
 from .constants import PACKAGE_NAME
+from .report import MirrorReport
 
 hookspec = pluggy.HookspecMarker(PACKAGE_NAME)
 
@@ -16,14 +17,76 @@ class MirrorSpecs:
     """Hook specifications for pytest-mirror plugin."""
 
     @hookspec
-    def validate_test_structure(self, package_dir: Path, tests_dir: Path) -> list[Path]:
+    def validate_test_structure(
+        self,
+        package_dir: Path,
+        tests_dir: Path,
+        test_files: list[str] | None,
+        stale: bool,
+        placeholders: bool,
+    ) -> MirrorReport | list[Path]:
         """Validate that each module in package_dir has a corresponding test module.
 
         Args:
             package_dir (Path): Path to the main package directory.
             tests_dir (Path): Path to the tests directory.
+            test_files (list[str] | None): POSIX paths relative to tests_dir of
+                the Python files already known to exist there, e.g. collected
+                by pytest, or None if tests_dir has to be walked.
+            stale (bool): Whether to also report, in the report's ``stale``,
+                the modules modified after their mirrored tests.
+            placeholders (bool): Whether to also report, in the report's
+                ``placeholders``, the test files still holding the unmodified
+                placeholder stub.
 
         Returns:
-            list[Path]: List of paths to missing test files.
+            MirrorReport | list[Path]: Paths to missing test files, preferably
+            as a ``MirrorReport`` so results merge without building ``Path``
+            objects. A report may also carry the test files found without a
+            mirrored source module in its ``orphans``.
+        """
+        raise NotImplementedError("This is a hook specification stub.")
+
+    @hookspec(firstresult=True)
+    def mirror_map_test_paths(
+        self, package_dir: Path, tests_dir: Path, source_paths: list[str]
+    ) -> list[str | None] | None:
+        """Map a whole batch of source modules onto their test files in one call.
+
+        Implement this hook to provide a custom path convention. It is called
+        once per run with every module, so dispatch cost does not grow with the
+        size of the package. The first non-None result is used; if no
+        implementation returns one, the configured mapping strategy applies.
+
+        Args:
+            package_dir (Path): Path to the main package directory.
+            tests_dir (Path): Path to the tests directory.
+            source_paths (list[str]): POSIX module paths relative to package_dir.
+
+        Returns:
+            list[str | None] | None: POSIX test paths relative to tests_dir, in
+            the same order as source_paths (None leaves a module unmirrored),
+            or None to defer to other implementations.
+        """
+        raise NotImplementedError("This is a hook specification stub.")
+
+    @hookspec(firstresult=True)
+    def mirror_render_stubs(
+        self, package_dir: Path, source_paths: list[str], stub_mode: str
+    ) -> list[str] | None:
+        """Render the contents of new test files for a whole batch of modules.
+
+        Called once per generation run with every module whose test is about to
+        be created. The first non-None result is used; if no implementation
+        returns one, the built-in renderer for stub_mode applies.
+
+        Args:
+            package_dir (Path): Path to the main package directory.
+            source_paths (list[str]): POSIX module paths relative to package_dir.
+            stub_mode (str): Requested stub mode (``placeholder`` or ``ast``).
+
+        Returns:
+            list[str] | None: Test file contents in the same order as
+            source_paths, or None to defer to other implementations.
         """
         raise NotImplementedError("This is a hook specification stub.")
@@ -0,0 +1,270 @@
+"""Gitignore pattern matching for pytest-mirror directory walks.
+
+Each ``.gitignore`` file is compiled once into an ``IgnoreRules`` object. Files
+without negated patterns collapse into name sets and a handful of combined
+regular expressions, so the common case costs a set lookup per directory entry.
+"""
+
+import re
+from collections.abc import Iterable
+from pathlib import Path
+
+# Module-specific constants
+GITIGNORE_FILE_NAME = ".gitignore"
+GIT_DIR_NAME = ".git"
+_GLOB_CHARS = frozenset("*?[\\")
+
+
+def _translate(pattern: str) -> str:
+    """Translate a gitignore glob into a regular expression body."""
+    out: list[str] = []
+    i, n = 0, len(pattern)
+    while i < n:
+        c = pattern[i]
+        if c == "*":
+            at_segment_start = i == 0 or pattern[i - 1] == "/"
+            if pattern.startswith("**", i) and at_segment_start:
+                if i + 2 == n:
+                    out.append(".*")
+                    i += 2
+                    continue
+                if pattern[i + 2] == "/":
+                    out.append("(?:.*/)?")
+                    i += 3
+                    continue
+            while i < n and pattern[i] == "*":
+                i += 1
+            out.append("[^/]*")
+            continue
+        if c == "?":
+            out.append("[^/]")
+        elif c == "[":
+            j = i + 1
+            if j < n and pattern[j] in "!^":
+                j += 1
+            if j < n and pattern[j] == "]":
+                j += 1
+            while j < n and pattern[j] != "]":
+                j += 1
+            if j >= n:
+                out.append(re.escape(c))
+            else:
+                body = pattern[i + 1 : j].replace("\\", "\\\\")
+                if body[0] in "!^":
+                    body = "^" + body[1:]
+                out.append(f"[{body}]")
+                i = j
+        elif c == "\\" and i + 1 < n:
+            i += 1
+            out.append(re.escape(pattern[i]))
+        else:
+            out.append(re.escape(c))
+        i += 1
+    return "".join(out)
+
+
+def _strip_trailing_spaces(line: str) -> str:
+    """Strip trailing spaces unless they are escaped with a backslash."""
+    stripped = line.rstrip(" ")
+    if stripped.endswith("\\") and len(stripped) < len(line):
+        return stripped + " "
+    return stripped
+
+
+class _Rule:
+    """A single compiled gitignore pattern."""
+
+    __slots__ = ("anchored", "dir_only", "literal", "negate", "regex")
+
+    def __init__(self, pattern: str) -> None:
+        self.negate = pattern.startswith("!")
+        if self.negate or pattern.startswith(("\\!", "\\#")):
+            pattern = pattern[1:]
+        self.dir_only = pattern.endswith("/")
+        pattern = pattern.rstrip("/")
+        self.anchored = "/" in pattern
+        pattern = pattern.lstrip("/")
+        self.literal = (
+            pattern
+            if not self.anchored and not _GLOB_CHARS.intersection(pattern)
+            else None
+        )
+        self.regex = _translate(pattern)
+
+    def matches(self, path: str, name: str) -> bool:
+        """Return whether this rule matches the scoped path or its base name."""
+        if self.literal is not None:
+            return name == self.literal
+        return re.fullmatch(self.regex, path if self.anchored else name) is not None
+
+
+def _combine(bodies: list[str]) -> re.Pattern[str] | None:
+    """Compile regex bodies into a single alternation, or None if empty."""
+    if not bodies:
+        return None
+    return re.compile("|".join(f"(?:{body})" for body in bodies))
+
+
+class IgnoreRules:
+    """Compiled patterns from a single ``.gitignore`` file."""
+
+    __slots__ = (
+        "_dir_name_regex",
+        "_dir_names",
+        "_dir_path_regex",
+        "_name_regex",
+        "_names",
+        "_path_regex",
+        "_rules",
+    )
+
+    def __init__(self, lines: Iterable[str]) -> None:
+        """Compile gitignore lines.
+
+        Args:
+            lines (Iterable[str]): Raw lines of a ``.gitignore`` file.
+        """
+        rules = []
+        for line in lines:
+            line = _strip_trailing_spaces(line.rstrip("\r\n"))
+            if not line or line.startswith("#") or line in {"!", "/"}:
+                continue
+            rules.append(_Rule(line))
+        # Negations make rule order significant; otherwise any match ignores.
+        self._rules = rules if any(rule.negate for rule in rules) else None
+        self._names = {r.literal for r in rules if r.literal and not r.dir_only}
+        self._dir_names = {r.literal for r in rules if r.literal and r.dir_only}
+        globbed = [r for r in rules if r.literal is None]
+        self._name_regex = _combine(
+            [r.regex for r in globbed if not r.anchored and not r.dir_only]
+        )
+        self._dir_name_regex = _combine(
+            [r.regex for r in globbed if not r.anchored and r.dir_only]
+        )
+        self._path_regex = _combine(
+            [r.regex for r in globbed if r.anchored and not r.dir_only]
+        )
+        self._dir_path_regex = _combine(
+            [r.regex for r in globbed if r.anchored and r.dir_only]
+        )
+
+    @classmethod
+    def from_file(cls, path: Path) -> "IgnoreRules | None":
+        """Load rules from a ``.gitignore`` file, or None if it has no rules."""
+        try:
+            text = path.read_text(encoding="utf-8", errors="replace")
+        except OSError:
+            return None
+        rules = cls(text.splitlines())
+        return rules if rules else None
+
+    def __bool__(self) -> bool:
+        """Return whether any pattern was compiled."""
+        return bool(
+            self._rules
+            or self._names
+            or self._dir_names
+            or self._name_regex
+            or self._dir_name_regex
+            or self._path_regex
+            or self._dir_path_regex
+        )
+
+    def match(self, path: str, name: str, is_dir: bool) -> bool | None:
+        """Decide whether a path is ignored by this file.
+
+        Args:
+            path (str): POSIX path relative to the directory holding the file.
+            name (str): Final component of ``path``.
+            is_dir (bool): Whether the path is a directory.
+
+        Returns:
+            bool | None: True if ignored, False if re-included by a negated
+            pattern, None if no pattern matches.
+        """
+        if self._rules is not None:
+            for rule in reversed(self._rules):
+                if rule.dir_only and not is_dir:
+                    continue
+                if rule.matches(path, name):
+                    return not rule.negate
+            return None
+        if name in self._names or (is_dir and name in self._dir_names):
+            return True
+        if self._name_regex and self._name_regex.fullmatch(name):
+            return True
+        if self._path_regex and self._path_regex.fullmatch(path):
+            return True
+        if is_dir:
+            if self._dir_name_regex and self._dir_name_regex.fullmatch(name):
+                return True
+            if self._dir_path_regex and self._dir_path_regex.fullmatch(path):
+                return True
+        return None
+
+
+class IgnoreScope:
+    """Rules of one ``.gitignore`` file positioned relative to a walk root."""
+
+    __slots__ = ("prefix", "rules", "strip")
+
+    def __init__(self, rules: IgnoreRules, strip: int = 0, prefix: str = "") -> None:
+        """Position rules relative to the walk root.
+
+        Args:
+            rules (IgnoreRules): Compiled rules of the file.
+            strip (int): Characters to strip from walk-relative paths, for
+                files located below the walk root.
+            prefix (str): Path prepended to walk-relative paths, for files
+                located above the walk root.
+        """
+        self.rules = rules
+        self.strip = strip
+        self.prefix = prefix
+
+    def match(self, rel_path: str, name: str, is_dir: bool) -> bool | None:
+        """Match a walk-relative path against this scope's rules."""
+        return self.rules.match(self.prefix + rel_path[self.strip :], name, is_dir)
+
+
+def is_ignored(
+    scopes: tuple[IgnoreScope, ...], rel_path: str, name: str, is_dir: bool
+) -> bool:
+    """Return whether a walk-relative path is ignored by the active scopes.
+
+    Deeper ``.gitignore`` files take precedence over their parents, matching git.
+    """
+    for scope in reversed(scopes):
+        decision = scope.match(rel_path, name, is_dir)
+        if decision is not None:
+            return decision
+    return False
+
+
+def ancestor_scopes(root: Path) -> tuple[IgnoreScope, ...]:
+    """Load ``.gitignore`` files between the enclosing git work tree and root.
+
+    The root's own ``.gitignore`` is not included; walkers pick it up when they
+    scan the root. Outside a git work tree there are no ancestor scopes.
+
+    Args:
+        root (Path): Directory about to be walked.
+
+    Returns:
+        tuple[IgnoreScope, ...]: Scopes ordered from outermost to innermost.
+    """
+    root = root.resolve()
+    ancestors = []
+    for parent in root.parents:
+        ancestors.append(parent)
+        if (parent / GIT_DIR_NAME).exists():
+            break
+    else:
+        return ()
+    scopes = []
+    for parent in reversed(ancestors):
+        rules = IgnoreRules.from_file(parent / GITIGNORE_FILE_NAME)
+        if rules:
+            prefix = root.relative_to(parent).as_posix() + "/"
+            scopes.append(IgnoreScope(rules, prefix=prefix))
+    return tuple(scopes)
@@ -0,0 +1,399 @@
+"""Static import graph of a package for transitive test impact.
+
+Selecting only the mirror of a changed module misses the tests of the modules
+importing it. Every module of the package is parsed with ``ast`` for its
+import statements, including ones inside functions, and the imports that
+resolve to modules of the same package become edges of a graph whose reverse
+transitive closure is the set of modules a change can affect.
+
+Two caches keep warm runs cheap. Import names are cached by content hash,
+like symbols, so a batch of changed files only parses contents never seen
+before. The resolved graph is cached with the modification time and size of
+every module, so a run only re-resolves the modules that changed, plus the
+ones whose unresolved imports a newly added module now answers, and a run on
+an unchanged tree reads nothing but the walk and one cache file.
+"""
+
+import ast
+import os
+from collections.abc import Iterable
+from pathlib import Path
+
+from .cache import default_cache_dir, load_json, save_json
+from .symbols import PARALLEL_PARSE_THRESHOLD, PARSE_CHUNK_SIZE, content_hash
+
+# Module-specific constants
+IMPORT_CACHE_FILE_NAME = "imports.json"
+IMPORT_CACHE_VERSION = 1
+IMPORT_CACHE_MAX_ENTRIES = 250_000
+GRAPH_CACHE_FILE_NAME = "import_graph.json"
+GRAPH_CACHE_VERSION = 1
+INIT_FILE_NAME = "__init__.py"
+INIT_STEM = "__init__"
+PY_SUFFIX = ".py"
+
+
+def extract_imports(data: bytes) -> tuple[str, ...]:
+    """Parse module source and return the dotted names it imports.
+
+    ``from x import y`` yields ``x`` and ``x.y``, since y may be a submodule;
+    relative imports keep their leading dots. Modules that fail to parse
+    import nothing.
+    """
+    try:
+        tree = ast.parse(data)
+    except (SyntaxError, ValueError):
+        return ()
+    names: dict[str, None] = {}
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            names.update(dict.fromkeys(alias.name for alias in node.names))
+        elif isinstance(node, ast.ImportFrom):
+            base = "." * node.level + (node.module or "")
+            if node.module:
+                names[base] = None
+                base += "."
+            names.update(
+                dict.fromkeys(
+                    base + alias.name for alias in node.names if alias.name != "*"
+                )
+            )
+    return tuple(names)
+
+
+def module_name(package: str, path: str) -> str:
+    """Return the dotted name of a module path relative to the package."""
+    stem = path.removesuffix(PY_SUFFIX)
+    if stem == INIT_STEM:
+        return package
+    stem = stem.removesuffix(f"/{INIT_STEM}")
+    return f"{package}.{stem.replace('/', '.')}"
+
+
+def _is_init(path: str) -> bool:
+    """Return whether a module path is a package's ``__init__.py``."""
+    return path == INIT_FILE_NAME or path.endswith(f"/{INIT_FILE_NAME}")
+
+
+class ImportCache:
+    """Persistent mapping of content hash to the import names of a module."""
+
+    def __init__(self, cache_dir: Path | None = None) -> None:
+        """Load the cache file, starting empty if it is missing or outdated.
+
+        Args:
+            cache_dir (Path | None): Directory holding the cache file; defaults
+                to the project cache directory under the current directory.
+        """
+        if cache_dir is None:
+            cache_dir = default_cache_dir()
+        self.path = cache_dir / IMPORT_CACHE_FILE_NAME
+        data = load_json(self.path)
+        entries = {}
+        if isinstance(data, dict) and data.get("version") == IMPORT_CACHE_VERSION:
+            entries = data.get("entries", {})
+        self._entries: dict[str, list[str]] = entries
+        self._dirty = False
+
+    def __len__(self) -> int:
+        """Return the number of cached modules."""
+        return len(self._entries)
+
+    def get(self, key: str) -> tuple[str, ...] | None:
+        """Return cached import names for a content hash."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        return tuple(entry)
+
+    def put(self, key: str, names: tuple[str, ...]) -> None:
+        """Cache import names for a content hash."""
+        self._entries[key] = list(names)
+        self._dirty = True
+
+    def save(self) -> None:
+        """Write the cache back if it changed, keeping the newest entries."""
+        if not self._dirty:
+            return
+        if len(self._entries) > IMPORT_CACHE_MAX_ENTRIES:
+            keys = list(self._entries)[-IMPORT_CACHE_MAX_ENTRIES:]
+            self._entries = {key: self._entries[key] for key in keys}
+        save_json(
+            self.path, {"version": IMPORT_CACHE_VERSION, "entries": self._entries}
+        )
+        self._dirty = False
+
+
+def parse_imports(
+    paths: list[Path], cache: ImportCache | None, workers: int | None = None
+) -> list[tuple[str, ...]]:
+    """Return the import names of each module, parsing only uncached contents.
+
+    Args:
+        paths (list[Path]): Module files to inspect.
+        cache (ImportCache | None): Cache consulted and updated, not saved
+            here; None parses every file.
+        workers (int | None): Process pool size for large batches; defaults to
+            the CPU count. Use 1 to always parse in-process.
+
+    Returns:
+        list[tuple[str, ...]]: Import names in the same order as paths.
+    """
+    results: list[tuple[str, ...]] = []
+    misses: dict[str, tuple[bytes, list[int]]] = {}
+    for index, path in enumerate(paths):
+        try:
+            data = path.read_bytes()
+        except OSError:
+            data = b""
+        key = content_hash(data)
+        names = cache.get(key) if cache is not None else None
+        results.append(names or ())
+        if names is None:
+            misses.setdefault(key, (data, []))[1].append(index)
+
+    if misses:
+        sources = [data for data, _ in misses.values()]
+        if workers is None:
+            workers = os.cpu_count() or 1
+        if workers > 1 and len(sources) >= PARALLEL_PARSE_THRESHOLD:
+            # Imported here: it pulls in multiprocessing, rarely needed.
+            from concurrent.futures import ProcessPoolExecutor
+
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                parsed = list(
+                    executor.map(extract_imports, sources, chunksize=PARSE_CHUNK_SIZE)
+                )
+        else:
+            parsed = [extract_imports(data) for data in sources]
+        for (key, (_, indexes)), names in zip(misses.items(), parsed, strict=True):
+            if cache is not None:
+                cache.put(key, names)
+            for index in indexes:
+                results[index] = names
+    return results
+
+
+class _Resolver:
+    """Resolve import names against the modules of one package."""
+
+    def __init__(self, package: str, modules: list[str]) -> None:
+        """Index the modules by dotted name."""
+        self.package = package
+        self.prefix = f"{package}."
+        self.ids = {module_name(package, path): i for i, path in enumerate(modules)}
+        self.packages = {i for i, path in enumerate(modules) if _is_init(path)}
+        self._memo: dict[str, tuple[tuple[int, ...], bool]] = {}
+
+    def resolve(self, module: str, names: Iterable[str]) -> tuple[list[int], list[str]]:
+        """Return the modules a module imports, and its pending names.
+
+        Importing ``pkg.sub.mod`` runs ``pkg/__init__.py`` and
+        ``pkg/sub/__init__.py`` too, so those are imported as well. Pending
+        names are unresolved names directly below a package, which a module
+        added later may answer to.
+        """
+        parts = module_name(self.package, module).split(".")
+        if not _is_init(module):
+            parts.pop()
+        targets: dict[int, None] = {}
+        pending = []
+        for name in names:
+            if name.startswith("."):
+                level = len(name) - len(name.lstrip("."))
+                if level > len(parts):
+                    continue
+                rest = name[level:]
+                base = parts[: len(parts) - level + 1]
+                name = ".".join([*base, rest] if rest else base)
+            elif name != self.package and not name.startswith(self.prefix):
+                continue
+            found = self._memo.get(name)
+            if found is None:
+                found = self._memo[name] = self._lookup(name)
+            targets.update(dict.fromkeys(found[0]))
+            if found[1]:
+                pending.append(name)
+        return list(targets), pending
+
+    def _lookup(self, name: str) -> tuple[tuple[int, ...], bool]:
+        """Return a name's module and parent packages, and whether it is pending."""
+        ids = self.ids
+        parts = name.split(".")
+        targets = []
+        for end in range(len(parts), 0, -1):
+            target = ids.get(".".join(parts[:end]))
+            if target is not None:
+                targets.append(target)
+        parent = ids.get(name.rpartition(".")[0])
+        return tuple(targets), name not in ids and parent in self.packages
+
+
+class ImportGraph:
+    """Modules of one package and, for each, the modules importing it."""
+
+    __slots__ = ("_pending", "importers", "modules", "package")
+
+    def __init__(
+        self,
+        package: str,
+        modules: list[str],
+        importers: list[list[int]],
+        pending: dict[str, list[int]] | None = None,
+    ) -> None:
+        """Create a graph.
+
+        Args:
+            package (str): Import name of the package directory.
+            modules (list[str]): Module paths relative to the package,
+                ``__init__.py`` files included.
+            importers (list[list[int]]): Indexes into modules of the modules
+                importing each module, in the order of modules.
+            pending (dict[str, list[int]] | None): Indexes of the modules
+                importing each unresolved name, such as a deleted module's.
+        """
+        self.package = package
+        self.modules = modules
+        self.importers = importers
+        self._pending = pending or {}
+
+    def dependents(self, changed: Iterable[str]) -> set[str]:
+        """Return changed modules and every module importing them transitively.
+
+        Args:
+            changed (Iterable[str]): Module paths relative to the package.
+                Paths the graph does not know, such as deleted modules, are
+                returned as they are, along with the modules importing them.
+
+        Returns:
+            set[str]: Module paths relative to the package.
+        """
+        ids = {path: index for index, path in enumerate(self.modules)}
+        importers = self.importers
+        result: set[str] = set()
+        seen = bytearray(len(self.modules))
+        stack: list[int] = []
+        for module in changed:
+            index = ids.get(module)
+            if index is None:
+                result.add(module)
+                stack.extend(self._pending.get(module_name(self.package, module), ()))
+            else:
+                stack.append(index)
+        while stack:
+            index = stack.pop()
+            if seen[index]:
+                continue
+            seen[index] = 1
+            stack.extend(importers[index])
+        modules = self.modules
+        result.update(modules[index] for index in range(len(seen)) if seen[index])
+        return result
+
+
+def load_import_graph(
+    package_dir: Path,
+    stats: dict[str, os.stat_result],
+    cache_dir: Path | None = None,
+    workers: int | None = None,
+) -> ImportGraph:
+    """Return the import graph of the walked modules, updating the cached one.
+
+    Modules whose modification time and size match the cached graph keep
+    their edges; the rest are parsed, through the content-hash cache for
+    large batches, and resolved again. Only reverse edges are cached, since
+    the closure needs nothing else: edges of a changed module are dropped by
+    filtering it out of every importer list.
+
+    Args:
+        package_dir (Path): Path to the main package directory.
+        stats (dict[str, os.stat_result]): Stat data of every module, keyed
+            by POSIX path relative to package_dir, in walk order.
+        cache_dir (Path | None): Directory of the persistent caches.
+        workers (int | None): Process pool size for parsing large batches.
+
+    Returns:
+        ImportGraph: Graph of the modules in stats.
+    """
+    if cache_dir is None:
+        cache_dir = default_cache_dir()
+    path = cache_dir / GRAPH_CACHE_FILE_NAME
+    package = package_dir.name
+    modules = list(stats)
+    stamps = [value for st in stats.values() for value in (st.st_mtime_ns, st.st_size)]
+    data = load_json(path)
+    if not (
+        isinstance(data, dict)
+        and data.get("version") == GRAPH_CACHE_VERSION
+        and data.get("package") == package
+    ):
+        data = {"modules": [], "stamps": [], "importers": [], "pending": {}}
+    old_modules: list[str] = data["modules"]
+    old_stamps: list[int] = data["stamps"]
+    if modules == old_modules and stamps == old_stamps:
+        return ImportGraph(package, modules, data["importers"], data["pending"])
+
+    old_ids = {module: index for index, module in enumerate(old_modules)}
+    # New index of every cached module whose imports still hold, else None.
+    kept: list[int | None] = [None] * len(old_modules)
+    added: set[str] = set()
+    for index, module in enumerate(modules):
+        old = old_ids.get(module)
+        if old is None:
+            added.add(module_name(package, module))
+        elif old_stamps[2 * old : 2 * old + 2] == stamps[2 * index : 2 * index + 2]:
+            kept[old] = index
+    old_pending: dict[str, list[int]] = data["pending"]
+    for name in added.intersection(old_pending):
+        for old in old_pending[name]:
+            kept[old] = None
+
+    positions = {module: index for index, module in enumerate(modules)}
+    importers: list[list[int]] = [[] for _ in modules]
+    pending: dict[str, list[int]] = {}
+    for old, old_importers in enumerate(data["importers"]):
+        still = [kept[i] for i in old_importers if kept[i] is not None]
+        if not still:
+            continue
+        target = positions.get(old_modules[old])
+        if target is None:
+            pending.setdefault(module_name(package, old_modules[old]), []).extend(still)
+        else:
+            importers[target] = still
+    for name, old_importers in old_pending.items():
+        still = [kept[i] for i in old_importers if kept[i] is not None]
+        if still and name not in added:
+            pending.setdefault(name, []).extend(still)
+
+    clean = bytearray(len(modules))
+    for index in kept:
+        if index is not None:
+            clean[index] = 1
+    dirty = [index for index in range(len(modules)) if not clean[index]]
+    cache = ImportCache(cache_dir) if len(dirty) >= PARALLEL_PARSE_THRESHOLD else None
+    parsed = parse_imports(
+        [package_dir / modules[index] for index in dirty], cache, workers
+    )
+    if cache is not None:
+        cache.save()
+    resolver = _Resolver(package, modules)
+    for index, names in zip(dirty, parsed, strict=True):
+        targets, unresolved = resolver.resolve(modules[index], names)
+        for target in targets:
+            if target != index:
+                importers[target].append(index)
+        for name in unresolved:
+            pending.setdefault(name, []).append(index)
+
+    save_json(
+        path,
+        {
+            "version": GRAPH_CACHE_VERSION,
+            "package": package,
+            "modules": modules,
+            "stamps": stamps,
+            "importers": importers,
+            "pending": pending,
+        },
+    )
+    return ImportGraph(package, modules, importers, pending)
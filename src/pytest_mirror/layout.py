@@ -0,0 +1,143 @@
+"""Project layout detection for pytest-mirror.
+
+When no package directory is configured, the package is detected from the
+project layout: a package under ``src/`` first, then one at the project root.
+Candidates are taken in name order, and version control, virtualenv, build and
+cache directories are never considered, so detection does not depend on
+directory listing order or pick a tree that is expensive to walk.
+
+The detected directory is cached in the project cache and reused until the
+``pyproject.toml`` governing the project changes or the directory disappears.
+"""
+
+from pathlib import Path
+
+from .cache import load_json, save_json
+from .config import find_pyproject
+
+# Module-specific constants
+SRC_DIR_NAME = "src"
+INIT_FILE_NAME = "__init__.py"
+VENV_MARKER_FILE_NAME = "pyvenv.cfg"
+EGG_INFO_SUFFIX = ".egg-info"
+SKIPPED_DIR_NAMES = frozenset(
+    {
+        "__pycache__",
+        "build",
+        "dist",
+        "docs",
+        "env",
+        "htmlcov",
+        "node_modules",
+        "site-packages",
+        "test",
+        "tests",
+        "venv",
+    }
+)
+LAYOUT_CACHE_FILE_NAME = "layout.json"
+LAYOUT_CACHE_VERSION = 1
+
+
+def _is_candidate(path: Path) -> bool:
+    """Return whether path may be the package directory.
+
+    Hidden directories (``.git``, ``.venv``, ``.tox`` and the like), the names
+    in ``SKIPPED_DIR_NAMES``, egg-info metadata and virtualenvs under any name
+    are excluded.
+    """
+    name = path.name
+    return (
+        path.is_dir()
+        and not name.startswith(".")
+        and name not in SKIPPED_DIR_NAMES
+        and not name.endswith(EGG_INFO_SUFFIX)
+        and not (path / VENV_MARKER_FILE_NAME).exists()
+    )
+
+
+def _pick(directory: Path, exclude: str | None = None) -> Path | None:
+    """Return the first candidate subdirectory, preferring regular packages."""
+    try:
+        candidates = sorted(
+            path
+            for path in directory.iterdir()
+            if path.name != exclude and _is_candidate(path)
+        )
+    except OSError:
+        return None
+    for path in candidates:
+        if (path / INIT_FILE_NAME).is_file():
+            return path
+    return candidates[0] if candidates else None
+
+
+def detect_package_dir(root: Path) -> Path:
+    """Detect the package directory of the project at root.
+
+    Args:
+        root (Path): Project root directory.
+
+    Returns:
+        Path: The first package under ``src/``, else the first package at the
+        root, else the first remaining candidate directory in name order;
+        root itself when there is no candidate.
+    """
+    src_dir = root / SRC_DIR_NAME
+    if src_dir.is_dir():
+        package_dir = _pick(src_dir)
+        if package_dir is not None:
+            return package_dir
+    return _pick(root, exclude=SRC_DIR_NAME) or root
+
+
+def _pyproject_mtime(root: Path) -> int | None:
+    """Return the modification time of the project's pyproject.toml, if any."""
+    pyproject = find_pyproject(root)
+    if pyproject is None:
+        return None
+    try:
+        return pyproject.stat().st_mtime_ns
+    except OSError:
+        return None
+
+
+def cached_package_dir(root: Path, cache_dir: Path) -> Path:
+    """Return the detected package directory, reusing a cached detection.
+
+    The fallback to root itself is not cached, so a package created later is
+    picked up on the next run.
+
+    Args:
+        root (Path): Project root directory.
+        cache_dir (Path): Directory holding the layout cache file.
+
+    Returns:
+        Path: The package directory, as ``detect_package_dir`` would return it.
+    """
+    path = cache_dir / LAYOUT_CACHE_FILE_NAME
+    mtime = _pyproject_mtime(root)
+    data = load_json(path)
+    if (
+        isinstance(data, dict)
+        and data.get("version") == LAYOUT_CACHE_VERSION
+        and data.get("root") == str(root)
+        and data.get("pyproject_mtime") == mtime
+        and isinstance(data.get("package_dir"), str)
+    ):
+        package_dir = root / data["package_dir"]
+        if package_dir.is_dir():
+            return package_dir
+
+    package_dir = detect_package_dir(root)
+    if package_dir != root:
+        save_json(
+            path,
+            {
+                "version": LAYOUT_CACHE_VERSION,
+                "root": str(root),
+                "pyproject_mtime": mtime,
+                "package_dir": package_dir.relative_to(root).as_posix(),
+            },
+        )
+    return package_dir
@@ -0,0 +1,448 @@
+r"""Source-to-test path mapping strategies for pytest-mirror.
+
+A strategy maps POSIX module paths relative to ``package_dir`` onto test paths
+relative to ``tests_dir``. Strategies are compiled once per run into a
+``MirrorMap``, a bidirectional table that answers forward and reverse lookups
+with a single dictionary hit.
+
+Strategies are configured in ``pyproject.toml``::
+
+    [tool.pytest-mirror]
+    mapping = "suffix"  # mirror | suffix | flat | package
+
+or with a regular expression and a ``str.format`` template::
+
+    [tool.pytest-mirror.mapping]
+    pattern = '(?P<dir>.*/)?(?P<name>[^/]+)\.py'
+    template = "{dir}{name}_test.py"
+"""
+
+import re
+import string
+from abc import ABC, abstractmethod
+from collections.abc import Callable, Iterable, Mapping, Sequence
+from pathlib import Path
+from typing import Any
+
+from .config import load_config
+
+# Module-specific constants
+TEST_FILE_PREFIX = "test_"
+TEST_FILE_SUFFIX = "_test.py"
+PY_SUFFIX = ".py"
+DEFAULT_STRATEGY = "mirror"
+MAPPING_CONFIG_KEY = "mapping"
+COLLISION_MESSAGE = (
+    "Mapping {strategy!r} maps several modules onto the same test file; "
+    "rename them or choose another mapping:{collisions}"
+)
+
+
+class MappingCollision(ValueError):
+    """A strategy mapped several source modules onto one test file."""
+
+
+def _split(path: str) -> tuple[str, str]:
+    """Split a POSIX path into its directory prefix (with slash) and name."""
+    head, _, name = path.rpartition("/")
+    return (f"{head}/" if head else ""), name
+
+
+class MappingStrategy(ABC):
+    """Base class for source-to-test mapping strategies.
+
+    Strategies with ``preserves_dirs`` set map ``dir/...`` sources only onto
+    ``dir/...`` tests, so any subdirectory pair can be validated on its own.
+    """
+
+    name = ""
+    preserves_dirs = False
+
+    @abstractmethod
+    def test_path(self, source: str) -> str | None:
+        """Return the test path for a source module, or None if unmapped."""
+
+    def map_paths(self, sources: Sequence[str]) -> list[str | None]:
+        """Map a batch of source modules onto their test paths."""
+        return [self.test_path(source) for source in sources]
+
+    def canonical_test_path(self, test: str) -> str:
+        """Normalize an existing test file onto the path mapped from its source."""
+        return test
+
+    def is_test_file(self, path: str) -> bool:
+        """Return whether a path looks like a test file under this strategy."""
+        return _split(path)[1].startswith(TEST_FILE_PREFIX)
+
+
+class MirrorStrategy(MappingStrategy):
+    """``pkg/mod.py`` -> ``pkg/test_mod.py`` (the default)."""
+
+    name = "mirror"
+    preserves_dirs = True
+
+    def test_path(self, source: str) -> str | None:
+        """Prefix the module name with ``test_``."""
+        head, name = _split(source)
+        return f"{head}{TEST_FILE_PREFIX}{name}"
+
+
+class SuffixStrategy(MappingStrategy):
+    """``pkg/mod.py`` -> ``pkg/mod_test.py``."""
+
+    name = "suffix"
+    preserves_dirs = True
+
+    def test_path(self, source: str) -> str | None:
+        """Suffix the module name with ``_test``."""
+        return source.removesuffix(PY_SUFFIX) + TEST_FILE_SUFFIX
+
+    def is_test_file(self, path: str) -> bool:
+        """Return whether the file name ends with ``_test.py``."""
+        return path.endswith(TEST_FILE_SUFFIX)
+
+
+class FlatStrategy(MappingStrategy):
+    """``pkg/mod.py`` -> ``test_mod.py``, all tests in one directory."""
+
+    name = "flat"
+
+    def test_path(self, source: str) -> str | None:
+        """Drop the package directories and prefix the name with ``test_``."""
+        return f"{TEST_FILE_PREFIX}{_split(source)[1]}"
+
+
+class PackageStrategy(MappingStrategy):
+    """``pkg/mod.py`` -> ``pkg/mod/test_mod.py``; any ``test_*.py`` there counts."""
+
+    name = "package"
+    preserves_dirs = True
+
+    def test_path(self, source: str) -> str | None:
+        """Place the test in a package named after the module."""
+        stem = source.removesuffix(PY_SUFFIX)
+        return f"{stem}/{TEST_FILE_PREFIX}{_split(stem)[1]}{PY_SUFFIX}"
+
+    def canonical_test_path(self, test: str) -> str:
+        """Map every ``test_*.py`` in a module's test package onto one path."""
+        head, name = _split(test)
+        if not head or not name.startswith(TEST_FILE_PREFIX):
+            return test
+        module = _split(head[:-1])[1]
+        return f"{head}{TEST_FILE_PREFIX}{module}{PY_SUFFIX}"
+
+
+class TemplateStrategy(MappingStrategy):
+    """Map sources matching a regular expression through a format template.
+
+    Sources that do not match the pattern are not mirrored.
+    """
+
+    name = "template"
+
+    def __init__(self, pattern: str, template: str) -> None:
+        """Compile the mapping.
+
+        Args:
+            pattern (str): Regular expression matched against the whole source
+                path; named groups are available to the template.
+            template (str): ``str.format`` template producing the test path.
+
+        Raises:
+            ValueError: If the pattern is not a valid regular expression, or
+                the template is malformed or refers to a group the pattern
+                does not define.
+        """
+        try:
+            self.pattern = re.compile(pattern)
+        except re.error as exc:
+            raise ValueError(f"Invalid mapping pattern {pattern!r}: {exc}") from exc
+        self.template = template
+        self._check_template()
+
+    def _check_template(self) -> None:
+        """Check every field of the template against the pattern's groups.
+
+        Raises:
+            ValueError: If the template is malformed or a field names no group
+                of the pattern.
+        """
+        try:
+            fields = [
+                field
+                for _, field, _, _ in string.Formatter().parse(self.template)
+                if field is not None
+            ]
+        except ValueError as exc:
+            raise ValueError(
+                f"Invalid mapping template {self.template!r}: {exc}"
+            ) from exc
+        position = 0
+        for field in fields:
+            key = re.split(r"[.\[]", field, maxsplit=1)[0]
+            if not key:
+                key = str(position)
+                position += 1
+            valid = (
+                int(key) < self.pattern.groups
+                if key.isdigit()
+                else key in self.pattern.groupindex
+            )
+            if not valid:
+                raise ValueError(
+                    f"Invalid mapping template {self.template!r}: "
+                    f"pattern {self.pattern.pattern!r} has no group {key!r}"
+                )
+
+    def test_path(self, source: str) -> str | None:
+        """Format the template with the groups matched in source."""
+        match = self.pattern.fullmatch(source)
+        if match is None:
+            return None
+        groups = [group or "" for group in match.groups()]
+        named = {key: value or "" for key, value in match.groupdict().items()}
+        return self.template.format(*groups, **named)
+
+    def is_test_file(self, path: str) -> bool:
+        """Templates have no naming convention to recognize tests by."""
+        return False
+
+
+class HookStrategy(MappingStrategy):
+    """Map a whole batch of sources through one ``mirror_map_test_paths`` call.
+
+    Falls back to another strategy when no hook implementation returns a result.
+    """
+
+    name = "hook"
+
+    def __init__(
+        self,
+        call: Callable[[list[str]], list[str | None] | None],
+        fallback: MappingStrategy,
+    ) -> None:
+        """Wrap a batch mapping callable.
+
+        Args:
+            call (Callable): Receives all source paths and returns their test
+                paths in order, or None to defer to fallback.
+            fallback (MappingStrategy): Strategy used when call returns None.
+        """
+        self.call = call
+        self.fallback = fallback
+        self._deferred = False
+
+    def map_paths(self, sources: Sequence[str]) -> list[str | None]:
+        """Map all sources with a single call.
+
+        Raises:
+            ValueError: If the hook returns a different number of paths.
+        """
+        result = self.call(list(sources))
+        if result is None:
+            self._deferred = True
+            return self.fallback.map_paths(sources)
+        if len(result) != len(sources):
+            raise ValueError(
+                f"mirror_map_test_paths returned {len(result)} paths "
+                f"for {len(sources)} source modules"
+            )
+        return list(result)
+
+    def test_path(self, source: str) -> str | None:
+        """Map a single source through the batch call."""
+        return self.map_paths([source])[0]
+
+    def canonical_test_path(self, test: str) -> str:
+        """Normalize like the fallback once the hook has deferred to it."""
+        if self._deferred:
+            return self.fallback.canonical_test_path(test)
+        return test
+
+    def is_test_file(self, path: str) -> bool:
+        """Recognize test files by the fallback strategy's convention."""
+        return self.fallback.is_test_file(path)
+
+
+STRATEGIES: dict[str, type[MappingStrategy]] = {
+    strategy.name: strategy
+    for strategy in (MirrorStrategy, SuffixStrategy, FlatStrategy, PackageStrategy)
+}
+
+
+def get_strategy(spec: MappingStrategy | str | dict | None = None) -> MappingStrategy:
+    """Build a mapping strategy from a name, a pattern/template table or None.
+
+    Args:
+        spec (MappingStrategy | str | dict | None): A strategy instance, one of
+            the names in ``STRATEGIES``, a dict with ``pattern`` and
+            ``template`` keys, or None for the default strategy.
+
+    Returns:
+        MappingStrategy: The compiled strategy.
+
+    Raises:
+        ValueError: If the name is unknown or the table is incomplete.
+    """
+    if isinstance(spec, MappingStrategy):
+        return spec
+    if spec is None:
+        spec = DEFAULT_STRATEGY
+    if isinstance(spec, dict):
+        if "pattern" not in spec or "template" not in spec:
+            raise ValueError("Mapping table requires 'pattern' and 'template' keys")
+        return TemplateStrategy(spec["pattern"], spec["template"])
+    try:
+        return STRATEGIES[spec]()
+    except KeyError:
+        choices = ", ".join(sorted(STRATEGIES))
+        raise ValueError(f"Unknown mapping strategy {spec!r} (use {choices})") from None
+
+
+def resolve_strategy(
+    spec: MappingStrategy | str | dict | None, package_dir: Path
+) -> MappingStrategy:
+    """Return the explicit strategy, or the one configured for package_dir."""
+    if spec is None:
+        spec = load_config(package_dir).get(MAPPING_CONFIG_KEY)
+    return get_strategy(spec)
+
+
+def hook_strategy(
+    hook: Any, package_dir: Path, tests_dir: Path
+) -> MappingStrategy | None:
+    """Wrap a ``mirror_map_test_paths`` hook caller if any plugin implements it.
+
+    Args:
+        hook (Any): The pluggy hook caller ``pm.hook.mirror_map_test_paths``.
+        package_dir (Path): Path to the main package directory.
+        tests_dir (Path): Path to the tests directory.
+
+    Returns:
+        MappingStrategy | None: A batched hook strategy falling back to the
+        configured mapping, or None if the hook has no implementations.
+    """
+    if not hook.get_hookimpls():
+        return None
+
+    def call(sources: list[str]) -> list[str | None] | None:
+        return hook(package_dir=package_dir, tests_dir=tests_dir, source_paths=sources)
+
+    return HookStrategy(call, resolve_strategy(None, package_dir))
+
+
+class MirrorMap:
+    """Bidirectional source <-> test path table compiled from a strategy."""
+
+    __slots__ = ("forward", "reverse", "strategy")
+
+    def __init__(
+        self,
+        strategy: MappingStrategy,
+        sources: Sequence[str],
+        tests: Sequence[str | None],
+    ) -> None:
+        """Build the table.
+
+        Args:
+            strategy (MappingStrategy): Strategy used for reverse normalization.
+            sources (Sequence[str]): Source module paths.
+            tests (Sequence[str | None]): Test paths mapped from sources, in order;
+                None entries leave the source unmirrored.
+
+        Raises:
+            MappingCollision: If several sources map onto the same test path,
+                which could then only ever test one of them.
+        """
+        self.strategy = strategy
+        self.forward: dict[str, str] = {}
+        self.reverse: dict[str, str] = {}
+        collisions: dict[str, list[str]] = {}
+        for source, test in zip(sources, tests, strict=True):
+            if test is None:
+                continue
+            self.forward[source] = test
+            first = self.reverse.setdefault(test, source)
+            if first != source:
+                collisions.setdefault(test, [first]).append(source)
+        if collisions:
+            lines = "".join(
+                f"\n  {test}: {', '.join(colliding)}"
+                for test, colliding in collisions.items()
+            )
+            raise MappingCollision(
+                COLLISION_MESSAGE.format(strategy=strategy.name, collisions=lines)
+            )
+
+    @classmethod
+    def build(cls, strategy: MappingStrategy, sources: Sequence[str]) -> "MirrorMap":
+        """Map all sources through strategy in one batch."""
+        return cls(strategy, sources, strategy.map_paths(sources))
+
+    def test_for(self, source: str) -> str | None:
+        """Return the test path mirroring source."""
+        return self.forward.get(source)
+
+    def source_for(self, test: str) -> str | None:
+        """Return the source module mirrored by an existing test file."""
+        return self.reverse.get(self.strategy.canonical_test_path(test))
+
+    def missing(self, tests: Iterable[str]) -> list[str]:
+        """Return mapped test paths absent from tests, without duplicates."""
+        if (
+            type(self.strategy).canonical_test_path
+            is MappingStrategy.canonical_test_path
+        ):
+            present = tests if isinstance(tests, set | frozenset) else set(tests)
+        else:
+            present = {self.strategy.canonical_test_path(test) for test in tests}
+        missing: list[str] = []
+        seen: set[str] = set()
+        for test in self.forward.values():
+            if test not in present and test not in seen:
+                seen.add(test)
+                missing.append(test)
+        return missing
+
+    def orphans(self, tests: Iterable[str]) -> list[str]:
+        """Return test files in tests that no source module maps onto.
+
+        Only files the strategy recognizes as tests are considered, so
+        ``conftest.py``, ``__init__.py`` and helper modules are never orphans.
+        """
+        strategy = self.strategy
+        return sorted(
+            test
+            for test in tests
+            if strategy.is_test_file(test)
+            and strategy.canonical_test_path(test) not in self.reverse
+        )
+
+    def stale(
+        self, source_mtimes: Mapping[str, int], test_mtimes: Mapping[str, int]
+    ) -> list[tuple[str, str, int]]:
+        """Return sources modified after the newest test file mirroring them.
+
+        Args:
+            source_mtimes (Mapping[str, int]): Modification times in
+                nanoseconds, keyed by source path.
+            test_mtimes (Mapping[str, int]): Modification times in
+                nanoseconds, keyed by existing test path.
+
+        Returns:
+            list[tuple[str, str, int]]: ``(source, test, lag_ns)`` in source
+            order; sources without an existing test are not stale, but missing.
+        """
+        canonical = self.strategy.canonical_test_path
+        newest: dict[str, tuple[int, str]] = {}
+        for test, mtime in test_mtimes.items():
+            key = canonical(test)
+            if key in self.reverse and mtime > newest.get(key, (-1, ""))[0]:
+                newest[key] = (mtime, test)
+        stale = []
+        for source, key in self.forward.items():
+            tested = newest.get(key)
+            modified = source_mtimes.get(source)
+            if tested is not None and modified is not None and modified > tested[0]:
+                stale.append((source, tested[1], modified - tested[0]))
+        return stale
@@ -0,0 +1,96 @@
+"""Metrics export for pytest-mirror runs.
+
+Renders a ``PhaseProfile`` as an OpenMetrics textfile, for the node-exporter
+textfile collector and similar scrapers, or as JSON. Files are written
+atomically, so a collector never reads a partial file.
+"""
+
+import json
+from pathlib import Path
+
+from .cache import atomic_write_text
+from .profiling import (
+    COUNTER_DIRS_PRUNED,
+    COUNTER_GENERATED,
+    COUNTER_MISSING,
+    COUNTER_MODULES_SCANNED,
+    COUNTER_TESTS_FOUND,
+    PhaseProfile,
+)
+
+# Module-specific constants
+METRIC_PREFIX = "pytest_mirror_"
+JSON_SUFFIX = ".json"
+COUNTER_HELP = {
+    COUNTER_MODULES_SCANNED: "Source modules found in the package directories.",
+    COUNTER_TESTS_FOUND: "Python files found in the tests directories.",
+    COUNTER_MISSING: "Modules without a mirrored test file.",
+    COUNTER_GENERATED: "Test files generated for missing tests.",
+    COUNTER_DIRS_PRUNED: "Directories skipped through .gitignore rules.",
+}
+PHASE_SECONDS_METRIC = "phase_duration_seconds"
+PHASE_SECONDS_HELP = "Exclusive wall time spent in each phase of the run."
+PHASE_CALLS_METRIC = "phase_calls"
+PHASE_CALLS_HELP = "Number of times each phase ran."
+EOF_MARKER = "# EOF"
+
+
+def _escape_label(value: str) -> str:
+    """Escape a label value for the OpenMetrics text format."""
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _family(name: str, help_text: str, samples: list[str]) -> list[str]:
+    """Return the lines of one gauge metric family."""
+    metric = METRIC_PREFIX + name
+    return [
+        f"# TYPE {metric} gauge",
+        f"# HELP {metric} {help_text}",
+        *(f"{metric}{sample}" for sample in samples),
+    ]
+
+
+def render_openmetrics(profile: PhaseProfile) -> str:
+    """Render profile in the OpenMetrics text format.
+
+    Every value describes the last run, so all families are gauges. Phases are
+    reported as ``phase`` labels on the duration and call-count families.
+
+    Args:
+        profile (PhaseProfile): The run's profile.
+
+    Returns:
+        str: The exposition, ending with ``# EOF``.
+    """
+    lines: list[str] = []
+    for name, help_text in COUNTER_HELP.items():
+        lines += _family(name, help_text, [f" {profile.counters.get(name, 0)}"])
+    phases = sorted(profile.seconds)
+    labels = {name: f'{{phase="{_escape_label(name)}"}}' for name in phases}
+    lines += _family(
+        PHASE_SECONDS_METRIC,
+        PHASE_SECONDS_HELP,
+        [f"{labels[name]} {profile.seconds[name]:.6f}" for name in phases],
+    )
+    lines += _family(
+        PHASE_CALLS_METRIC,
+        PHASE_CALLS_HELP,
+        [f"{labels[name]} {profile.calls[name]}" for name in phases],
+    )
+    lines.append(EOF_MARKER)
+    return "\n".join(lines) + "\n"
+
+
+def write_metrics(path: Path, profile: PhaseProfile) -> None:
+    """Atomically write profile to path as JSON or OpenMetrics.
+
+    Args:
+        path (Path): Output file; a ``.json`` suffix selects JSON, anything
+            else (such as the collector's ``.prom``) OpenMetrics.
+        profile (PhaseProfile): The run's profile.
+    """
+    if path.suffix == JSON_SUFFIX:
+        text = json.dumps(profile.as_dict(), indent=2) + "\n"
+    else:
+        text = render_openmetrics(profile)
+    atomic_write_text(path, text)
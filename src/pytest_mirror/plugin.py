@@ -1,22 +1,75 @@
 """Pytest plugin integration for pytest-mirror.
 
 Provides pytest hooks for test structure validation and auto-generation.
+
+This module is imported into every pytest process through the ``pytest11``
+entry point, so walking, mapping and plugin manager code is only imported once
+a session actually validates.
 """
 
+import argparse
 import os
+import threading
+import time
+from collections.abc import Sequence
 from pathlib import Path
+from typing import TYPE_CHECKING
 
+import pluggy
 import pytest
 
-from .constants import DEFAULT_TEST_CONTENT, MIRROR_PREFIX
-from .plugin_manager import get_plugin_manager
-from .validator import MirrorValidator
+from .cache import default_cache_dir
+from .constants import DEFAULT_TEST_CONTENT, MIRROR_PREFIX, PROJECT_NAME
+from .profiling import (
+    COUNTER_GENERATED,
+    COUNTER_MISSING,
+    PHASE_AUTO_DETECTION,
+    PHASE_PATH_RESOLUTION,
+    PHASE_PLUGIN_MANAGER,
+    PHASE_STUB_WRITES,
+    PhaseProfile,
+    activate,
+    active,
+    count,
+    phase,
+)
+from .report import MirrorReport, StaleTest
+
+if TYPE_CHECKING:
+    from .mapping import MappingStrategy
 
 # Module-specific constants
 MIRROR_DEBUG_PREFIX = "[MIRROR][DEBUG]"
 MISSING_TESTS_MESSAGE = "Missing tests detected (auto-generate disabled):"
 VALIDATION_SUCCESS_MESSAGE = "Test structure validated successfully."
+ORPHANS_MESSAGE = "Orphaned tests (no mirrored source module):"
 VALIDATION_FAILED_MESSAGE = "Test structure validation failed"
+UNTESTED_SYMBOLS_MESSAGE = "Untested symbols detected:"
+PY_SUFFIX = ".py"
+COLLECTED_FILES_KEY = pytest.StashKey[set[Path]]()
+PRUNED_PATHS_KEY = pytest.StashKey[set[Path]]()
+PYCACHE_DIR_NAME = "__pycache__"
+BACKGROUND_KEY = pytest.StashKey["_BackgroundValidation"]()
+PROFILE_KEY = pytest.StashKey[PhaseProfile]()
+PROFILE_SECTION_TITLE = f"{PROJECT_NAME} profile"
+STALE_KEY = pytest.StashKey[tuple[StaleTest, ...]]()
+STALE_SECTION_TITLE = f"{PROJECT_NAME} stale tests"
+NO_STALE_TESTS_MESSAGE = "No module was modified after its mirrored tests."
+PLACEHOLDERS_KEY = pytest.StashKey[MirrorReport]()
+PLACEHOLDERS_SECTION_TITLE = f"{PROJECT_NAME} placeholder tests"
+NO_PLACEHOLDERS_MESSAGE = "No test file is an unmodified placeholder."
+PACKAGE_DIR_KEY = "package-dir"
+TESTS_DIR_KEY = "tests-dir"
+SYMBOLS_KEY = "symbols"
+DURATIONS_KEY = "durations"
+DURATION_RECORDER_KEY = pytest.StashKey["_DurationRecorder"]()
+NODE_ID_SEPARATOR = "::"
+INVALID_SHARD_MESSAGE = "expected I/N with 1 <= I <= N, got {value!r}"
+AUTO_GENERATE_KEY = "auto-generate"
+DISABLE_AUTO_GENERATE_KEY = "disable-auto-generate"
+TRUE_VALUES = frozenset({"true", "1", "yes"})
+FALSE_VALUES = frozenset({"false", "0", "no"})
+BUDGET_EXCEEDED_MESSAGE = "Validation exceeded the {budget}s budget; result:"
 
 
 def pytest_addoption(parser: pytest.Parser) -> None:
@@ -44,6 +97,137 @@ def pytest_addoption(parser: pytest.Parser) -> None:
         default=None,
         help="Path to the tests directory (default: auto-detect)",
     )
+    group.addoption(
+        "--mirror-symbols",
+        action="store_true",
+        help="Also require a test named after every public function, class and "
+        "method of each mirrored module.",
+    )
+    group.addoption(
+        "--mirror-only",
+        action="store_true",
+        help="Only validate (and generate) the mirrored test structure, then exit "
+        "before collecting any tests.",
+    )
+    group.addoption(
+        "--mirror-from-collection",
+        action="store_true",
+        help="Validate after collection using the files pytest collected instead "
+        "of walking the tests directory again. Tests generated in this mode run "
+        "from the next session on.",
+    )
+    group.addoption(
+        "--mirror-background",
+        action="store_true",
+        help="Validate on a background thread while pytest collects and check "
+        "the result once collection has finished. Tests generated in this mode "
+        "run from the next session on.",
+    )
+    group.addoption(
+        "--mirror-budget",
+        action="store",
+        type=float,
+        default=None,
+        metavar="SECONDS",
+        help="With --mirror-background, wait at most SECONDS after session start "
+        "for the result; a later result is reported in the terminal summary.",
+    )
+    group.addoption(
+        "--mirror-profile",
+        action="store_true",
+        help="Time each pytest-mirror phase and show the breakdown in the "
+        "terminal summary.",
+    )
+    group.addoption(
+        "--mirror-profile-json",
+        action="store",
+        default=None,
+        metavar="PATH",
+        help="Also write the --mirror-profile breakdown to PATH as JSON.",
+    )
+    group.addoption(
+        "--mirror-metrics",
+        action="store",
+        default=None,
+        metavar="PATH",
+        help="Write run metrics (modules scanned, tests found, missing, "
+        "generated, directories pruned and phase durations) to PATH when the "
+        "session ends: JSON for a .json suffix, OpenMetrics otherwise.",
+    )
+    group.addoption(
+        "--mirror-stale",
+        action="store_true",
+        help="List the modules modified after their mirrored tests in the "
+        "terminal summary, most stale first.",
+    )
+    group.addoption(
+        "--mirror-placeholders",
+        action="store_true",
+        help="List the test files that are still unmodified placeholder stubs "
+        "in the terminal summary.",
+    )
+    group.addoption(
+        "--mirror-changed",
+        action="append",
+        default=[],
+        metavar="REF_OR_FILE",
+        help="Only run the tests mirroring source modules changed against a "
+        "git ref, or named explicitly as .py files; changed test files run "
+        "too. May be given more than once.",
+    )
+    group.addoption(
+        "--mirror-transitive",
+        action="store_true",
+        help="With --mirror-changed, also run the tests of every module that "
+        "imports a changed module, directly or through other modules.",
+    )
+    group.addoption(
+        "--mirror-test-shard",
+        action="store",
+        type=_parse_shard,
+        default=None,
+        metavar="I/N",
+        help="Only run shard I of N. Tests are grouped by the source module they "
+        "mirror and the groups balanced over the shards by the durations in "
+        "--mirror-shard-durations, or by file size; every node computes the "
+        "same split.",
+    )
+    group.addoption(
+        "--mirror-shard-durations",
+        action="store",
+        default=None,
+        metavar="PATH",
+        help="With --mirror-test-shard, weight the groups by the durations in "
+        "PATH, a durations.json recorded with --mirror-durations. The file is "
+        "only read; give every node the same copy.",
+    )
+    group.addoption(
+        "--mirror-durations",
+        action="store_true",
+        help="Record how long the tests mirroring each source module take and "
+        "keep the last runs in the pytest cache for 'pytest-mirror durations'.",
+    )
+    group.addoption(
+        "--mirror-full",
+        action="store_true",
+        help="Validate the whole project on every run. By default validation is "
+        "limited to the test directories pytest was invoked with and skipped "
+        "for --collect-only and --lf runs.",
+    )
+
+
+def _parse_shard(value: str) -> tuple[int, int]:
+    """Parse a ``--mirror-test-shard`` value into ``(index, count)``.
+
+    Raises:
+        argparse.ArgumentTypeError: If value is not ``I/N`` with 1 <= I <= N.
+    """
+    index, separator, count = value.partition("/")
+    if separator and index.isdigit() and count.isdigit():
+        shard = int(index), int(count)
+        if 1 <= shard[0] <= shard[1]:
+            return shard
+    raise argparse.ArgumentTypeError(INVALID_SHARD_MESSAGE.format(value=value))
 
 
 def _get_path_option(optval) -> str | None:
@@ -54,49 +238,54 @@ def _get_path_option(optval) -> str | None:
     return None
 
 
-def _detect_package_dir(project_root: Path) -> Path:
-    """Auto-detect the package directory from project structure."""
-    # Try to auto-detect: prefer src/pytest_mirror, then pytest_mirror, then first subdir
-    src_dir = project_root / "src" / "pytest_mirror"
-    if src_dir.exists():
-        return src_dir
-
-    fallback = project_root / "pytest_mirror"
-    if fallback.exists():
-        return fallback
+def _settings(project_root: Path) -> dict:
+    """Return the ``[tool.pytest-mirror]`` settings of the project."""
+    from .config import load_config
 
-    # fallback: first subdir
-    subdirs = (
-        [d for d in (project_root / "src").iterdir() if d.is_dir()]
-        if (project_root / "src").exists()
-        else []
-    )
-    if not subdirs:
-        subdirs = [d for d in project_root.iterdir() if d.is_dir()]
-    return subdirs[0] if subdirs else project_root
+    return load_config(project_root)
 
 
 def _resolve_package_dir(config: pytest.Config, project_root: Path) -> Path:
-    """Resolve package directory from config options, environment, or auto-detection."""
+    """Resolve package directory from options, environment, pyproject or detection."""
     package_dir = _get_path_option(
         config.getoption("--mirror-package-dir")
     ) or os.environ.get("PYTEST_MIRROR_PACKAGE_DIR")
+    if package_dir:
+        return Path(package_dir)
+
+    configured = _settings(project_root).get(PACKAGE_DIR_KEY)
+    if configured:
+        return project_root / configured
 
-    if not package_dir:
-        return _detect_package_dir(project_root)
-    return Path(package_dir)
+    from .layout import cached_package_dir
+
+    with phase(PHASE_AUTO_DETECTION):
+        return cached_package_dir(project_root, _get_cache_dir(config, project_root))
 
 
 def _resolve_tests_dir(config: pytest.Config, project_root: Path) -> Path:
-    """Resolve tests directory from config options, environment, or auto-detection."""
+    """Resolve tests directory from options, environment, pyproject or default."""
     tests_dir = _get_path_option(
         config.getoption("--mirror-tests-dir")
     ) or os.environ.get("PYTEST_MIRROR_TESTS_DIR")
+    if tests_dir:
+        return Path(tests_dir)
+    # Relative pyproject paths are relative to the project root
+    return project_root / _settings(project_root).get(TESTS_DIR_KEY, "tests")
+
+
+def _symbols_enabled(config: pytest.Config) -> bool:
+    """Return whether symbol-level checks are enabled by option or pyproject."""
+    if config.getoption("--mirror-symbols"):
+        return True
+    return bool(_settings(Path(config.rootpath)).get(SYMBOLS_KEY, False))
+
 
-    if not tests_dir:
-        # Try to auto-detect: prefer tests/ under project root
-        return project_root / "tests"
-    return Path(tests_dir)
+def _durations_enabled(config: pytest.Config) -> bool:
+    """Return whether test durations are recorded, by option or pyproject."""
+    if config.getoption("--mirror-durations"):
+        return True
+    return bool(_settings(Path(config.rootpath)).get(DURATIONS_KEY, False))
 
 
 def _print_debug_info(
@@ -110,19 +299,29 @@ def _print_debug_info(
         print(f"{MIRROR_DEBUG_PREFIX} tests_dir: {tests_dir}")
 
 
+def _generate_tests(missing_tests: Sequence[Path]) -> list[Path]:
+    """Write placeholder tests for missing paths and return the ones created."""
+    created = []
+    with phase(PHASE_STUB_WRITES):
+        for test_path in missing_tests:
+            test_path.parent.mkdir(parents=True, exist_ok=True)
+            if not test_path.exists():
+                test_path.write_text(DEFAULT_TEST_CONTENT)
+                created.append(test_path)
+    count(COUNTER_GENERATED, len(created))
+    return created
+
+
 def _handle_missing_tests(
-    missing_tests: list[Path], auto_generate: bool, config: pytest.Config
+    missing_tests: Sequence[Path], auto_generate: bool, config: pytest.Config
 ) -> None:
     """Handle missing tests by either generating them or reporting the error."""
     verbose = getattr(config.option, "verbose", 0) > 0
 
     if auto_generate and not config.getoption("--mirror-no-generate"):
-        for test_path in missing_tests:
-            test_path.parent.mkdir(parents=True, exist_ok=True)
-            if not test_path.exists():
-                test_path.write_text(DEFAULT_TEST_CONTENT)
-                if verbose:
-                    print(f"{MIRROR_PREFIX} Created: {test_path}")
+        for test_path in _generate_tests(missing_tests):
+            if verbose:
+                print(f"{MIRROR_PREFIX} Created: {test_path}")
     else:
         print(f"{MIRROR_PREFIX} {MISSING_TESTS_MESSAGE}")
         for path in missing_tests:
@@ -130,15 +329,67 @@ def _handle_missing_tests(
         pytest.exit(VALIDATION_FAILED_MESSAGE, returncode=1)
 
 
+def _get_cache_dir(config: pytest.Config, project_root: Path) -> Path:
+    """Return the pytest-mirror directory inside pytest's cache."""
+    cache = getattr(config, "cache", None)
+    if cache is not None:
+        return cache.mkdir(PROJECT_NAME)
+    return default_cache_dir(project_root)
+
+
+def _find_untested(
+    config: pytest.Config, targets: list[tuple[Path, Path]], project_root: Path
+) -> dict[Path, list[str]]:
+    """Return public symbols without a test named after them, for all targets."""
+    from .core import find_untested_symbols
+    from .mapping import MappingCollision
+    from .walker import FileLimitExceeded
+
+    cache_dir = _get_cache_dir(config, project_root)
+    untested: dict[Path, list[str]] = {}
+    for package_dir, tests_dir in targets:
+        try:
+            untested.update(
+                find_untested_symbols(package_dir, tests_dir, cache_dir=cache_dir)
+            )
+        except (FileLimitExceeded, MappingCollision) as exc:
+            pytest.exit(f"{MIRROR_PREFIX} {exc}", returncode=1)
+    return untested
+
+
+def _format_untested(untested: dict[Path, list[str]]) -> list[str]:
+    """Return report lines listing untested symbols per module."""
+    return [f"  - {module}: {', '.join(names)}" for module, names in untested.items()]
+
+
+def _check_symbols(
+    config: pytest.Config, package_dir: Path, tests_dir: Path, project_root: Path
+) -> None:
+    """Fail the session if any public symbol lacks a test named after it."""
+    _report_untested(_find_untested(config, [(package_dir, tests_dir)], project_root))
+
+
+def _report_untested(untested: dict[Path, list[str]]) -> None:
+    """Print untested symbols and fail the session if there are any."""
+    if untested:
+        print(f"{MIRROR_PREFIX} {UNTESTED_SYMBOLS_MESSAGE}")
+        for line in _format_untested(untested):
+            print(line)
+        pytest.exit(VALIDATION_FAILED_MESSAGE, returncode=1)
+
+
 def _get_auto_generate_config(config: pytest.Config) -> bool:
-    """Read auto-generate setting from pyproject.toml.
+    """Read the auto-generate setting from pyproject.toml.
 
     By default, auto-generate is enabled. To disable, set:
 
         [tool.pytest-mirror]
         auto-generate = false
 
-    in your pyproject.toml.
+    in your pyproject.toml, or ``disable-auto-generate = true``, which takes
+    precedence. String values ``"false"``, ``"0"`` and ``"no"`` (and
+    ``"true"``, ``"1"`` and ``"yes"`` for ``disable-auto-generate``) are
+    accepted as well.
 
     Args:
         config (pytest.Config): The pytest config object.
@@ -146,51 +397,645 @@ def _get_auto_generate_config(config: pytest.Config) -> bool:
     Returns:
         bool: True if auto-generate is enabled, False otherwise.
     """
-    try:
-        # pytest stores all loaded ini-like configs in config.inicfg
-        # Support both [tool.pytest-mirror] auto-generate and disable-auto-generate
-        raw_value = config.inicfg.get("tool.pytest-mirror.auto-generate")
-        disable_value = config.inicfg.get("tool.pytest-mirror.disable-auto-generate")
-        if disable_value is not None:
-            # If disable-auto-generate is set to true/1/yes, force disable
-            return str(disable_value).lower() not in {"true", "1", "yes"}
-        # If not set or set to anything except false/0/no, auto-generate is enabled
-        return str(raw_value).lower() not in {"false", "0", "no"}
-    except Exception:
-        return True  # default to auto-generate if missing
+    settings = _settings(Path(config.rootpath))
+    disable_value = settings.get(DISABLE_AUTO_GENERATE_KEY)
+    if disable_value is not None:
+        return str(disable_value).lower() not in TRUE_VALUES
+    return str(settings.get(AUTO_GENERATE_KEY)).lower() not in FALSE_VALUES
 
 
-def pytest_sessionstart(session: pytest.Session) -> None:
-    """Validate and optionally generate missing tests on pytest startup.
+def _normalize(path: Path) -> Path:
+    """Return path made absolute and normalized without touching the disk."""
+    return Path(os.path.normpath(path.absolute()))
 
-    Args:
-        session (pytest.Session): The pytest session object.
+
+def _invocation_scopes(config: pytest.Config, tests_dir: Path) -> list[str] | None:
+    """Return the tests_dir subdirectories named by the invocation's arguments.
+
+    File arguments contribute nothing: a test file pytest is asked to run
+    exists, so it already mirrors its module.
+
+    Returns:
+        list[str] | None: POSIX paths relative to tests_dir, outermost only,
+        or None if there are no arguments or one covers all of tests_dir.
     """
-    config = session.config
+    if not config.args:
+        return None
+    tests_root = _normalize(tests_dir)
+    invocation_dir = config.invocation_params.dir
+    scopes: list[str] = []
+    for arg in config.args:
+        path = _normalize(invocation_dir / arg.split("::")[0])
+        if tests_root.is_relative_to(path):
+            return None
+        if path.is_relative_to(tests_root) and path.is_dir():
+            scopes.append(path.relative_to(tests_root).as_posix())
+    outermost: list[str] = []
+    for scope in sorted(scopes):
+        if not any(scope.startswith(f"{kept}/") for kept in outermost):
+            outermost.append(scope)
+    return outermost
+
+
+def _collected_test_files(
+    config: pytest.Config, collected: set[Path], tests_dir: Path
+) -> list[str] | None:
+    """Return collected Python files relative to tests_dir.
+
+    Returns None when the collection did not cover all of tests_dir, so the
+    collected set cannot stand in for a walk: no argument names tests_dir or
+    one of its parents, e.g. with ``--mirror-full`` or an unscoped target
+    under narrower arguments, or ``--ignore``, ``collect_ignore``,
+    ``norecursedirs`` or a ``pytest_ignore_collect`` hook pruned a directory
+    or Python file inside it.
+    """
+    if config.getoption("ignore") or config.getoption("ignore_glob"):
+        return None
+    tests_root = _normalize(tests_dir)
+    invocation_dir = config.invocation_params.dir
+    if not any(
+        tests_root.is_relative_to(_normalize(invocation_dir / arg.split("::")[0]))
+        for arg in config.args
+    ):
+        return None
+    if any(
+        path.is_relative_to(tests_root)
+        for path in config.stash.get(PRUNED_PATHS_KEY, ())
+    ):
+        return None
+    return [
+        path.relative_to(tests_root).as_posix()
+        for path in collected
+        if path.is_relative_to(tests_root)
+    ]
+
+
+def _needs_validation(config: pytest.Config, tests_dir: Path) -> bool:
+    """Return whether this invocation validates anything at all.
+
+    Without ``--mirror-full``, ``--collect-only`` and ``--lf`` runs and runs
+    only naming test files need no validation. Decided from the options and
+    arguments alone, so such runs skip package detection and plugin loading.
+    """
+    if config.getoption("--mirror-full"):
+        return True
+    if config.getoption("collectonly") or (
+        config.pluginmanager.hasplugin("cacheprovider") and config.getoption("lf")
+    ):
+        return False
+    return _invocation_scopes(config, tests_dir) != []
+
+
+def _validation_targets(
+    config: pytest.Config, pm, package_dir: Path, tests_dir: Path
+) -> list[tuple[Path, Path]]:
+    """Return the (package_dir, tests_dir) pairs this invocation needs validated.
+
+    Runs ``_needs_validation`` rules out need none; runs limited to test
+    subdirectories only validate those against their mirrored source
+    subdirectories, provided the mapping keeps directories aligned and no
+    plugin maps paths itself.
+    """
+    if not _needs_validation(config, tests_dir):
+        return []
+    if config.getoption("--mirror-full"):
+        return [(package_dir, tests_dir)]
+    scopes = _invocation_scopes(config, tests_dir)
+    if scopes is None:
+        return [(package_dir, tests_dir)]
+    from .mapping import resolve_strategy
+
+    if scopes and (
+        pm.hook.mirror_map_test_paths.get_hookimpls()
+        or not resolve_strategy(None, package_dir).preserves_dirs
+    ):
+        return [(package_dir, tests_dir)]
+    return [
+        (package_dir / scope, tests_dir / scope)
+        for scope in scopes
+        if (package_dir / scope).is_dir()
+    ]
+
+
+def _prepare(
+    config: pytest.Config,
+) -> tuple[Path, pluggy.PluginManager, list[tuple[Path, Path]]]:
+    """Resolve the project root, plugin manager and validation targets."""
     project_root = Path(config.rootpath)
 
-    package_dir = _resolve_package_dir(config, project_root)
-    tests_dir = _resolve_tests_dir(config, project_root)
+    with phase(PHASE_PATH_RESOLUTION):
+        package_dir = _resolve_package_dir(config, project_root)
+        tests_dir = _resolve_tests_dir(config, project_root)
 
     _print_debug_info(config, package_dir, tests_dir)
 
-    # Check pyproject.toml config
-    auto_generate = _get_auto_generate_config(config)
-    # Register the MirrorValidator plugin if not already registered
-    pm = get_plugin_manager()
-    pm.register(MirrorValidator(), name="mirror_validator")
+    # The manager comes with a MirrorValidator registered
+    with phase(PHASE_PLUGIN_MANAGER):
+        from .plugin_manager import get_plugin_manager
 
-    # pm.hook returns a list of lists (one per plugin), flatten it
-    missing_tests_nested = pm.hook.validate_test_structure(
-        package_dir=package_dir, tests_dir=tests_dir
-    )
-    missing_tests = [item for sublist in missing_tests_nested for item in sublist]
+        pm = get_plugin_manager()
+    profile = active()
+    if profile is not None:
+        profile.monitor_hooks(pm)
+    targets = _validation_targets(config, pm, package_dir, tests_dir)
+
+    if getattr(config.option, "verbose", 0) > 0:
+        print(f"{MIRROR_DEBUG_PREFIX} targets: {targets}")
+    return project_root, pm, targets
+
+
+def _find_missing(
+    config: pytest.Config,
+    pm: pluggy.PluginManager,
+    targets: list[tuple[Path, Path]],
+    collected: set[Path] | None = None,
+) -> MirrorReport:
+    """Return the missing test files of all validation targets.
+
+    With ``--mirror-stale`` and ``--mirror-placeholders`` the stale and
+    placeholder tests found by the same walks are kept for the terminal
+    summary. Exits the session if a walk hits the file ceiling or the mapping
+    sends several modules onto one test file.
+    """
+    from .mapping import MappingCollision
+    from .walker import FileLimitExceeded
 
+    stale = bool(config.getoption("--mirror-stale"))
+    placeholders = bool(config.getoption("--mirror-placeholders"))
+    results: list[MirrorReport | list[Path]] = []
+    for target_package_dir, target_tests_dir in targets:
+        test_files = None
+        if collected is not None:
+            test_files = _collected_test_files(config, collected, target_tests_dir)
+        # pm.hook returns one result per plugin; merged below without copies
+        try:
+            results.extend(
+                pm.hook.validate_test_structure(
+                    package_dir=target_package_dir,
+                    tests_dir=target_tests_dir,
+                    test_files=test_files,
+                    stale=stale,
+                    placeholders=placeholders,
+                )
+            )
+        except (FileLimitExceeded, MappingCollision) as exc:
+            pytest.exit(f"{MIRROR_PREFIX} {exc}", returncode=1)
+    missing_tests = MirrorReport.combine(results)
+    count(COUNTER_MISSING, len(missing_tests))
+    if stale:
+        config.stash[STALE_KEY] = missing_tests.stale
+    if placeholders:
+        config.stash[PLACEHOLDERS_KEY] = missing_tests.placeholders
+    return missing_tests
+
+
+def _report_missing(
+    config: pytest.Config,
+    missing_tests: Sequence[Path],
+    targets: list[tuple[Path, Path]],
+) -> None:
+    """Generate missing tests, or fail the session if generation is disabled."""
     verbose = getattr(config.option, "verbose", 0) > 0
     if verbose:
         print(f"{MIRROR_DEBUG_PREFIX} missing_tests: {missing_tests}")
+        orphans = getattr(missing_tests, "orphans", ())
+        if orphans:
+            print(f"{MIRROR_PREFIX} {ORPHANS_MESSAGE}")
+            for path in orphans:
+                print(f"  - {path}")
 
     if missing_tests:
+        # Check pyproject.toml config
+        auto_generate = _get_auto_generate_config(config)
         _handle_missing_tests(missing_tests, auto_generate, config)
-    elif verbose:
+    elif verbose and targets:
         print(f"{MIRROR_PREFIX} {VALIDATION_SUCCESS_MESSAGE}")
+
+
+def _validate(config: pytest.Config, collected: set[Path] | None = None) -> None:
+    """Validate and optionally generate missing tests.
+
+    Args:
+        config (pytest.Config): The pytest config object.
+        collected (set[Path] | None): Python files pytest collected, used in
+            place of walks of the tests directory.
+    """
+    project_root, pm, targets = _prepare(config)
+    _report_missing(config, _find_missing(config, pm, targets, collected), targets)
+
+    if _symbols_enabled(config):
+        for target_package_dir, target_tests_dir in targets:
+            _check_symbols(config, target_package_dir, target_tests_dir, project_root)
+
+
+class _BackgroundValidation:
+    """Mirror validation running on a worker thread while pytest collects.
+
+    The worker only walks and compares trees; generating files, printing and
+    failing the session happen on the main thread once the result is joined.
+    """
+
+    def __init__(self, config: pytest.Config) -> None:
+        """Start validating on a daemon thread.
+
+        Args:
+            config (pytest.Config): The pytest config object.
+        """
+        self.config = config
+        self.project_root, pm, self.targets = _prepare(config)
+        self.missing_tests: Sequence[Path] = []
+        self.untested: dict[Path, list[str]] = {}
+        self.summary: list[str] = []
+        self._error: BaseException | None = None
+        self._started = time.perf_counter()
+        self._thread = threading.Thread(
+            target=self._run, args=(pm,), name=PROJECT_NAME, daemon=True
+        )
+        self._thread.start()
+
+    def _run(self, pm: pluggy.PluginManager) -> None:
+        """Compute the validation result; errors are re-raised by ``join``."""
+        try:
+            self.missing_tests = _find_missing(self.config, pm, self.targets)
+            if _symbols_enabled(self.config):
+                self.untested = _find_untested(
+                    self.config, self.targets, self.project_root
+                )
+        except BaseException as exc:  # noqa: BLE001
+            self._error = exc
+
+    def join(self, budget: float | None = None) -> bool:
+        """Wait for the result, at most until budget seconds after the start.
+
+        Args:
+            budget (float | None): Seconds since the start to wait until, or
+                None to wait for as long as it takes.
+
+        Returns:
+            bool: Whether validation has finished.
+
+        Raises:
+            BaseException: Any error raised while validating.
+        """
+        timeout = None
+        if budget is not None:
+            timeout = max(0.0, budget - (time.perf_counter() - self._started))
+        self._thread.join(timeout)
+        if self._thread.is_alive():
+            return False
+        if self._error is not None:
+            raise self._error
+        return True
+
+    def apply(self) -> None:
+        """Handle the finished result like a synchronous validation would."""
+        _report_missing(self.config, self.missing_tests, self.targets)
+        _report_untested(self.untested)
+
+    def finish_late(self, budget: float) -> bool:
+        """Handle a result that arrived after the budget without exiting.
+
+        Missing tests are generated when auto-generation is enabled; the
+        outcome is kept in ``summary`` for the terminal summary.
+
+        Returns:
+            bool: Whether the session should fail.
+        """
+        self.join()
+        failed = False
+        lines = [BUDGET_EXCEEDED_MESSAGE.format(budget=budget)]
+        generate = _get_auto_generate_config(self.config) and not self.config.getoption(
+            "--mirror-no-generate"
+        )
+        if self.missing_tests and generate:
+            lines.extend(
+                f"Created: {test_path}"
+                for test_path in _generate_tests(self.missing_tests)
+            )
+        elif self.missing_tests:
+            failed = True
+            lines.append(MISSING_TESTS_MESSAGE)
+            lines.extend(f"  - {path}" for path in self.missing_tests)
+        if self.untested:
+            failed = True
+            lines.append(UNTESTED_SYMBOLS_MESSAGE)
+            lines.extend(_format_untested(self.untested))
+        if not failed and not self.missing_tests:
+            lines.append(VALIDATION_SUCCESS_MESSAGE)
+        self.summary = lines
+        return failed
+
+
+class _DurationRecorder:
+    """Plugin summing the durations of each test file's reports.
+
+    Setup, call and teardown all count, so fixtures are charged to the module
+    whose tests requested them.
+    """
+
+    def __init__(self) -> None:
+        """Start with no durations."""
+        self.durations: dict[str, float] = {}
+
+    def pytest_runtest_logreport(self, report: pytest.TestReport) -> None:
+        """Add a report's duration to its test file."""
+        path = report.nodeid.split(NODE_ID_SEPARATOR, 1)[0]
+        self.durations[path] = self.durations.get(path, 0.0) + report.duration
+
+    def save(self, config: pytest.Config) -> None:
+        """Attribute the durations to mirrored test paths and record the run."""
+        if not self.durations:
+            return
+        from .durations import DurationHistory
+
+        project_root = Path(config.rootpath)
+        package_dir = _resolve_package_dir(config, project_root)
+        tests_dir = _resolve_tests_dir(config, project_root)
+        strategy = _mirror_strategy(package_dir, tests_dir)
+        tests_root = _normalize(tests_dir)
+        run: dict[str, float] = {}
+        for path, seconds in self.durations.items():
+            test = _normalize(project_root / path)
+            if test.suffix != PY_SUFFIX or not test.is_relative_to(tests_root):
+                continue
+            key = strategy.canonical_test_path(test.relative_to(tests_root).as_posix())
+            run[key] = run.get(key, 0.0) + seconds
+        if run:
+            history = DurationHistory(_get_cache_dir(config, project_root))
+            history.record(run)
+            history.save()
+
+
+def pytest_sessionstart(session: pytest.Session) -> None:
+    """Validate and optionally generate missing tests on pytest startup.
+
+    Runs that need no validation return before the package directory or the
+    plugin manager is resolved. With ``--mirror-only`` the session ends after
+    validation, before collection. With ``--mirror-from-collection``
+    validation is deferred until collection has finished; with
+    ``--mirror-background`` it starts on a worker thread and is joined once
+    collection has finished.
+
+    Args:
+        session (pytest.Session): The pytest session object.
+    """
+    config = session.config
+    # Under pytest-xdist the controller receives every worker's reports.
+    if _durations_enabled(config) and not hasattr(config, "workerinput"):
+        config.stash[DURATION_RECORDER_KEY] = _DurationRecorder()
+        config.pluginmanager.register(config.stash[DURATION_RECORDER_KEY])
+    if (
+        config.getoption("--mirror-profile")
+        or config.getoption("--mirror-profile-json")
+        or config.getoption("--mirror-metrics")
+    ):
+        config.stash[PROFILE_KEY] = PhaseProfile()
+        activate(config.stash[PROFILE_KEY])
+    project_root = Path(config.rootpath)
+    if not _needs_validation(config, _resolve_tests_dir(config, project_root)):
+        if config.getoption("--mirror-only"):
+            pytest.exit(VALIDATION_SUCCESS_MESSAGE, returncode=pytest.ExitCode.OK)
+        return
+    if config.getoption("--mirror-only"):
+        _validate(config)
+        pytest.exit(VALIDATION_SUCCESS_MESSAGE, returncode=pytest.ExitCode.OK)
+    if config.getoption("--mirror-from-collection"):
+        config.stash[COLLECTED_FILES_KEY] = set()
+        config.stash[PRUNED_PATHS_KEY] = set()
+        return
+    if config.getoption("--mirror-background"):
+        config.stash[BACKGROUND_KEY] = _BackgroundValidation(config)
+        return
+    _validate(config)
+
+
+def pytest_collect_file(file_path: Path, parent: pytest.Collector) -> None:
+    """Record the Python files pytest walks for collection-based validation."""
+    collected = parent.config.stash.get(COLLECTED_FILES_KEY, None)
+    if collected is not None and file_path.suffix == PY_SUFFIX:
+        collected.add(file_path)
+
+
+@pytest.hookimpl(wrapper=True)
+def pytest_ignore_collect(collection_path: Path, config: pytest.Config):
+    """Record the directories and Python files pruned from the collection.
+
+    Bytecode caches are pruned from every collection and never hold tests.
+    """
+    ignored = yield
+    pruned = config.stash.get(PRUNED_PATHS_KEY, None)
+    if (
+        ignored
+        and pruned is not None
+        and collection_path.name != PYCACHE_DIR_NAME
+        and (collection_path.suffix == PY_SUFFIX or collection_path.is_dir())
+    ):
+        pruned.add(_normalize(collection_path))
+    return ignored
+
+
+def pytest_collection_finish(session: pytest.Session) -> None:
+    """Validate against the collected files or join background validation.
+
+    A background result that misses ``--mirror-budget`` is left running and
+    handled when the session finishes.
+
+    Args:
+        session (pytest.Session): The pytest session object.
+    """
+    config = session.config
+    collected = config.stash.get(COLLECTED_FILES_KEY, None)
+    if collected is not None:
+        _validate(config, collected)
+    job = config.stash.get(BACKGROUND_KEY, None)
+    if job is not None and job.join(config.getoption("--mirror-budget")):
+        del config.stash[BACKGROUND_KEY]
+        job.apply()
+
+
+def _mirror_strategy(package_dir: Path, tests_dir: Path) -> "MappingStrategy":
+    """Return the strategy of the mapping plugins, or the configured one."""
+    from .mapping import hook_strategy, resolve_strategy
+    from .plugin_manager import get_plugin_manager
+
+    pm = get_plugin_manager()
+    return hook_strategy(
+        pm.hook.mirror_map_test_paths, package_dir, tests_dir
+    ) or resolve_strategy(None, package_dir)
+
+
+def _changed_items(
+    config: pytest.Config,
+    items: list[pytest.Item],
+    package_dir: Path,
+    tests_dir: Path,
+    strategy: "MappingStrategy",
+) -> tuple[list[pytest.Item], list[pytest.Item]]:
+    """Split items into those mirroring a changed module and the rest."""
+    from .selection import (
+        ChangedFilesError,
+        changed_files,
+        mirrored_tests,
+        select_items,
+    )
+
+    try:
+        changed = changed_files(
+            config.getoption("--mirror-changed"), config.invocation_params.dir
+        )
+    except ChangedFilesError as exc:
+        pytest.exit(f"{MIRROR_PREFIX} {exc}", returncode=1)
+    graph = None
+    if config.getoption("--mirror-transitive"):
+        from .core import build_import_graph
+        from .walker import FileLimitExceeded
+
+        try:
+            graph = build_import_graph(
+                package_dir, cache_dir=_get_cache_dir(config, Path(config.rootpath))
+            )
+        except FileLimitExceeded as exc:
+            pytest.exit(f"{MIRROR_PREFIX} {exc}", returncode=1)
+    affected = mirrored_tests(changed, package_dir, tests_dir, strategy, graph)
+    if getattr(config.option, "verbose", 0) > 0:
+        print(f"{MIRROR_DEBUG_PREFIX} changed: {[str(path) for path in changed]}")
+    return select_items(items, tests_dir, strategy, affected)
+
+
+def _shard_items(
+    config: pytest.Config,
+    items: list[pytest.Item],
+    tests_dir: Path,
+    strategy: "MappingStrategy",
+) -> tuple[list[pytest.Item], list[pytest.Item]]:
+    """Split items into those of this ``--mirror-test-shard`` and the rest.
+
+    Durations only come from ``--mirror-shard-durations``, never from the
+    project cache, which each node rewrites after running its own shard.
+    """
+    from .durations import load_durations
+    from .selection import shard_items
+
+    index, count = config.getoption("--mirror-test-shard")
+    durations = None
+    path = _get_path_option(config.getoption("--mirror-shard-durations"))
+    if path is not None:
+        try:
+            durations = load_durations(config.invocation_params.dir / path)
+        except (FileNotFoundError, ValueError) as exc:
+            pytest.exit(f"{MIRROR_PREFIX} {exc}", returncode=1)
+    selected, deselected = shard_items(
+        items, tests_dir, strategy, index, count, durations
+    )
+    if getattr(config.option, "verbose", 0) > 0:
+        print(
+            f"{MIRROR_DEBUG_PREFIX} shard {index}/{count}: "
+            f"{len(selected)} of {len(items)} tests"
+        )
+    return selected, deselected
+
+
+def pytest_collection_modifyitems(
+    config: pytest.Config, items: list[pytest.Item]
+) -> None:
+    """Deselect tests outside ``--mirror-changed`` and ``--mirror-test-shard``.
+
+    With ``--mirror-transitive`` the modules importing a changed one count
+    as changed too. Sharding splits the tests left after changed-file
+    selection.
+
+    Args:
+        config (pytest.Config): The pytest config object.
+        items (list[pytest.Item]): The collected items, modified in place.
+    """
+    changed = config.getoption("--mirror-changed")
+    shard = config.getoption("--mirror-test-shard")
+    if not changed and shard is None:
+        return
+    project_root = Path(config.rootpath)
+    package_dir = _resolve_package_dir(config, project_root)
+    tests_dir = _resolve_tests_dir(config, project_root)
+    strategy = _mirror_strategy(package_dir, tests_dir)
+    selected, deselected = items, []
+    if changed:
+        selected, deselected = _changed_items(
+            config, selected, package_dir, tests_dir, strategy
+        )
+    if shard is not None:
+        selected, other_shards = _shard_items(config, selected, tests_dir, strategy)
+        deselected = [*deselected, *other_shards]
+    if deselected:
+        config.hook.pytest_deselected(items=deselected)
+        items[:] = selected
+
+
+def pytest_sessionfinish(session: pytest.Session) -> None:
+    """Record test durations and fail a late, failed background validation.
+
+    Args:
+        session (pytest.Session): The pytest session object.
+    """
+    config = session.config
+    recorder = config.stash.get(DURATION_RECORDER_KEY, None)
+    if recorder is not None:
+        recorder.save(config)
+    job = config.stash.get(BACKGROUND_KEY, None)
+    budget = config.getoption("--mirror-budget")
+    if job is not None and budget is not None and job.finish_late(budget):
+        session.exitstatus = pytest.ExitCode.TESTS_FAILED
+
+
+def pytest_terminal_summary(
+    terminalreporter: pytest.TerminalReporter, config: pytest.Config
+) -> None:
+    """Report late background results, stale and placeholder tests, and timings.
+
+    Args:
+        terminalreporter (pytest.TerminalReporter): The terminal reporter.
+        config (pytest.Config): The pytest config object.
+    """
+    job = config.stash.get(BACKGROUND_KEY, None)
+    if job is not None and job.summary:
+        terminalreporter.write_sep("-", PROJECT_NAME)
+        for line in job.summary:
+            terminalreporter.write_line(line)
+    stale = config.stash.get(STALE_KEY, None)
+    if stale is not None:
+        terminalreporter.write_sep("-", STALE_SECTION_TITLE)
+        for entry in sorted(stale, key=lambda entry: entry.lag, reverse=True):
+            terminalreporter.write_line(entry.format())
+        if not stale:
+            terminalreporter.write_line(NO_STALE_TESTS_MESSAGE)
+    placeholders = config.stash.get(PLACEHOLDERS_KEY, None)
+    if placeholders is not None:
+        terminalreporter.write_sep("-", PLACEHOLDERS_SECTION_TITLE)
+        for path in placeholders:
+            terminalreporter.write_line(str(path))
+        if not placeholders:
+            terminalreporter.write_line(NO_PLACEHOLDERS_MESSAGE)
+    profile = config.stash.get(PROFILE_KEY, None)
+    if profile is not None:
+        terminalreporter.write_sep("-", PROFILE_SECTION_TITLE)
+        for line in profile.format_lines():
+            terminalreporter.write_line(line)
+        json_path = config.getoption("--mirror-profile-json")
+        if json_path:
+            profile.write_json(Path(json_path))
+
+
+def pytest_unconfigure(config: pytest.Config) -> None:
+    """Write the session's metrics and stop recording into its profile.
+
+    Args:
+        config (pytest.Config): The pytest config object.
+    """
+    profile = config.stash.get(PROFILE_KEY, None)
+    if profile is None:
+        return
+    if profile is active():
+        activate(None)
+    metrics_path = config.getoption("--mirror-metrics")
+    if metrics_path:
+        from .metrics import write_metrics
+
+        write_metrics(Path(metrics_path), profile)
@@ -6,10 +6,17 @@ from .constants import PACKAGE_NAME
 from .hookspecs import MirrorSpecs
 from .validator import MirrorValidator
 
+# Module-specific constants
+VALIDATOR_PLUGIN_NAME = "mirror_validator"
+
 
 def get_plugin_manager() -> pluggy.PluginManager:
-    """Create and configure a pluggy plugin manager for pytest-mirror."""
+    """Create and configure a pluggy plugin manager for pytest-mirror.
+
+    Third-party plugins are loaded from the ``pytest_mirror`` entry point group.
+    """
     pm = pluggy.PluginManager(PACKAGE_NAME)
     pm.add_hookspecs(MirrorSpecs)
-    pm.register(MirrorValidator())
+    pm.load_setuptools_entrypoints(PACKAGE_NAME)
+    pm.register(MirrorValidator(pm), name=VALIDATOR_PLUGIN_NAME)
     return pm
@@ -0,0 +1,174 @@
+"""Phase timing and work counters for pytest-mirror runs.
+
+Code paths mark phases with ``phase(name)`` and tally work with
+``count(name, n)``, both of which cost nothing unless a ``PhaseProfile`` is
+active. Phases are exclusive: time spent in a nested phase
+is only counted there, so the breakdown adds up to the time spent in
+pytest-mirror. The profile is process-wide, so phases timed on worker threads
+are included.
+"""
+
+import functools
+import json
+import threading
+import time
+from collections.abc import Callable, Iterator
+from contextlib import AbstractContextManager, contextmanager, nullcontext
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from .cache import atomic_write_text
+
+if TYPE_CHECKING:
+    import pluggy
+
+# Module-specific constants
+PHASE_PATH_RESOLUTION = "path resolution"
+PHASE_AUTO_DETECTION = "auto-detection"
+PHASE_PLUGIN_MANAGER = "plugin manager setup"
+PHASE_SOURCE_WALK = "source walk"
+PHASE_TESTS_WALK = "tests walk"
+PHASE_STUB_RENDER = "stub rendering"
+PHASE_STUB_WRITES = "stub writes"
+HOOK_PHASE_TEMPLATE = "hook {hook} [{plugin}]"
+COUNTER_MODULES_SCANNED = "modules_scanned"
+COUNTER_TESTS_FOUND = "tests_found"
+COUNTER_MISSING = "missing"
+COUNTER_GENERATED = "generated"
+COUNTER_DIRS_PRUNED = "dirs_pruned"
+COUNTERS = (
+    COUNTER_MODULES_SCANNED,
+    COUNTER_TESTS_FOUND,
+    COUNTER_MISSING,
+    COUNTER_GENERATED,
+    COUNTER_DIRS_PRUNED,
+)
+
+_active: "PhaseProfile | None" = None
+
+
+class PhaseProfile:
+    """Accumulated exclusive wall time and call count per named phase.
+
+    Also holds the run's work counters, all starting at zero.
+    """
+
+    def __init__(self) -> None:
+        """Create an empty profile."""
+        self.seconds: dict[str, float] = {}
+        self.calls: dict[str, int] = {}
+        self.counters: dict[str, int] = dict.fromkeys(COUNTERS, 0)
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Time the enclosed block as name, minus any phases nested inside it."""
+        stack = self._local.__dict__.setdefault("stack", [])
+        # Each frame holds the time its nested phases took.
+        stack.append(0.0)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            nested = stack.pop()
+            if stack:
+                stack[-1] += elapsed
+            self.add(name, elapsed - nested)
+
+    def add(self, name: str, seconds: float) -> None:
+        """Record one call of a phase."""
+        with self._lock:
+            self.seconds[name] = self.seconds.get(name, 0.0) + seconds
+            self.calls[name] = self.calls.get(name, 0) + 1
+
+    def count(self, name: str, n: int) -> None:
+        """Add n to a work counter."""
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    @property
+    def total(self) -> float:
+        """Return the time spent in all phases."""
+        return sum(self.seconds.values())
+
+    def monitor_hooks(self, pm: "pluggy.PluginManager") -> None:
+        """Time every hook implementation registered with pm as its own phase."""
+        import pluggy
+
+        for hook_name, caller in vars(pm.hook).items():
+            if not isinstance(caller, pluggy.HookCaller):
+                continue
+            for impl in caller.get_hookimpls():
+                name = HOOK_PHASE_TEMPLATE.format(
+                    hook=hook_name, plugin=impl.plugin_name
+                )
+                impl.function = self._timed(name, impl.function)
+
+    def _timed(self, name: str, function: Callable) -> Callable:
+        """Wrap function so each call is timed as a phase."""
+
+        @functools.wraps(function)
+        def timed(*args, **kwargs):
+            with self.phase(name):
+                return function(*args, **kwargs)
+
+        return timed
+
+    def as_dict(self) -> dict:
+        """Return the profile as JSON-serializable data, in milliseconds."""
+        return {
+            "counters": dict(self.counters),
+            "total_ms": round(self.total * 1000, 3),
+            "phases": {
+                name: {
+                    "ms": round(seconds * 1000, 3),
+                    "calls": self.calls[name],
+                }
+                for name, seconds in self.seconds.items()
+            },
+        }
+
+    def format_lines(self) -> list[str]:
+        """Return a human-readable breakdown, slowest phase first."""
+        width = max((len(name) for name in self.seconds), default=0)
+        width = max(width, len("total"))
+        lines = [
+            f"{name:<{width}}  {seconds * 1000:9.1f} ms  x{self.calls[name]}"
+            for name, seconds in sorted(
+                self.seconds.items(), key=lambda item: item[1], reverse=True
+            )
+        ]
+        lines.append(f"{'total':<{width}}  {self.total * 1000:9.1f} ms")
+        return lines
+
+    def write_json(self, path: Path) -> None:
+        """Write the profile to path atomically."""
+        atomic_write_text(path, json.dumps(self.as_dict(), indent=2) + "\n")
+
+
+def activate(profile: PhaseProfile | None) -> None:
+    """Make profile the one phases are recorded in; None disables profiling."""
+    global _active
+    _active = profile
+
+
+def active() -> PhaseProfile | None:
+    """Return the active profile, if any."""
+    return _active
+
+
+def phase(name: str) -> AbstractContextManager[None]:
+    """Time the enclosed block as name if a profile is active."""
+    profile = _active
+    if profile is None:
+        return nullcontext()
+    return profile.phase(name)
+
+
+def count(name: str, n: int) -> None:
+    """Add n to a work counter if a profile is active."""
+    profile = _active
+    if profile is not None:
+        profile.count(name, n)
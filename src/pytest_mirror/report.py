@@ -0,0 +1,231 @@
+"""Compact result type for pytest-mirror validation.
+
+A ``MirrorReport`` keeps test paths as interned POSIX strings relative to a
+single root, in one tuple, instead of one ``Path`` object per entry. ``Path``
+objects are only built when an entry is accessed, so large reports cost about
+one pointer per entry on top of strings the mirror map already holds.
+
+A report also carries the orphaned tests found in the same pass: existing test
+files that no source module maps onto. They are stored the same way and
+exposed as a report of their own through ``orphans``, as are the test files
+still holding the unmodified placeholder stub, through ``placeholders``, when
+they were asked for. Reports built with stale detection also list the modules
+modified after their mirrored tests in ``stale``.
+"""
+
+import os
+import sys
+from collections.abc import Iterable, Iterator, Sequence
+from pathlib import Path
+from typing import NamedTuple, overload
+
+# Module-specific constants
+SECONDS_PER_UNIT = (("d", 86_400), ("h", 3_600), ("m", 60))
+
+
+class StaleTest(NamedTuple):
+    """A source module modified after every test file mirroring it."""
+
+    source: Path
+    test: Path
+    lag: float
+    """Seconds between the newest test modification and the source's."""
+
+    def format(self) -> str:
+        """Return a one-line description for reports."""
+        for unit, seconds in SECONDS_PER_UNIT:
+            if self.lag >= seconds:
+                age = f"{self.lag / seconds:.1f}{unit}"
+                break
+        else:
+            age = f"{self.lag:.0f}s"
+        return f"{self.source} is {age} newer than {self.test}"
+
+
+class MirrorReport(Sequence[Path]):
+    """Read-only sequence of test file paths below a common root.
+
+    Behaves like the ``list[Path]`` it replaces: it supports ``len``,
+    iteration, indexing, membership tests and equality with lists of paths.
+    Orphaned, placeholder and stale tests ride along without taking part in
+    any of these.
+    """
+
+    __slots__ = ("_entries", "_lookup", "_orphans", "_placeholders", "root", "stale")
+
+    def __init__(
+        self,
+        root: Path,
+        entries: Iterable[str] = (),
+        orphans: Iterable[str] = (),
+        stale: Iterable[StaleTest] = (),
+        placeholders: Iterable[str] = (),
+    ) -> None:
+        """Create a report.
+
+        Args:
+            root (Path): Directory the entries are relative to.
+            entries (Iterable[str]): POSIX paths relative to root.
+            orphans (Iterable[str]): POSIX paths relative to root of existing
+                test files without a mirrored source module.
+            stale (Iterable[StaleTest]): Modules modified after their tests.
+            placeholders (Iterable[str]): POSIX paths relative to root of test
+                files that still hold the unmodified placeholder stub.
+        """
+        self.root = root
+        self.stale = tuple(stale)
+        self._entries = tuple(sys.intern(entry) for entry in entries)
+        self._orphans = tuple(sys.intern(orphan) for orphan in orphans)
+        self._placeholders = tuple(sys.intern(stub) for stub in placeholders)
+        self._lookup: frozenset[str] | None = None
+
+    @classmethod
+    def from_paths(
+        cls,
+        paths: Iterable[Path],
+        orphans: Iterable[Path] = (),
+        stale: Iterable[StaleTest] = (),
+        placeholders: Iterable[Path] = (),
+    ) -> "MirrorReport":
+        """Build a report from full paths, rooted at their common directory."""
+        paths = list(paths)
+        orphans = list(orphans)
+        placeholders = list(placeholders)
+        everything = (*paths, *orphans, *placeholders)
+        try:
+            root = Path(os.path.commonpath([path.parent for path in everything]))
+        except ValueError:  # empty, or absolute and relative paths mixed
+            return cls(
+                Path(),
+                (path.as_posix() for path in paths),
+                (path.as_posix() for path in orphans),
+                stale,
+                (path.as_posix() for path in placeholders),
+            )
+        return cls(
+            root,
+            (path.relative_to(root).as_posix() for path in paths),
+            (path.relative_to(root).as_posix() for path in orphans),
+            stale,
+            (path.relative_to(root).as_posix() for path in placeholders),
+        )
+
+    @classmethod
+    def combine(cls, results: Iterable[Iterable[Path]]) -> "MirrorReport":
+        """Merge hook results into one report without materializing paths.
+
+        Reports sharing a root are concatenated as strings; anything else,
+        such as lists returned by third-party hook implementations, falls back
+        to ``from_paths``.
+        """
+        results = list(results)
+        reports = [result for result in results if isinstance(result, cls)]
+        stale = [entry for report in reports for entry in report.stale]
+        root = None
+        if len(reports) == len(results):
+            try:
+                root = Path(os.path.commonpath([report.root for report in reports]))
+            except ValueError:  # empty, or absolute and relative roots mixed
+                pass
+        if root is None:
+            return cls.from_paths(
+                (path for result in results for path in result),
+                (path for report in reports for path in report.orphans),
+                stale,
+                (path for report in reports for path in report.placeholders),
+            )
+        return cls(
+            root,
+            cls._rebase([(report.root, report._entries) for report in reports], root),
+            cls._rebase([(report.root, report._orphans) for report in reports], root),
+            stale,
+            cls._rebase(
+                [(report.root, report._placeholders) for report in reports], root
+            ),
+        )
+
+    @staticmethod
+    def _rebase(
+        groups: list[tuple[Path, tuple[str, ...]]], root: Path
+    ) -> Iterator[str]:
+        """Yield entries relative to root, an ancestor of each group's root."""
+        for group_root, entries in groups:
+            if group_root == root:
+                yield from entries
+                continue
+            prefix = group_root.relative_to(root).as_posix()
+            for entry in entries:
+                yield f"{prefix}/{entry}"
+
+    @property
+    def relative(self) -> tuple[str, ...]:
+        """Return the entries as POSIX paths relative to root."""
+        return self._entries
+
+    @property
+    def orphans(self) -> "MirrorReport":
+        """Return the orphaned tests as a report with the same root."""
+        return MirrorReport(self.root, self._orphans)
+
+    @property
+    def placeholders(self) -> "MirrorReport":
+        """Return the unmodified placeholder tests as a report with the same root."""
+        return MirrorReport(self.root, self._placeholders)
+
+    def to_list(self) -> list[Path]:
+        """Return the entries as a list of full paths."""
+        return [self.root / entry for entry in self._entries]
+
+    def __len__(self) -> int:
+        """Return the number of entries."""
+        return len(self._entries)
+
+    @overload
+    def __getitem__(self, index: int) -> Path: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[Path]: ...
+
+    def __getitem__(self, index: int | slice) -> Path | list[Path]:
+        """Return the full path of one entry, or a list of paths for a slice."""
+        if isinstance(index, slice):
+            return [self.root / entry for entry in self._entries[index]]
+        return self.root / self._entries[index]
+
+    def __iter__(self) -> Iterator[Path]:
+        """Yield full paths, building each one on demand."""
+        root = self.root
+        for entry in self._entries:
+            yield root / entry
+
+    def __contains__(self, item: object) -> bool:
+        """Return whether a full path, or a root-relative string, is listed.
+
+        The first lookup builds a set of the entries, so repeated membership
+        tests are constant time.
+        """
+        if isinstance(item, Path):
+            if self.root.parts:
+                if not item.is_relative_to(self.root):
+                    return False
+                item = item.relative_to(self.root)
+            item = item.as_posix()
+        elif not isinstance(item, str):
+            return False
+        if self._lookup is None:
+            self._lookup = frozenset(self._entries)
+        return item in self._lookup
+
+    def __eq__(self, other: object) -> bool:
+        """Compare with another report, or with a list or tuple of paths."""
+        if isinstance(other, MirrorReport):
+            return self.to_list() == other.to_list()
+        if isinstance(other, list | tuple):
+            return self.to_list() == list(other)
+        return NotImplemented
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        """Return a representation listing the full paths."""
+        return f"MirrorReport({self.to_list()!r})"
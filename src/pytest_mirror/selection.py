@@ -0,0 +1,330 @@
+"""Test selection from changed files through the mirror mapping.
+
+Every mirrored test file belongs to one source module, so the tests affected
+by a change can be found without running anything: changed modules are mapped
+onto their test paths by the configured strategy, and changed test files
+select themselves. Changed files come from ``git`` or are named explicitly.
+
+Selection fails safe: a change whose tests cannot be derived from the mapping
+selects more, never less. Other files changed in the tests directory, such as
+``conftest.py``, helpers or data, select every test below their directory;
+modules the mapping leaves unmirrored, ``__init__.py`` files without an import
+graph, package data, Python files outside both trees and project
+configuration select every test.
+
+The same grouping splits a suite into shards: the tests of each source module
+stay together and the groups are spread over the shards by durations read from
+a shared file, so every CI node computes the same partition on its own.
+"""
+
+import heapq
+import os
+import subprocess
+from collections.abc import Iterable, Mapping, Sequence
+from pathlib import Path
+from typing import Any, NamedTuple
+
+from .imports import ImportGraph
+from .mapping import MappingStrategy
+
+# Module-specific constants
+PY_SUFFIX = ".py"
+INIT_FILE_NAME = "__init__.py"
+PROJECT_CONFIG_FILE_NAMES = frozenset(
+    {"pyproject.toml", "setup.cfg", "tox.ini", "pytest.ini"}
+)
+GIT_FAILED_MESSAGE = "git {command} failed: {error}"
+
+
+class ChangedFilesError(RuntimeError):
+    """The changed files could not be listed with git."""
+
+
+class AffectedTests(NamedTuple):
+    """Tests affected by a set of changed files."""
+
+    tests: frozenset[str]
+    """Canonical test paths relative to the tests directory."""
+    dirs: tuple[str, ...] = ()
+    """Directory prefixes, with a trailing slash, whose tests are all affected;
+    an empty prefix covers the whole tests directory."""
+    everything: bool = False
+    """Whether every collected test is affected."""
+
+    def selects(self, test: str, strategy: MappingStrategy) -> bool:
+        """Return whether a test file relative to the tests directory is affected."""
+        return (
+            self.everything
+            or test.startswith(self.dirs)
+            or strategy.canonical_test_path(test) in self.tests
+        )
+
+
+def _normalize(path: Path) -> Path:
+    """Return path made absolute and normalized without touching the disk."""
+    return Path(os.path.normpath(path.absolute()))
+
+
+def _git(args: list[str], cwd: Path) -> str:
+    """Run git in cwd and return its output.
+
+    Raises:
+        ChangedFilesError: If git is not installed or the command fails.
+    """
+    try:
+        result = subprocess.run(
+            ["git", *args],
+            cwd=cwd,
+            capture_output=True,
+            check=True,
+            text=True,
+        )
+    except FileNotFoundError as exc:
+        raise ChangedFilesError(
+            GIT_FAILED_MESSAGE.format(command=args[0], error=exc)
+        ) from exc
+    except subprocess.CalledProcessError as exc:
+        raise ChangedFilesError(
+            GIT_FAILED_MESSAGE.format(command=args[0], error=exc.stderr.strip())
+        ) from exc
+    return result.stdout
+
+
+def git_changed_files(ref: str, cwd: Path) -> list[Path]:
+    """Return the files changed against a git ref.
+
+    Committed, staged and unstaged changes all count, as do untracked files
+    that are not ignored, since a new module is a change too.
+
+    Args:
+        ref (str): Any revision ``git diff`` accepts, e.g. ``origin/main``.
+        cwd (Path): Directory inside the repository.
+
+    Returns:
+        list[Path]: Absolute paths of the changed files, deleted ones included.
+
+    Raises:
+        ChangedFilesError: If git fails, e.g. outside a repository or for an
+            unknown ref.
+    """
+    root = Path(_git(["rev-parse", "--show-toplevel"], cwd).strip())
+    # From the top level: ls-files only lists files below its working directory.
+    output = _git(["diff", "--name-only", "-z", ref, "--"], root)
+    output += _git(["ls-files", "--others", "--exclude-standard", "-z"], root)
+    names = dict.fromkeys(name for name in output.split("\0") if name)
+    return [root / name for name in names]
+
+
+def changed_files(values: Sequence[str], cwd: Path) -> list[Path]:
+    """Resolve ``--mirror-changed`` values into changed files.
+
+    A value naming an existing path, or any ``.py`` file, is taken as a changed
+    file relative to cwd; anything else is a git ref to diff against.
+
+    Raises:
+        ChangedFilesError: If git fails for a ref.
+    """
+    files: list[Path] = []
+    for value in values:
+        path = cwd / value
+        if value.endswith(PY_SUFFIX) or path.exists():
+            files.append(path)
+        else:
+            files.extend(git_changed_files(value, cwd))
+    return files
+
+
+def mirrored_tests(
+    changed: Iterable[Path],
+    package_dir: Path,
+    tests_dir: Path,
+    strategy: MappingStrategy,
+    graph: ImportGraph | None = None,
+) -> AffectedTests:
+    """Return the tests affected by changed files.
+
+    Changed modules below package_dir select the test path the strategy maps
+    them onto, changed test files below tests_dir select themselves. With an
+    import graph, the modules importing a changed module, directly or not,
+    select their tests as well. Changes whose tests cannot be derived this way
+    select more, as described in the module docstring; documentation and other
+    files outside both trees select nothing.
+
+    Returns:
+        AffectedTests: Test paths normalized with the strategy's
+        ``canonical_test_path``, and the directories or whole run they widen
+        to.
+    """
+    package_root = _normalize(package_dir)
+    tests_root = _normalize(tests_dir)
+    sources: list[str] = []
+    tests: list[str] = []
+    dirs: list[str] = []
+    everything = False
+    for path in map(_normalize, changed):
+        # Checked first: tests_dir may live inside package_dir.
+        if path.is_relative_to(tests_root):
+            test = path.relative_to(tests_root).as_posix()
+            if path.suffix == PY_SUFFIX and strategy.is_test_file(test):
+                tests.append(test)
+            else:
+                head = test.rpartition("/")[0]
+                dirs.append(f"{head}/" if head else "")
+        elif path.is_relative_to(package_root):
+            if path.suffix != PY_SUFFIX or (
+                graph is None and path.name == INIT_FILE_NAME
+            ):
+                everything = True
+            else:
+                sources.append(path.relative_to(package_root).as_posix())
+        elif path.suffix == PY_SUFFIX or path.name in PROJECT_CONFIG_FILE_NAMES:
+            everything = True
+    if graph is not None:
+        sources = sorted(graph.dependents(sources))
+    # Mapped first: a hook strategy only knows how to normalize afterwards.
+    mapped = set()
+    for source, test in zip(sources, strategy.map_paths(sources), strict=True):
+        if test is not None:
+            mapped.add(test)
+        elif source.rpartition("/")[2] != INIT_FILE_NAME:
+            everything = True
+    mapped.update(map(strategy.canonical_test_path, tests))
+    return AffectedTests(frozenset(mapped), tuple(sorted(set(dirs))), everything)
+
+
+def select_items(
+    items: Sequence[Any],
+    tests_dir: Path,
+    strategy: MappingStrategy,
+    affected: AffectedTests,
+) -> tuple[list[Any], list[Any]]:
+    """Split collected items into affected tests and the rest.
+
+    Args:
+        items (Sequence[Any]): Collected pytest items.
+        tests_dir (Path): Path to the tests directory.
+        strategy (MappingStrategy): Strategy normalizing item files.
+        affected (AffectedTests): Tests affected by the changed files.
+
+    Returns:
+        tuple[list[Any], list[Any]]: ``(selected, deselected)``, each in
+        collection order. Items outside tests_dir are only selected when
+        every test is affected.
+    """
+    if affected.everything:
+        return list(items), []
+    tests_root = _normalize(tests_dir)
+    wanted: dict[Path, bool] = {}
+    selected: list[Any] = []
+    deselected: list[Any] = []
+    for item in items:
+        path = Path(item.path)
+        keep = wanted.get(path)
+        if keep is None:
+            normalized = _normalize(path)
+            keep = normalized.is_relative_to(tests_root) and affected.selects(
+                normalized.relative_to(tests_root).as_posix(), strategy
+            )
+            wanted[path] = keep
+        (selected if keep else deselected).append(item)
+    return selected, deselected
+
+
+def _group_items(
+    items: Sequence[Any], tests_dir: Path, strategy: MappingStrategy
+) -> tuple[list[str], dict[str, list[Path]]]:
+    """Return the group key of every item and the files of every group.
+
+    Items are keyed by the canonical test path of their file; files outside
+    tests_dir are keyed by their path relative to it.
+    """
+    tests_root = _normalize(tests_dir)
+    file_keys: dict[Path, str] = {}
+    files: dict[str, list[Path]] = {}
+    keys: list[str] = []
+    for item in items:
+        path = Path(item.path)
+        key = file_keys.get(path)
+        if key is None:
+            normalized = _normalize(path)
+            if normalized.is_relative_to(tests_root):
+                key = strategy.canonical_test_path(
+                    normalized.relative_to(tests_root).as_posix()
+                )
+            else:
+                key = Path(os.path.relpath(normalized, tests_root)).as_posix()
+            file_keys[path] = key
+            files.setdefault(key, []).append(path)
+        keys.append(key)
+    return keys, files
+
+
+def _file_size(path: Path) -> int:
+    """Return the size of path, or 0 if it cannot be stat'ed."""
+    try:
+        return path.stat().st_size
+    except OSError:
+        return 0
+
+
+def _group_weights(
+    files: Mapping[str, list[Path]], durations: Mapping[str, float]
+) -> dict[str, float]:
+    """Estimate the seconds each group of files takes.
+
+    Groups without a recorded duration are weighted by the size of their
+    files, scaled by the seconds per byte of the groups that have one, or
+    left in bytes when none has.
+    """
+    sizes = {key: sum(map(_file_size, paths)) for key, paths in files.items()}
+    recorded = [key for key in files if key in durations]
+    recorded_bytes = sum(sizes[key] for key in recorded)
+    rate = 1.0
+    if recorded_bytes:
+        rate = sum(durations[key] for key in recorded) / recorded_bytes
+    return {key: durations.get(key, sizes[key] * rate) for key in files}
+
+
+def shard_items(
+    items: Sequence[Any],
+    tests_dir: Path,
+    strategy: MappingStrategy,
+    index: int,
+    count: int,
+    durations: Mapping[str, float] | None = None,
+) -> tuple[list[Any], list[Any]]:
+    """Split collected items into those of one shard and the rest.
+
+    Items are grouped by the source module their file mirrors, so a module's
+    tests always run on the same shard. Groups are weighted by their recorded
+    duration, or estimated from their file size, and assigned heaviest first
+    to the least loaded shard; ties go to the lower key and shard. The result
+    only depends on the collected files and durations, so nodes given the
+    same durations agree on the partition.
+
+    Args:
+        items (Sequence[Any]): Collected pytest items.
+        tests_dir (Path): Path to the tests directory.
+        strategy (MappingStrategy): Strategy normalizing item files.
+        index (int): Shard to select, from 1 to count.
+        count (int): Number of shards.
+        durations (Mapping[str, float] | None): Seconds per canonical test
+            path, as returned by ``load_durations``.
+
+    Returns:
+        tuple[list[Any], list[Any]]: ``(selected, deselected)``, each in
+        collection order.
+    """
+    keys, files = _group_items(items, tests_dir, strategy)
+    weights = _group_weights(files, durations or {})
+    loads = [(0.0, shard) for shard in range(1, count + 1)]
+    assigned: dict[str, int] = {}
+    for key in sorted(files, key=lambda key: (-weights[key], key)):
+        load, shard = heapq.heappop(loads)
+        assigned[key] = shard
+        heapq.heappush(loads, (load + weights[key], shard))
+    selected: list[Any] = []
+    deselected: list[Any] = []
+    for item, key in zip(items, keys, strict=True):
+        (selected if assigned[key] == index else deselected).append(item)
+    return selected, deselected
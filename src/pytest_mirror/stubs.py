@@ -0,0 +1,156 @@
+"""Test stub rendering for pytest-mirror.
+
+Stubs are rendered in batches: either the fixed placeholder, or AST-derived
+skeletons with one failing test per public function or class of the module.
+"""
+
+import keyword
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+from .constants import (
+    DEFAULT_TEST_CONTENT,
+    SKELETON_HEADER,
+    SKELETON_TEST_TEMPLATE,
+    STUB_MODE_AST,
+    STUB_MODE_PLACEHOLDER,
+    STUB_MODES,
+)
+from .symbols import (
+    ModuleSymbols,
+    SymbolCache,
+    content_hash,
+    parse_modules,
+    snake_case,
+)
+
+# Module-specific constants
+PY_SUFFIX = ".py"
+# Generated stubs are written in text mode, so they may have either ending.
+PLACEHOLDER_VARIANTS = (
+    DEFAULT_TEST_CONTENT.encode(),
+    DEFAULT_TEST_CONTENT.replace("\n", "\r\n").encode(),
+)
+PLACEHOLDER_SIZES = frozenset(len(variant) for variant in PLACEHOLDER_VARIANTS)
+PLACEHOLDER_HASHES = frozenset(
+    content_hash(variant) for variant in PLACEHOLDER_VARIANTS
+)
+
+Renderer = Callable[[list[str]], list[str] | None]
+
+
+def _module_import(package_dir: Path, source: str) -> str | None:
+    """Return an import statement for a source module, if it is importable."""
+    parts = [package_dir.name, *source.removesuffix(PY_SUFFIX).split("/")]
+    if not all(part.isidentifier() and not keyword.iskeyword(part) for part in parts):
+        return None
+    return f"from {'.'.join(parts[:-1])} import {parts[-1]}"
+
+
+def render_skeleton(symbols: ModuleSymbols, module_import: str | None = None) -> str:
+    """Render a test module with one failing test per public symbol.
+
+    Modules without public symbols get ``DEFAULT_TEST_CONTENT``.
+
+    Args:
+        symbols (ModuleSymbols): Public symbols of the source module.
+        module_import (str | None): Import statement for the source module.
+
+    Returns:
+        str: Test module source.
+    """
+    if not symbols.functions and not symbols.classes:
+        return DEFAULT_TEST_CONTENT
+    parts = [SKELETON_HEADER]
+    if module_import:
+        parts.append(f"\n{module_import}\n")
+    for name in symbols.functions:
+        parts.append(SKELETON_TEST_TEMPLATE.format(test_name=name, symbol=name))
+    for name in symbols.classes:
+        parts.append(
+            SKELETON_TEST_TEMPLATE.format(test_name=snake_case(name), symbol=name)
+        )
+    return "".join(parts)
+
+
+def is_placeholder(path: Path, size: int | None = None) -> bool:
+    """Return whether the file at path is an unmodified placeholder stub.
+
+    Only files exactly the size of the placeholder, as written with either line
+    ending, are read and hashed, so most files cost no read at all.
+
+    Args:
+        path (Path): File to check.
+        size (int | None): The file's size if already known, e.g. from the
+            stat data of a walk; it is looked up otherwise.
+    """
+    try:
+        if size is None:
+            size = path.stat().st_size
+        if size not in PLACEHOLDER_SIZES:
+            return False
+        data = path.read_bytes()
+    except OSError:
+        return False
+    return content_hash(data) in PLACEHOLDER_HASHES
+
+
+def render_stubs(
+    package_dir: Path,
+    source_paths: list[str],
+    stub_mode: str = STUB_MODE_PLACEHOLDER,
+    *,
+    cache_dir: Path | None = None,
+    workers: int | None = None,
+) -> list[str]:
+    """Render test stubs for a batch of source modules.
+
+    Args:
+        package_dir (Path): Path to the main package directory.
+        source_paths (list[str]): POSIX module paths relative to package_dir.
+        stub_mode (str): ``placeholder`` or ``ast``.
+        cache_dir (Path | None): Directory of the persistent parse cache.
+        workers (int | None): Process pool size for parsing large batches.
+
+    Returns:
+        list[str]: Test module contents in the same order as source_paths.
+
+    Raises:
+        ValueError: If stub_mode is unknown.
+    """
+    if stub_mode == STUB_MODE_PLACEHOLDER:
+        return [DEFAULT_TEST_CONTENT] * len(source_paths)
+    if stub_mode != STUB_MODE_AST:
+        raise ValueError(
+            f"Unknown stub mode {stub_mode!r} (use {', '.join(STUB_MODES)})"
+        )
+    cache = SymbolCache(cache_dir)
+    paths = [package_dir / source for source in source_paths]
+    symbols = parse_modules(paths, cache, workers=workers)
+    cache.save()
+    return [
+        render_skeleton(module_symbols, _module_import(package_dir, source))
+        for source, module_symbols in zip(source_paths, symbols, strict=True)
+    ]
+
+
+def hook_renderer(hook: Any, package_dir: Path, stub_mode: str) -> Renderer | None:
+    """Wrap a ``mirror_render_stubs`` hook caller if any plugin implements it.
+
+    Args:
+        hook (Any): The pluggy hook caller ``pm.hook.mirror_render_stubs``.
+        package_dir (Path): Path to the main package directory.
+        stub_mode (str): Stub mode passed through to implementations.
+
+    Returns:
+        Renderer | None: A batch renderer returning None when no implementation
+        answers, or None if the hook has no implementations.
+    """
+    if not hook.get_hookimpls():
+        return None
+
+    def render(sources: list[str]) -> list[str] | None:
+        return hook(package_dir=package_dir, source_paths=sources, stub_mode=stub_mode)
+
+    return render
@@ -0,0 +1,236 @@
+"""Public symbol extraction from Python modules with a content-hash cache.
+
+Modules are parsed with ``ast``. Results are cached on disk keyed by a hash of
+the file contents, so unchanged modules are never parsed twice, and large
+batches of cache misses are parsed in a process pool.
+
+The same extraction serves source and test modules: in a test module the public
+functions, classes and methods are the test names that symbol-level mirroring
+matches against.
+"""
+
+import ast
+import hashlib
+import os
+import re
+from pathlib import Path
+from typing import NamedTuple
+
+from .cache import default_cache_dir, load_json, save_json
+
+# Module-specific constants
+SYMBOL_CACHE_FILE_NAME = "symbols.json"
+SYMBOL_CACHE_VERSION = 2
+SYMBOL_CACHE_MAX_ENTRIES = 250_000
+PARALLEL_PARSE_THRESHOLD = 64
+PARSE_CHUNK_SIZE = 32
+TEST_FUNCTION_PREFIX = "test"
+TEST_CLASS_PREFIX = "Test"
+
+
+class ModuleSymbols(NamedTuple):
+    """Public definitions of a module; methods are named ``Class.method``."""
+
+    functions: tuple[str, ...] = ()
+    classes: tuple[str, ...] = ()
+    methods: tuple[str, ...] = ()
+
+
+def content_hash(data: bytes) -> str:
+    """Return the cache key for a file's contents."""
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def _is_function(node: ast.stmt) -> bool:
+    """Return whether node defines a public function."""
+    return isinstance(
+        node, ast.FunctionDef | ast.AsyncFunctionDef
+    ) and not node.name.startswith("_")
+
+
+def extract_symbols(data: bytes) -> ModuleSymbols:
+    """Parse module source and return its public functions, classes and methods.
+
+    Modules that fail to parse have no symbols.
+    """
+    try:
+        tree = ast.parse(data)
+    except (SyntaxError, ValueError):
+        return ModuleSymbols()
+    functions = []
+    classes = []
+    methods = []
+    for node in tree.body:
+        if _is_function(node):
+            functions.append(node.name)
+        elif isinstance(node, ast.ClassDef) and not node.name.startswith("_"):
+            classes.append(node.name)
+            methods.extend(
+                f"{node.name}.{item.name}" for item in node.body if _is_function(item)
+            )
+    return ModuleSymbols(tuple(functions), tuple(classes), tuple(methods))
+
+
+def snake_case(name: str) -> str:
+    """Convert a CamelCase class name into snake_case."""
+    name = re.sub(r"([A-Z]+)([A-Z][a-z])", r"\1_\2", name)
+    return re.sub(r"([a-z\d])([A-Z])", r"\1_\2", name).lower()
+
+
+def _underscore_prefixes(name: str) -> list[str]:
+    """Return name and every prefix of it ending before an underscore."""
+    return [name[:i] for i, char in enumerate(name) if char == "_" and i] + [name]
+
+
+def _camel_prefixes(name: str) -> list[str]:
+    """Return name and every prefix of it ending before an uppercase letter."""
+    return [name[:i] for i, char in enumerate(name) if char.isupper() and i] + [name]
+
+
+def index_test_names(test_symbols: list[ModuleSymbols]) -> set[str]:
+    """Index the test names of test modules for symbol matching.
+
+    A test named ``test_load_missing_file`` yields ``test_load``,
+    ``test_load_missing`` and so on, so each check is a set lookup.
+    """
+    tokens: set[str] = set()
+    for symbols in test_symbols:
+        for name in symbols.functions:
+            if name.startswith(TEST_FUNCTION_PREFIX):
+                tokens.update(_underscore_prefixes(name))
+        for name in symbols.classes:
+            if name.startswith(TEST_CLASS_PREFIX):
+                tokens.update(_camel_prefixes(name))
+        for qualname in symbols.methods:
+            class_name, _, name = qualname.partition(".")
+            if not (
+                class_name.startswith(TEST_CLASS_PREFIX)
+                and name.startswith(TEST_FUNCTION_PREFIX)
+            ):
+                continue
+            method_prefixes = _underscore_prefixes(name)
+            tokens.update(method_prefixes)
+            tokens.update(
+                f"{class_prefix}.{method_prefix}"
+                for class_prefix in _camel_prefixes(class_name)
+                for method_prefix in method_prefixes
+            )
+    return tokens
+
+
+def untested_symbols(symbols: ModuleSymbols, tokens: set[str]) -> list[str]:
+    """Return the public symbols of a source module that no test is named after.
+
+    ``func`` needs a ``test_func*`` test; ``Class`` needs a ``TestClass*`` class
+    or a ``test_class*`` test; ``Class.method`` needs ``TestClass*.test_method*``
+    or ``test_class_method*``.
+    """
+    untested = [f for f in symbols.functions if f"test_{f}" not in tokens]
+    for name in symbols.classes:
+        if f"Test{name}" not in tokens and f"test_{snake_case(name)}" not in tokens:
+            untested.append(name)
+    for qualname in symbols.methods:
+        class_name, _, name = qualname.partition(".")
+        if (
+            f"Test{class_name}.test_{name}" not in tokens
+            and f"test_{snake_case(class_name)}_{name}" not in tokens
+        ):
+            untested.append(qualname)
+    return untested
+
+
+class SymbolCache:
+    """Persistent mapping of content hash to extracted symbols."""
+
+    def __init__(self, cache_dir: Path | None = None) -> None:
+        """Load the cache file, starting empty if it is missing or outdated.
+
+        Args:
+            cache_dir (Path | None): Directory holding the cache file; defaults
+                to the project cache directory under the current directory.
+        """
+        if cache_dir is None:
+            cache_dir = default_cache_dir()
+        self.path = cache_dir / SYMBOL_CACHE_FILE_NAME
+        data = load_json(self.path)
+        entries = {}
+        if isinstance(data, dict) and data.get("version") == SYMBOL_CACHE_VERSION:
+            entries = data.get("entries", {})
+        self._entries: dict[str, list[list[str]]] = entries
+        self._dirty = False
+
+    def __len__(self) -> int:
+        """Return the number of cached modules."""
+        return len(self._entries)
+
+    def get(self, key: str) -> ModuleSymbols | None:
+        """Return cached symbols for a content hash."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        return ModuleSymbols(*(tuple(names) for names in entry))
+
+    def put(self, key: str, symbols: ModuleSymbols) -> None:
+        """Cache symbols for a content hash."""
+        self._entries[key] = [list(names) for names in symbols]
+        self._dirty = True
+
+    def save(self) -> None:
+        """Write the cache back if it changed, keeping the newest entries."""
+        if not self._dirty:
+            return
+        if len(self._entries) > SYMBOL_CACHE_MAX_ENTRIES:
+            keys = list(self._entries)[-SYMBOL_CACHE_MAX_ENTRIES:]
+            self._entries = {key: self._entries[key] for key in keys}
+        save_json(
+            self.path, {"version": SYMBOL_CACHE_VERSION, "entries": self._entries}
+        )
+        self._dirty = False
+
+
+def parse_modules(
+    paths: list[Path], cache: SymbolCache, workers: int | None = None
+) -> list[ModuleSymbols]:
+    """Return the symbols of each module, parsing only uncached contents.
+
+    Args:
+        paths (list[Path]): Module files to inspect.
+        cache (SymbolCache): Cache consulted and updated; not saved here.
+        workers (int | None): Process pool size for large batches; defaults to
+            the CPU count. Use 1 to always parse in-process.
+
+    Returns:
+        list[ModuleSymbols]: Symbols in the same order as paths.
+    """
+    results: list[ModuleSymbols] = []
+    misses: dict[str, tuple[bytes, list[int]]] = {}
+    for index, path in enumerate(paths):
+        try:
+            data = path.read_bytes()
+        except OSError:
+            data = b""
+        key = content_hash(data)
+        symbols = cache.get(key)
+        results.append(symbols or ModuleSymbols())
+        if symbols is None:
+            misses.setdefault(key, (data, []))[1].append(index)
+
+    if misses:
+        sources = [data for data, _ in misses.values()]
+        if workers is None:
+            workers = os.cpu_count() or 1
+        if workers > 1 and len(sources) >= PARALLEL_PARSE_THRESHOLD:
+            # Imported here: it pulls in multiprocessing, rarely needed.
+            from concurrent.futures import ProcessPoolExecutor
+
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                parsed = list(
+                    executor.map(extract_symbols, sources, chunksize=PARSE_CHUNK_SIZE)
+                )
+        else:
+            parsed = [extract_symbols(data) for data in sources]
+        for (key, (_, indexes)), symbols in zip(misses.items(), parsed, strict=True):
+            cache.put(key, symbols)
+            for index in indexes:
+                results[index] = symbols
+    return results
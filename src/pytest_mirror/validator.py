@@ -6,6 +6,8 @@ import pluggy
 
 from .constants import PACKAGE_NAME
 from .core import find_missing_tests
+from .mapping import hook_strategy
+from .report import MirrorReport
 
 hookimpl = pluggy.HookimplMarker(PACKAGE_NAME)
 
@@ -13,7 +15,36 @@ hookimpl = pluggy.HookimplMarker(PACKAGE_NAME)
 class MirrorValidator:
     """Plugin implementation that enforces mirrored test structure."""
 
+    def __init__(self, plugin_manager: pluggy.PluginManager | None = None) -> None:
+        """Create the validator.
+
+        Args:
+            plugin_manager (pluggy.PluginManager | None): Manager whose
+                ``mirror_map_test_paths`` implementations replace the
+                configured mapping.
+        """
+        self.plugin_manager = plugin_manager
+
     @hookimpl
-    def validate_test_structure(self, package_dir: Path, tests_dir: Path) -> list[Path]:
-        """Return missing test file paths."""
-        return find_missing_tests(package_dir, tests_dir)
+    def validate_test_structure(
+        self,
+        package_dir: Path,
+        tests_dir: Path,
+        test_files: list[str] | None,
+        stale: bool,
+        placeholders: bool,
+    ) -> MirrorReport:
+        """Return missing test file paths, and the extra reports requested."""
+        mapping = None
+        if self.plugin_manager is not None:
+            mapping = hook_strategy(
+                self.plugin_manager.hook.mirror_map_test_paths, package_dir, tests_dir
+            )
+        return find_missing_tests(
+            package_dir,
+            tests_dir,
+            mapping=mapping,
+            test_files=test_files,
+            stale=stale,
+            placeholders=placeholders,
+        )
@@ -0,0 +1,202 @@
+"""Directory walking for pytest-mirror.
+
+Replaces ``Path.rglob`` with an iterative ``os.scandir`` walk that applies
+``.gitignore`` rules to directories before descending, so ignored subtrees such
+as virtualenvs, build outputs and coverage reports are never listed.
+
+Every scanned directory is recorded by ``(st_dev, st_ino)``, so a directory
+reachable through several symlinked paths is scanned once and yields each file
+once. Real directories are walked before any symlinked ones, so the real path
+wins when both lead to the same tree.
+"""
+
+import os
+from collections import deque
+from collections.abc import Iterator
+from enum import StrEnum
+from pathlib import Path
+
+from .ignore import (
+    GIT_DIR_NAME,
+    GITIGNORE_FILE_NAME,
+    IgnoreRules,
+    IgnoreScope,
+    ancestor_scopes,
+    is_ignored,
+)
+
+# Module-specific constants
+PY_SUFFIX = ".py"
+DEFAULT_MAX_FILES = 250_000
+FILE_LIMIT_MESSAGE = (
+    "Listed more than {limit} files while walking {root}; check the package "
+    "and tests directories, or raise max-files in [tool.pytest-mirror] "
+    "(0 disables the limit)"
+)
+
+
+class FileLimitExceeded(RuntimeError):
+    """A walk listed more files than the walker's ``max_files`` ceiling."""
+
+
+class SymlinkPolicy(StrEnum):
+    """How the walker treats symlinked directories."""
+
+    FOLLOW = "follow"
+    """Follow every symlinked directory whose target was not scanned yet."""
+    SKIP = "skip"
+    """Never descend into symlinked directories."""
+    FOLLOW_ONCE = "follow-once"
+    """Follow symlinked directories, but not links found inside their targets."""
+
+
+_Frame = tuple[str, str, tuple[IgnoreScope, ...], int | None, int]
+
+
+def _scan_sorted(path: str) -> list[os.DirEntry[str]]:
+    """List a directory with entries sorted by name for deterministic output."""
+    with os.scandir(path) as it:
+        return sorted(it, key=lambda entry: entry.name)
+
+
+class TreeWalker:
+    """Walk directory trees, pruning ignored directories before descending.
+
+    Counters accumulate across walks so callers can report how much work a
+    validation run did.
+    """
+
+    def __init__(
+        self,
+        respect_gitignore: bool = True,
+        symlinks: SymlinkPolicy | str = SymlinkPolicy.FOLLOW_ONCE,
+        max_files: int | None = None,
+    ) -> None:
+        """Create a walker.
+
+        Args:
+            respect_gitignore (bool): Apply ``.gitignore`` files found in the
+                enclosing git work tree and below the walk root.
+            symlinks (SymlinkPolicy | str): Policy for symlinked directories.
+            max_files (int | None): Abort once more files than this have been
+                listed across all walks; None or 0 means no limit.
+
+        Raises:
+            ValueError: If symlinks is not a valid policy name.
+        """
+        self.respect_gitignore = respect_gitignore
+        self.symlinks = SymlinkPolicy(symlinks)
+        self.max_files = max_files or None
+        self.files_seen = 0
+        self.dirs_scanned = 0
+        self.dirs_pruned = 0
+        self.links_skipped = 0
+
+    def iter_files(
+        self, root: Path, suffix: str = PY_SUFFIX
+    ) -> Iterator[tuple[str, os.DirEntry[str]]]:
+        """Yield files below root whose name ends with suffix.
+
+        Args:
+            root (Path): Directory to walk. Missing directories yield nothing.
+            suffix (str): File name suffix to select.
+
+        Yields:
+            tuple[str, os.DirEntry[str]]: POSIX path relative to root and the
+            directory entry, whose cached stat data callers may reuse.
+
+        Raises:
+            FileLimitExceeded: If the walker's ``max_files`` ceiling is hit.
+        """
+        if not root.is_dir():
+            return
+        scopes = ancestor_scopes(root) if self.respect_gitignore else ()
+        visited: set[tuple[int, int]] = set()
+        # Symlinked directories wait here until all real directories are done.
+        linked: deque[_Frame] = deque([(os.fspath(root), "", scopes, None, 0)])
+        while linked:
+            path, prefix, scopes, _, hops = linked.popleft()
+            try:
+                st = Path(path).stat()
+            except OSError:
+                continue
+            key = (st.st_dev, st.st_ino)
+            if key in visited:
+                self.links_skipped += 1
+                continue
+            visited.add(key)
+            stack: list[_Frame] = [(path, prefix, scopes, st.st_dev, hops)]
+            while stack:
+                yield from self._scan(stack, linked, visited, suffix, root)
+
+    def _scan(
+        self,
+        stack: list[_Frame],
+        linked: deque[_Frame],
+        visited: set[tuple[int, int]],
+        suffix: str,
+        root: Path,
+    ) -> Iterator[tuple[str, os.DirEntry[str]]]:
+        """Scan the directory on top of the stack and queue its subdirectories."""
+        path, prefix, scopes, dev, hops = stack.pop()
+        try:
+            entries = _scan_sorted(path)
+        except OSError:
+            return
+        self.dirs_scanned += 1
+        if self.respect_gitignore:
+            scopes = self._push_scope(entries, prefix, scopes)
+        subdirs: list[_Frame] = []
+        for entry in entries:
+            name = entry.name
+            rel_path = prefix + name
+            if entry.is_dir():
+                if name == GIT_DIR_NAME:
+                    continue
+                if scopes and is_ignored(scopes, rel_path, name, True):
+                    self.dirs_pruned += 1
+                    continue
+                if entry.is_symlink():
+                    if self.symlinks is SymlinkPolicy.SKIP or (
+                        self.symlinks is SymlinkPolicy.FOLLOW_ONCE and hops
+                    ):
+                        self.links_skipped += 1
+                    else:
+                        linked.append(
+                            (entry.path, rel_path + "/", scopes, None, hops + 1)
+                        )
+                    continue
+                # A real directory shares its parent's device unless it is a
+                # mount point, which cannot be reached twice without a link.
+                key = (dev, entry.inode())
+                if key in visited:
+                    continue
+                visited.add(key)
+                subdirs.append((entry.path, rel_path + "/", scopes, dev, hops))
+                continue
+            self.files_seen += 1
+            if self.max_files is not None and self.files_seen > self.max_files:
+                raise FileLimitExceeded(
+                    FILE_LIMIT_MESSAGE.format(limit=self.max_files, root=root)
+                )
+            if name.endswith(suffix):
+                if scopes and is_ignored(scopes, rel_path, name, False):
+                    continue
+                yield rel_path, entry
+        # Reverse so the stack pops subdirectories in name order.
+        stack.extend(reversed(subdirs))
+
+    @staticmethod
+    def _push_scope(
+        entries: list[os.DirEntry[str]],
+        prefix: str,
+        scopes: tuple[IgnoreScope, ...],
+    ) -> tuple[IgnoreScope, ...]:
+        """Add the directory's own ``.gitignore`` to the active scopes."""
+        for entry in entries:
+            if entry.name == GITIGNORE_FILE_NAME and entry.is_file():
+                rules = IgnoreRules.from_file(Path(entry.path))
+                if rules:
+                    return (*scopes, IgnoreScope(rules, strip=len(prefix)))
+                break
+        return scopes
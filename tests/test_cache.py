@@ -0,0 +1,73 @@
+"""Unit tests for pytest_mirror.cache helpers."""
+
+import os
+import stat
+
+import pytest
+
+from pytest_mirror.cache import (
+    atomic_write_text,
+    default_cache_dir,
+    load_json,
+    project_cache_dir,
+    save_json,
+)
+
+
+def test_default_cache_dir(tmp_path):
+    """The cache lives in pytest's cache directory under the project root."""
+    assert (
+        default_cache_dir(tmp_path)
+        == tmp_path / ".pytest_cache" / "d" / "pytest-mirror"
+    )
+
+
+def test_project_cache_dir_follows_pytest_cache_dir(tmp_path, monkeypatch):
+    """The configured cache_dir is resolved from the project root."""
+    nested = tmp_path / "src" / "pkg"
+    nested.mkdir(parents=True)
+    assert project_cache_dir(nested) == default_cache_dir(nested)
+
+    (tmp_path / "pyproject.toml").write_text("[tool.pytest.ini_options]\n")
+    assert project_cache_dir(nested) == default_cache_dir(tmp_path)
+
+    monkeypatch.setenv("CACHE_ROOT", "build")
+    (tmp_path / "pyproject.toml").write_text(
+        '[tool.pytest.ini_options]\ncache_dir = "$CACHE_ROOT/cache"\n'
+    )
+    expected = tmp_path / "build" / "cache" / "d" / "pytest-mirror"
+    assert project_cache_dir(nested) == expected
+    assert project_cache_dir(nested, tmp_path / "other") == (
+        tmp_path / "other" / "d" / "pytest-mirror"
+    )
+
+
+def test_atomic_write_text_replaces_file(tmp_path):
+    """Atomic writes create parents, replace content and leave no temp files."""
+    target = tmp_path / "nested" / "file.txt"
+    atomic_write_text(target, "one")
+    atomic_write_text(target, "two")
+    assert target.read_text() == "two"
+    assert [p.name for p in target.parent.iterdir()] == ["file.txt"]
+
+
+@pytest.mark.skipif(not hasattr(os, "fchmod"), reason="POSIX file modes only")
+def test_atomic_write_text_uses_umask_mode(tmp_path):
+    """Written files get the mode open() gives them, not mkstemp's 0600."""
+    target = tmp_path / "metrics.prom"
+    mask = os.umask(0o022)
+    try:
+        atomic_write_text(target, "x")
+    finally:
+        os.umask(mask)
+    assert stat.S_IMODE(target.stat().st_mode) == 0o644
+
+
+def test_json_round_trip_and_errors(tmp_path):
+    """JSON helpers round-trip data and treat unreadable files as missing."""
+    path = tmp_path / "data.json"
+    assert load_json(path) is None
+    save_json(path, {"a": [1, 2]})
+    assert load_json(path) == {"a": [1, 2]}
+    path.write_text("{not json")
+    assert load_json(path) is None
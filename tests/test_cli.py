@@ -2,8 +2,37 @@
 
 import sys
 
+import pytest
+
+from pytest_mirror import cli
+from pytest_mirror.cli import validate_missing_tests
+from pytest_mirror.core import generate_missing_tests
+
+# Modules --help and usage errors must not import.
+CLI_DEFERRED_MODULES = {
+    "ast",
+    "hashlib",
+    "pytest_mirror.core",
+    "pytest_mirror.durations",
+    "pytest_mirror.ignore",
+    "pytest_mirror.mapping",
+    "pytest_mirror.plugin_manager",
+    "pytest_mirror.stubs",
+    "pytest_mirror.symbols",
+    "pytest_mirror.walker",
+}
+HELP_SCRIPT = """
+import sys
+
 from pytest_mirror import cli
-from pytest_mirror.cli import generate_missing_tests, validate_missing_tests
+
+sys.argv = ["pytest-mirror", "--help"]
+try:
+    cli.main()
+except SystemExit:
+    pass
+print(*sys.modules, sep="\\n", file=sys.stderr)
+"""
 
 
 def test_generate_missing_tests_creates_test_and_init(tmp_path):
@@ -149,6 +178,26 @@ def test_cli_main_help(monkeypatch, capsys):
     assert "usage" in out.lower()
 
 
+def test_cli_help_defers_validation_code(tmp_path):
+    """--help parses no module and imports no walking or mapping code."""
+    import os
+    import subprocess
+    from pathlib import Path
+
+    src = str(Path(cli.__file__).parents[1])
+    pythonpath = [src, os.environ.get("PYTHONPATH", "")]
+    result = subprocess.run(
+        [sys.executable, "-c", HELP_SCRIPT],
+        cwd=tmp_path,
+        capture_output=True,
+        text=True,
+        check=True,
+        env={**os.environ, "PYTHONPATH": os.pathsep.join(filter(None, pythonpath))},
+    )
+    assert "usage: pytest-mirror" in result.stdout
+    assert not set(result.stderr.splitlines()) & CLI_DEFERRED_MODULES
+
+
 def test_cli_main_no_command(monkeypatch):
     """Test cli.main() with no command prints usage and exits."""
     import sys
@@ -308,3 +357,356 @@ class TestConfigurationEdgeCases:
         (tmp_path / "src" / "mypackage").mkdir()
         result = detect_default_package_dir()
         assert result == tmp_path / "src" / "mypackage"
+
+
+def test_cli_generate_stub_mode_ast(monkeypatch, tmp_path, capsys):
+    """The generate command accepts --stub-mode ast."""
+    pkg = tmp_path / "pkg"
+    tests = tmp_path / "tests"
+    pkg.mkdir()
+    (pkg / "foo.py").write_text("def bar(): ...\n")
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(
+        sys,
+        "argv",
+        [
+            "pytest-mirror",
+            "generate",
+            "--package-dir",
+            str(pkg),
+            "--tests-dir",
+            str(tests),
+            "--stub-mode",
+            "ast",
+        ],
+    )
+    cli.main()
+    assert "def test_bar():" in (tests / "test_foo.py").read_text()
+
+
+def test_cli_generate_shares_pytest_cache_dir(monkeypatch, tmp_path):
+    """Parse results are cached where pytest keeps its cache."""
+    pkg = tmp_path / "pkg"
+    pkg.mkdir()
+    (pkg / "foo.py").write_text("def bar(): ...\n")
+    (tmp_path / "pyproject.toml").write_text(
+        '[tool.pytest.ini_options]\ncache_dir = "build/cache"\n'
+    )
+    monkeypatch.chdir(tmp_path)
+    args = ["--package-dir", str(pkg), "--tests-dir", str(tmp_path / "tests")]
+    monkeypatch.setattr(
+        sys, "argv", ["pytest-mirror", "generate", "--stub-mode", "ast", *args]
+    )
+    cli.main()
+    assert (tmp_path / "build" / "cache" / "d" / "pytest-mirror").is_dir()
+    assert not (tmp_path / ".pytest_cache").exists()
+
+
+def test_validate_missing_tests_symbols(tmp_path, capsys, monkeypatch):
+    """Symbol validation lists untested public symbols."""
+    monkeypatch.chdir(tmp_path)
+    pkg = tmp_path / "pkg"
+    tests = tmp_path / "tests"
+    pkg.mkdir()
+    tests.mkdir()
+    (pkg / "foo.py").write_text("def load(): ...\n")
+    (tests / "test_foo.py").write_text("def test_placeholder(): ...\n")
+    validate_missing_tests(pkg, tests, symbols=True)
+    out = capsys.readouterr().out
+    assert "Untested symbols detected" in out
+    assert "foo.py: load" in out
+
+
+def test_validate_missing_tests_symbols_share_pytest_cache_dir(tmp_path, monkeypatch):
+    """The symbol cache lives where pytest keeps its cache."""
+    from pytest_mirror.symbols import SYMBOL_CACHE_FILE_NAME
+
+    monkeypatch.chdir(tmp_path)
+    pkg = tmp_path / "pkg"
+    pkg.mkdir()
+    (pkg / "foo.py").write_text("def load(): ...\n")
+    (tmp_path / "pyproject.toml").write_text(
+        '[tool.pytest.ini_options]\ncache_dir = "build/cache"\n'
+    )
+    validate_missing_tests(pkg, tmp_path / "tests", symbols=True)
+    cache = tmp_path / "build" / "cache" / "d" / "pytest-mirror"
+    assert (cache / SYMBOL_CACHE_FILE_NAME).is_file()
+    validate_missing_tests(pkg, tmp_path / "tests", True, False, tmp_path / "other")
+    assert (
+        tmp_path / "other" / "d" / "pytest-mirror" / SYMBOL_CACHE_FILE_NAME
+    ).is_file()
+    assert not (tmp_path / ".pytest_cache").exists()
+
+
+def test_cli_main_profile(monkeypatch, tmp_path, capsys):
+    """--profile prints the phase breakdown and --profile-json saves it."""
+    import json
+    import sys
+
+    from pytest_mirror import cli, profiling
+
+    pkg = tmp_path / "pkg"
+    (pkg / "foo.py").parent.mkdir(parents=True)
+    (pkg / "foo.py").write_text("")
+    json_path = tmp_path / "profile.json"
+    monkeypatch.setattr(
+        sys,
+        "argv",
+        [
+            "pytest-mirror",
+            "validate",
+            "--package-dir",
+            str(pkg),
+            "--tests-dir",
+            str(tmp_path / "tests"),
+            "--profile",
+            "--profile-json",
+            str(json_path),
+        ],
+    )
+    cli.main(cwd=tmp_path)
+    out = capsys.readouterr().out
+    assert cli.PROFILE_HEADER in out
+    assert profiling.PHASE_SOURCE_WALK in out
+    assert profiling.active() is None
+    assert profiling.PHASE_PLUGIN_MANAGER in json.loads(json_path.read_text())["phases"]
+
+
+def test_cli_main_metrics(monkeypatch, tmp_path):
+    """--metrics writes an OpenMetrics file for the run."""
+    import sys
+
+    from pytest_mirror import cli
+
+    pkg = tmp_path / "pkg"
+    (pkg / "foo.py").parent.mkdir(parents=True)
+    (pkg / "foo.py").write_text("")
+    metrics_path = tmp_path / "mirror.prom"
+    monkeypatch.setattr(
+        sys,
+        "argv",
+        [
+            "pytest-mirror",
+            "generate",
+            "--package-dir",
+            str(pkg),
+            "--tests-dir",
+            str(tmp_path / "tests"),
+            "--metrics",
+            str(metrics_path),
+        ],
+    )
+    cli.main(cwd=tmp_path)
+    lines = metrics_path.read_text().splitlines()
+    assert "pytest_mirror_modules_scanned 1" in lines
+    assert "pytest_mirror_generated 1" in lines
+
+
+def test_cli_main_prune(monkeypatch, tmp_path, capsys):
+    """Prune deletes placeholder orphans and lists them under validate."""
+    pkg = tmp_path / "pkg"
+    pkg.mkdir()
+    (pkg / "foo.py").write_text("# dummy\n")
+    tests = tmp_path / "tests"
+    generate_missing_tests(pkg, tests)
+    (pkg / "foo.py").unlink()
+    (pkg / "bar.py").write_text("# dummy\n")
+    generate_missing_tests(pkg, tests)
+    (pkg / "bar.py").unlink()
+    (tests / "test_bar.py").write_text("def test_real():\n    assert True\n")
+    capsys.readouterr()
+    args = ["--package-dir", str(pkg), "--tests-dir", str(tests)]
+
+    monkeypatch.setattr(sys, "argv", ["pytest-mirror", "validate", *args])
+    cli.main()
+    out = capsys.readouterr().out
+    assert "Orphaned tests" in out
+    assert str(tests / "test_foo.py") in out
+
+    monkeypatch.setattr(sys, "argv", ["pytest-mirror", "prune", "--dry-run", *args])
+    cli.main()
+    out = capsys.readouterr().out
+    assert f"Would remove: {tests / 'test_foo.py'}" in out
+    assert (tests / "test_foo.py").exists()
+
+    monkeypatch.setattr(sys, "argv", ["pytest-mirror", "prune", *args])
+    cli.main()
+    out = capsys.readouterr().out
+    assert f"Removed: {tests / 'test_foo.py'}" in out
+    assert "1 orphan(s) kept" in out
+    assert not (tests / "test_foo.py").exists()
+    assert (tests / "test_bar.py").exists()
+
+
+def test_cli_main_validate_placeholders(monkeypatch, tmp_path, capsys):
+    """The --placeholders flag lists generated stubs that were never edited."""
+    pkg = tmp_path / "pkg"
+    pkg.mkdir()
+    (pkg / "foo.py").write_text("# dummy\n")
+    tests = tmp_path / "tests"
+    generate_missing_tests(pkg, tests)
+    capsys.readouterr()
+    args = ["--package-dir", str(pkg), "--tests-dir", str(tests)]
+
+    monkeypatch.setattr(sys, "argv", ["pytest-mirror", "validate", *args])
+    cli.main()
+    assert "placeholder" not in capsys.readouterr().out
+
+    monkeypatch.setattr(
+        sys, "argv", ["pytest-mirror", "validate", "--placeholders", *args]
+    )
+    cli.main()
+    out = capsys.readouterr().out
+    assert cli.PLACEHOLDERS_MESSAGE in out
+    assert str(tests / "test_foo.py") in out
+
+
+def test_cli_main_stale(monkeypatch, tmp_path, capsys):
+    """The stale command lists modules newer than their tests, optionally ranked."""
+    import os
+
+    pkg = tmp_path / "pkg"
+    tests = tmp_path / "tests"
+    pkg.mkdir()
+    tests.mkdir()
+    for name, lag in (("a", 10), ("b", 100), ("c", 0)):
+        (pkg / f"{name}.py").write_text("")
+        (tests / f"test_{name}.py").write_text("")
+        os.utime(tests / f"test_{name}.py", (1_000, 1_000))
+        os.utime(pkg / f"{name}.py", (1_000 + lag, 1_000 + lag))
+    args = ["--package-dir", str(pkg), "--tests-dir", str(tests)]
+
+    monkeypatch.setattr(sys, "argv", ["pytest-mirror", "stale", *args])
+    cli.main()
+    out = capsys.readouterr().out
+    assert cli.STALE_TESTS_MESSAGE in out
+    assert out.index(str(pkg / "a.py")) < out.index(str(pkg / "b.py"))
+    assert str(pkg / "c.py") not in out
+
+    monkeypatch.setattr(sys, "argv", ["pytest-mirror", "stale", "--rank", *args])
+    cli.main()
+    out = capsys.readouterr().out
+    assert out.index(str(pkg / "b.py")) < out.index(str(pkg / "a.py"))
+
+    for name in ("a", "b"):
+        os.utime(tests / f"test_{name}.py", (2_000, 2_000))
+    monkeypatch.setattr(sys, "argv", ["pytest-mirror", "stale", *args])
+    cli.main()
+    assert cli.NO_STALE_TESTS_MESSAGE in capsys.readouterr().out
+
+
+def test_cli_main_coverage(monkeypatch, tmp_path, capsys):
+    """The coverage command flags mirrored tests that miss their module."""
+    import sqlite3
+
+    pkg = tmp_path / "pkg"
+    tests = tmp_path / "tests"
+    pkg.mkdir()
+    tests.mkdir()
+    for name in ("a", "b"):
+        (pkg / f"{name}.py").write_text("")
+        (tests / f"test_{name}.py").write_text("")
+    data = tmp_path / "cov.db"
+    conn = sqlite3.connect(data)
+    conn.executescript(
+        """
+        CREATE TABLE coverage_schema (version integer);
+        CREATE TABLE file (id integer primary key, path text);
+        CREATE TABLE context (id integer primary key, context text);
+        CREATE TABLE line_bits (file_id integer, context_id integer, numbits blob);
+        CREATE TABLE arc (file_id integer, context_id integer, fromno, tono);
+        INSERT INTO coverage_schema VALUES (7);
+        """
+    )
+    conn.executemany(
+        "INSERT INTO file VALUES (?, ?)",
+        [(1, str(pkg / "a.py")), (2, str(pkg / "b.py"))],
+    )
+    conn.execute("INSERT INTO context VALUES (1, 'tests/test_a.py::test_a|run')")
+    conn.executemany(
+        "INSERT INTO arc VALUES (?, 1, ?, ?)",
+        [(1, -1, 1), (1, 1, 2), (1, 2, -1), (2, -1, 1)],
+    )
+    conn.commit()
+    conn.close()
+    args = ["--package-dir", str(pkg), "--tests-dir", str(tests)]
+
+    monkeypatch.setattr(
+        sys, "argv", ["pytest-mirror", "coverage", "--coverage-file", str(data), *args]
+    )
+    cli.main()
+    out = capsys.readouterr().out
+    assert f"{pkg / 'a.py'}: 2/2 lines (100%)" in out
+    flagged = out.split("Mirrored tests below 0% of their module:")[1]
+    assert str(pkg / "b.py") in flagged
+    assert str(pkg / "a.py") not in flagged
+
+    monkeypatch.setattr(
+        sys,
+        "argv",
+        ["pytest-mirror", "coverage", "--coverage-file", str(tmp_path / "none"), *args],
+    )
+    with pytest.raises(SystemExit) as exc_info:
+        cli.main()
+    assert exc_info.value.code == 1
+    assert "Coverage data file does not exist" in capsys.readouterr().err
+
+
+def test_cli_main_durations(monkeypatch, tmp_path, capsys):
+    """The durations command lists the slowest modules with their trend."""
+    from pytest_mirror.cache import default_cache_dir
+    from pytest_mirror.durations import DurationHistory
+
+    pkg = tmp_path / "pkg"
+    pkg.mkdir()
+    for name in ("a", "b", "c"):
+        (pkg / f"{name}.py").write_text("")
+    monkeypatch.chdir(tmp_path)
+    args = ["--package-dir", str(pkg), "--tests-dir", str(tmp_path / "tests")]
+
+    monkeypatch.setattr(sys, "argv", ["pytest-mirror", "durations", *args])
+    cli.main()
+    assert cli.NO_DURATIONS_MESSAGE in capsys.readouterr().out
+
+    history = DurationHistory(default_cache_dir(tmp_path))
+    history.record({"test_a.py": 1.0, "test_b.py": 3.0, "test_c.py": 0.5})
+    history.record({"test_a.py": 2.0})
+    history.save()
+    monkeypatch.setattr(
+        sys, "argv", ["pytest-mirror", "durations", "--top", "2", *args]
+    )
+    cli.main()
+    out = capsys.readouterr().out
+    assert cli.DURATIONS_MESSAGE in out
+    assert out.index(f"{pkg / 'b.py'}: 3.00s") < out.index(
+        f"{pkg / 'a.py'}: 2.00s (1.00s -> 2.00s, +100%)"
+    )
+    assert str(pkg / "c.py") not in out
+
+
+def test_cli_main_durations_reads_pytest_cache_dir(monkeypatch, tmp_path, capsys):
+    """Durations are read from the cache directory pytest writes them to."""
+    from pytest_mirror.durations import DurationHistory
+
+    pkg = tmp_path / "pkg"
+    pkg.mkdir()
+    (pkg / "a.py").write_text("")
+    (tmp_path / "pyproject.toml").write_text(
+        '[tool.pytest.ini_options]\ncache_dir = "build/cache"\n'
+    )
+    history = DurationHistory(tmp_path / "build" / "cache" / "d" / "pytest-mirror")
+    history.record({"test_a.py": 1.5})
+    history.save()
+    monkeypatch.chdir(pkg)
+    args = ["--package-dir", str(pkg), "--tests-dir", str(tmp_path / "tests")]
+
+    monkeypatch.setattr(sys, "argv", ["pytest-mirror", "durations", *args])
+    cli.main()
+    assert f"{pkg / 'a.py'}: 1.50s" in capsys.readouterr().out
+
+    other = tmp_path / "other"
+    monkeypatch.setattr(
+        sys, "argv", ["pytest-mirror", "durations", "--cache-dir", str(other), *args]
+    )
+    cli.main()
+    assert cli.NO_DURATIONS_MESSAGE in capsys.readouterr().out
@@ -0,0 +1,91 @@
+"""Unit tests for pytest_mirror.config pyproject loading."""
+
+import os
+
+from pytest_mirror import config
+from pytest_mirror.config import (
+    find_pyproject,
+    load_config,
+    read_pytest_option,
+    read_tool_config,
+)
+
+
+def test_find_pyproject_walks_up(tmp_path):
+    """The nearest pyproject.toml at or above the start directory is found."""
+    pyproject = tmp_path / "pyproject.toml"
+    pyproject.write_text("[tool.pytest-mirror]\n")
+    nested = tmp_path / "src" / "pkg"
+    nested.mkdir(parents=True)
+    assert find_pyproject(nested) == pyproject
+    assert find_pyproject(tmp_path) == pyproject
+
+
+def test_read_tool_config(tmp_path):
+    """Only the [tool.pytest-mirror] table is returned."""
+    pyproject = tmp_path / "pyproject.toml"
+    pyproject.write_text(
+        '[tool.other]\nx = 1\n[tool.pytest-mirror]\nmapping = "flat"\n'
+    )
+    assert read_tool_config(pyproject) == {"mapping": "flat"}
+
+
+def test_read_pytest_option(tmp_path):
+    """Options come from pytest's ini_options or its native table."""
+    pyproject = tmp_path / "pyproject.toml"
+    pyproject.write_text('[tool.pytest.ini_options]\ncache_dir = "build/cache"\n')
+    assert read_pytest_option(pyproject, "cache_dir") == "build/cache"
+    assert read_pytest_option(pyproject, "testpaths") is None
+    pyproject.write_text('[tool.pytest]\ncache_dir = "native"\n')
+    assert read_pytest_option(pyproject, "cache_dir") == "native"
+    pyproject.write_text("[tool.pytest\n")
+    assert read_pytest_option(pyproject, "cache_dir") is None
+    assert read_pytest_option(tmp_path / "missing.toml", "cache_dir") is None
+
+
+def test_read_tool_config_errors(tmp_path):
+    """Missing or malformed files yield an empty dict."""
+    assert read_tool_config(tmp_path / "missing.toml") == {}
+    bad = tmp_path / "pyproject.toml"
+    bad.write_text("[tool.pytest-mirror\n")
+    assert read_tool_config(bad) == {}
+
+
+def test_read_tool_config_cached_until_modified(tmp_path, monkeypatch):
+    """A file is parsed once until its mtime or size changes."""
+    pyproject = tmp_path / "pyproject.toml"
+    pyproject.write_text('[tool.pytest-mirror]\nmapping = "flat"\n')
+    calls = []
+    real = config._parse_tool_config
+    monkeypatch.setattr(
+        config, "_parse_tool_config", lambda path: calls.append(path) or real(path)
+    )
+    assert read_tool_config(pyproject) == {"mapping": "flat"}
+    assert read_tool_config(pyproject) == {"mapping": "flat"}
+    assert len(calls) == 1
+
+    pyproject.write_text('[tool.pytest-mirror]\nmapping = "suffix"\n')
+    mtime = pyproject.stat().st_mtime_ns + 1_000_000_000
+    os.utime(pyproject, ns=(mtime, mtime))
+    assert read_tool_config(pyproject) == {"mapping": "suffix"}
+    assert len(calls) == 2
+
+
+def test_load_config_per_subproject(tmp_path, monkeypatch):
+    """Each package reads its nearest pyproject, each parsed once."""
+    (tmp_path / "pyproject.toml").write_text('[tool.pytest-mirror]\nmapping = "flat"\n')
+    sub = tmp_path / "libs" / "sub"
+    (sub / "src" / "sub").mkdir(parents=True)
+    (tmp_path / "app").mkdir()
+    (sub / "pyproject.toml").write_text('[tool.pytest-mirror]\nmapping = "suffix"\n')
+    config.clear_cache()
+    calls = []
+    real = config._parse_tool_config
+    monkeypatch.setattr(
+        config, "_parse_tool_config", lambda path: calls.append(path) or real(path)
+    )
+    for _ in range(3):
+        assert load_config(sub / "src" / "sub") == {"mapping": "suffix"}
+        assert load_config(tmp_path / "app") == {"mapping": "flat"}
+    assert len(calls) == 2
+    assert load_config(tmp_path.parent / "elsewhere-without-pyproject") == {}
@@ -58,3 +58,14 @@ class TestConstants:
         assert isinstance(PACKAGE_NAME, str)
         assert isinstance(MIRROR_PREFIX, str)
         assert isinstance(DEFAULT_TEST_CONTENT, str)
+
+
+def test_skeleton_templates_are_valid_python():
+    """The skeleton header plus a rendered test compiles."""
+    from pytest_mirror.constants import SKELETON_HEADER, SKELETON_TEST_TEMPLATE
+
+    content = SKELETON_HEADER + SKELETON_TEST_TEMPLATE.format(
+        test_name="thing", symbol="thing"
+    )
+    compile(content, "<string>", "exec")
+    assert "def test_thing():" in content
@@ -1,10 +1,18 @@
 """Mainline tests for pytest_mirror.core (mirrored from core.py)."""
 
+import os
 import sys
 
 import pytest
 
-from pytest_mirror.core import find_missing_tests, generate_missing_tests
+from pytest_mirror.constants import DEFAULT_TEST_CONTENT
+from pytest_mirror.core import (
+    build_import_graph,
+    find_missing_tests,
+    find_module_durations,
+    generate_missing_tests,
+    prune_orphaned_tests,
+)
 
 
 def test_find_missing_tests_returns_missing(tmp_path):
@@ -98,23 +106,6 @@ class TestCoreFunctionEdgeCases:
         with pytest.raises(FileNotFoundError):
             _validate_package_dir(tmp_path / "nonexistent")
 
-    def test_get_test_path_various_structures(self, tmp_path):
-        """Test _get_test_path with various module structures."""
-        from pytest_mirror.core import _get_test_path
-
-        pkg_dir = tmp_path / "pkg"
-        tests_dir = tmp_path / "tests"
-
-        # Test simple module
-        simple_module = pkg_dir / "simple.py"
-        result = _get_test_path(simple_module, pkg_dir, tests_dir)
-        assert result == tests_dir / "test_simple.py"
-
-        # Test nested module
-        nested_module = pkg_dir / "sub" / "nested.py"
-        result = _get_test_path(nested_module, pkg_dir, tests_dir)
-        assert result == tests_dir / "sub" / "test_nested.py"
-
     def test_ensure_test_dir_structure_behavior(self, tmp_path):
         """Test _ensure_test_dir_structure creates directories correctly."""
         from pytest_mirror.core import _ensure_test_dir_structure
@@ -189,3 +180,227 @@ class TestCoreEdgeCases:
         tests = tmp_path / "tests"
         missing = find_missing_tests(pkg, tests)
         assert tests / "test_foo.py" in missing
+
+
+def test_find_missing_tests_skips_gitignored_dirs(tmp_path):
+    """Modules inside gitignored directories are not reported."""
+    pkg = tmp_path / "pkg"
+    (pkg / "build").mkdir(parents=True)
+    (pkg / "foo.py").write_text("# dummy\n")
+    (pkg / "build" / "gen.py").write_text("# dummy\n")
+    (pkg / ".gitignore").write_text("build/\n")
+    tests = tmp_path / "tests"
+    assert find_missing_tests(pkg, tests) == [tests / "test_foo.py"]
+    assert len(find_missing_tests(pkg, tests, respect_gitignore=False)) == 2
+
+
+def test_find_missing_tests_finds_tests_in_gitignored_dirs(tmp_path):
+    """Test files in gitignored test directories are not reported missing."""
+    from pytest_mirror.core import find_untested_symbols
+
+    pkg = tmp_path / "src" / "pkg"
+    (pkg / "unit").mkdir(parents=True)
+    (pkg / "unit" / "foo.py").write_text("def foo():\n    pass\n")
+    (pkg / "bar.py").write_text("# dummy\n")
+    tests = tmp_path / "tests"
+    (tests / "unit").mkdir(parents=True)
+    (tests / "unit" / "test_foo.py").write_text("def test_foo():\n    pass\n")
+    (tests / ".gitignore").write_text("unit/\n")
+    assert find_missing_tests(pkg, tests) == [tests / "test_bar.py"]
+    assert find_untested_symbols(pkg, tests, cache_dir=tmp_path / "cache") == {}
+
+
+def test_find_missing_tests_symlinked_subtree_reported_once(tmp_path):
+    """A subtree linked back into the package yields each module once."""
+    pkg = tmp_path / "pkg"
+    (pkg / "shared").mkdir(parents=True)
+    (pkg / "shared" / "util.py").write_text("# dummy\n")
+    try:
+        (pkg / "alias").symlink_to(pkg / "shared", target_is_directory=True)
+    except (OSError, NotImplementedError):
+        pytest.skip("Symlinks not supported or insufficient privileges.")
+    tests = tmp_path / "tests"
+    assert find_missing_tests(pkg, tests, symlinks="follow") == [
+        tests / "shared" / "test_util.py"
+    ]
+
+
+def test_find_missing_tests_with_mapping(tmp_path):
+    """Alternative mappings decide which test files satisfy a module."""
+    pkg = tmp_path / "pkg"
+    (pkg / "sub").mkdir(parents=True)
+    (pkg / "sub" / "foo.py").write_text("# dummy\n")
+    tests = tmp_path / "tests"
+    (tests / "sub").mkdir(parents=True)
+    (tests / "sub" / "foo_test.py").write_text("# test\n")
+    assert find_missing_tests(pkg, tests, mapping="suffix") == []
+    assert find_missing_tests(pkg, tests, mapping="flat") == [tests / "test_foo.py"]
+
+
+def test_find_missing_tests_colocated_tests(tmp_path):
+    """Colocated test files are not treated as modules needing tests."""
+    pkg = tmp_path / "pkg"
+    pkg.mkdir()
+    (pkg / "foo.py").write_text("# dummy\n")
+    (pkg / "foo_test.py").write_text("# test\n")
+    assert find_missing_tests(pkg, pkg, mapping="suffix") == []
+
+
+def test_generate_missing_tests_ast_mode(tmp_path, capsys):
+    """The ast stub mode writes one test per public symbol."""
+    pkg = tmp_path / "pkg"
+    pkg.mkdir()
+    (pkg / "foo.py").write_text("def bar(): ...\nclass Baz: ...\n")
+    tests = tmp_path / "tests"
+    generate_missing_tests(pkg, tests, stub_mode="ast", cache_dir=tmp_path / "cache")
+    content = (tests / "test_foo.py").read_text()
+    assert "def test_bar():" in content
+    assert "def test_baz():" in content
+
+
+def test_generate_missing_tests_renderer_batch(tmp_path, capsys):
+    """A renderer receives every new module in a single call."""
+    pkg = tmp_path / "pkg"
+    pkg.mkdir()
+    (pkg / "a.py").write_text("# dummy\n")
+    (pkg / "b.py").write_text("# dummy\n")
+    tests = tmp_path / "tests"
+    calls = []
+
+    def renderer(sources):
+        calls.append(sources)
+        return [f"# {source}\n" for source in sources]
+
+    generate_missing_tests(pkg, tests, renderer=renderer)
+    assert calls == [["a.py", "b.py"]]
+    assert (tests / "test_b.py").read_text() == "# b.py\n"
+
+
+def test_find_untested_symbols_reports_per_module(tmp_path):
+    """Public symbols without a matching test are reported per source module."""
+    from pytest_mirror.core import find_untested_symbols
+
+    pkg = tmp_path / "pkg"
+    pkg.mkdir()
+    (pkg / "foo.py").write_text("def load(): ...\ndef save(): ...\n")
+    (pkg / "bar.py").write_text("class Thing:\n    def run(self): ...\n")
+    tests = tmp_path / "tests"
+    tests.mkdir()
+    (tests / "test_foo.py").write_text("def test_load_ok(): ...\n")
+    report = find_untested_symbols(pkg, tests, cache_dir=tmp_path / "cache")
+    assert report == {pkg / "foo.py": ["save"], pkg / "bar.py": ["Thing", "Thing.run"]}
+
+
+def test_find_missing_tests_max_files_from_pyproject(tmp_path):
+    """The file ceiling comes from max-files in pyproject.toml by default."""
+    from pytest_mirror.walker import FileLimitExceeded
+
+    (tmp_path / "pyproject.toml").write_text("[tool.pytest-mirror]\nmax-files = 1\n")
+    pkg = tmp_path / "pkg"
+    pkg.mkdir()
+    (pkg / "a.py").write_text("")
+    (pkg / "b.py").write_text("")
+    tests = tmp_path / "tests"
+    with pytest.raises(FileLimitExceeded):
+        find_missing_tests(pkg, tests)
+    assert len(find_missing_tests(pkg, tests, max_files=0)) == 2
+
+
+def test_find_missing_tests_reports_orphans(tmp_path):
+    """Tests whose source module is gone are reported as orphans."""
+    pkg = tmp_path / "pkg"
+    pkg.mkdir()
+    (pkg / "foo.py").write_text("# dummy\n")
+    tests = tmp_path / "tests"
+    tests.mkdir()
+    (tests / "test_foo.py").write_text("# test\n")
+    (tests / "test_gone.py").write_text("# test\n")
+    (tests / "conftest.py").write_text("")
+    report = find_missing_tests(pkg, tests)
+    assert report == []
+    assert report.orphans == [tests / "test_gone.py"]
+
+
+def test_prune_orphaned_tests_keeps_edited_files(tmp_path):
+    """Only orphans still holding the placeholder stub are deleted."""
+    stub = tmp_path / "test_stub.py"
+    stub.write_text(DEFAULT_TEST_CONTENT)
+    edited = tmp_path / "test_edited.py"
+    edited.write_text("def test_real():\n    assert True\n")
+    assert prune_orphaned_tests([stub, edited], dry_run=True) == [stub]
+    assert stub.exists()
+    assert prune_orphaned_tests([stub, edited]) == [stub]
+    assert not stub.exists()
+    assert edited.exists()
+
+
+@pytest.mark.parametrize("collected", [False, True])
+def test_find_missing_tests_stale(tmp_path, collected):
+    """Modules modified after their tests are reported, walked or collected."""
+    pkg = tmp_path / "pkg"
+    pkg.mkdir()
+    tests = tmp_path / "tests"
+    tests.mkdir()
+    for name in ("fresh", "stale"):
+        (pkg / f"{name}.py").write_text("# dummy\n")
+        (tests / f"test_{name}.py").write_text("# test\n")
+    os.utime(pkg / "fresh.py", (1_000, 1_000))
+    os.utime(pkg / "stale.py", (3_000, 3_000))
+    os.utime(tests / "test_fresh.py", (2_000, 2_000))
+    os.utime(tests / "test_stale.py", (2_000, 2_000))
+    test_files = ["test_fresh.py", "test_stale.py"] if collected else None
+    report = find_missing_tests(pkg, tests, test_files=test_files, stale=True)
+    assert report == []
+    assert [(s.source, s.test, s.lag) for s in report.stale] == [
+        (pkg / "stale.py", tests / "test_stale.py", 1_000.0)
+    ]
+    assert find_missing_tests(pkg, tests).stale == ()
+
+
+@pytest.mark.parametrize("collected", [False, True])
+def test_find_missing_tests_placeholders(tmp_path, collected):
+    """Unmodified stubs are reported, whether walked or collected."""
+    pkg = tmp_path / "pkg"
+    pkg.mkdir()
+    (pkg / "a.py").write_text("# dummy\n")
+    (pkg / "b.py").write_text("# dummy\n")
+    tests = tmp_path / "tests"
+    generate_missing_tests(pkg, tests)
+    (tests / "test_b.py").write_text("def test_b():\n    assert True\n")
+    test_files = ["__init__.py", "test_a.py", "test_b.py"] if collected else None
+    report = find_missing_tests(pkg, tests, test_files=test_files, placeholders=True)
+    assert report == []
+    assert report.placeholders == [tests / "test_a.py"]
+    assert find_missing_tests(pkg, tests).placeholders == []
+
+
+def test_find_module_durations(tmp_path):
+    """Recorded test durations are reported per mirrored module."""
+    from pytest_mirror.durations import DurationHistory
+
+    pkg = tmp_path / "pkg"
+    (pkg / "sub").mkdir(parents=True)
+    (pkg / "a.py").write_text("")
+    (pkg / "sub" / "b.py").write_text("")
+    cache_dir = tmp_path / "cache"
+    history = DurationHistory(cache_dir)
+    history.record({"test_a.py": 0.5, "sub/test_b.py": 1.5})
+    history.save()
+    entries = find_module_durations(pkg, tmp_path / "tests", cache_dir=cache_dir)
+    assert [(entry.source, entry.latest) for entry in entries] == [
+        (pkg / "sub" / "b.py", 1.5),
+        (pkg / "a.py", 0.5),
+    ]
+
+
+def test_build_import_graph(tmp_path):
+    """The walked package's imports resolve into a cached graph."""
+    pkg = tmp_path / "pkg"
+    pkg.mkdir()
+    (pkg / "__init__.py").write_text("")
+    (pkg / "a.py").write_text("")
+    (pkg / "b.py").write_text("from . import a\n")
+    cache_dir = tmp_path / "cache"
+    graph = build_import_graph(pkg, cache_dir=cache_dir, workers=1)
+    assert graph.dependents(["a.py"]) == {"a.py", "b.py"}
+    assert (cache_dir / "import_graph.json").is_file()
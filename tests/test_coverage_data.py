@@ -0,0 +1,108 @@
+"""Unit tests for pytest_mirror.coverage_data attribution."""
+
+import sqlite3
+
+import pytest
+
+from pytest_mirror.coverage_data import MirrorCoverage, mirror_coverage
+from pytest_mirror.mapping import MirrorMap, get_strategy
+
+SCHEMA = """
+CREATE TABLE coverage_schema (version integer);
+CREATE TABLE file (id integer primary key, path text, unique (path));
+CREATE TABLE context (id integer primary key, context text, unique (context));
+CREATE TABLE line_bits (
+    file_id integer, context_id integer, numbits blob, unique (file_id, context_id)
+);
+CREATE TABLE arc (
+    id integer primary key, file_id integer, context_id integer,
+    fromno integer, tono integer, unique (file_id, context_id, fromno, tono)
+);
+INSERT INTO coverage_schema VALUES (7);
+"""
+
+
+def _numbits(lines):
+    """Encode line numbers the way coverage.py does."""
+    data = bytearray(max(lines) // 8 + 1)
+    for line in lines:
+        data[line // 8] |= 1 << (line % 8)
+    return bytes(data)
+
+
+def _write_data(path, files, contexts, lines=(), arcs=()):
+    """Create a minimal coverage.py database."""
+    conn = sqlite3.connect(path)
+    conn.executescript(SCHEMA)
+    conn.executemany("INSERT INTO file VALUES (?, ?)", enumerate(files, 1))
+    conn.executemany("INSERT INTO context VALUES (?, ?)", enumerate(contexts, 1))
+    conn.executemany(
+        "INSERT INTO line_bits VALUES (?, ?, ?)",
+        [(f, c, _numbits(nums)) for f, c, nums in lines],
+    )
+    conn.executemany(
+        "INSERT INTO arc (file_id, context_id, fromno, tono) VALUES (?, ?, ?, ?)", arcs
+    )
+    conn.commit()
+    conn.close()
+
+
+@pytest.fixture
+def project(tmp_path):
+    """Return a package with two modules, its tests and their mirror map."""
+    pkg = tmp_path / "src" / "pkg"
+    tests = tmp_path / "tests"
+    mirror_map = MirrorMap.build(get_strategy("mirror"), ["a.py", "sub/b.py"])
+    return pkg, tests, mirror_map, {"test_a.py", "sub/test_b.py"}
+
+
+def test_mirror_coverage_from_line_bits(tmp_path, project):
+    """Lines are attributed to node-ID contexts of the mirrored test file."""
+    pkg, tests, mirror_map, existing = project
+    data = tmp_path / ".coverage"
+    _write_data(
+        data,
+        [str(pkg / "a.py"), str(pkg / "sub" / "b.py"), "/elsewhere/c.py"],
+        ["", "tests/test_a.py::test_x|run", "tests/sub/test_b.py::TestB::test_y|run"],
+        lines=[(1, 1, [1]), (1, 2, [2, 3]), (1, 3, [3, 4]), (2, 1, [1]), (3, 2, [9])],
+    )
+    assert mirror_coverage(data, pkg, tests, mirror_map, existing) == [
+        MirrorCoverage(pkg / "a.py", tests / "test_a.py", 2, 4),
+        MirrorCoverage(pkg / "sub" / "b.py", tests / "sub" / "test_b.py", 0, 1),
+    ]
+
+
+def test_mirror_coverage_from_arcs(tmp_path, project):
+    """Arcs count both ends once; dotted contexts and relative paths resolve."""
+    pkg, tests, mirror_map, existing = project
+    data = tmp_path / ".coverage"
+    _write_data(
+        data,
+        ["src/pkg/a.py"],
+        ["tests.test_a.test_x", "test_a.TestA.test_y"],
+        arcs=[(1, 1, -1, 1), (1, 1, 1, 2), (1, 1, 2, -1), (1, 2, 1, 5)],
+    )
+    [entry] = mirror_coverage(data, pkg, tests, mirror_map, existing)
+    assert (entry.test_lines, entry.suite_lines) == (3, 3)
+    assert entry.percent == 100.0
+    assert (
+        entry.format() == f"{pkg / 'a.py'}: 3/3 lines (100%) from {tests / 'test_a.py'}"
+    )
+
+
+def test_mirror_coverage_errors(tmp_path, project):
+    """Missing files, other databases and context-free data are rejected."""
+    pkg, tests, mirror_map, existing = project
+    with pytest.raises(FileNotFoundError):
+        mirror_coverage(tmp_path / "missing", pkg, tests, mirror_map, existing)
+
+    other = tmp_path / "other.db"
+    sqlite3.connect(other).close()
+    other.write_bytes(other.read_bytes() or b"not a database")
+    with pytest.raises(ValueError, match="not a coverage.py data file"):
+        mirror_coverage(other, pkg, tests, mirror_map, existing)
+
+    data = tmp_path / ".coverage"
+    _write_data(data, [str(pkg / "a.py")], [""], lines=[(1, 1, [1])])
+    with pytest.raises(ValueError, match="no test contexts"):
+        mirror_coverage(data, pkg, tests, mirror_map, existing)
@@ -0,0 +1,76 @@
+"""Unit tests for pytest_mirror.durations."""
+
+from pathlib import Path
+
+import pytest
+
+from pytest_mirror import durations
+from pytest_mirror.durations import (
+    DurationHistory,
+    ModuleDuration,
+    load_durations,
+    module_durations,
+)
+from pytest_mirror.mapping import MirrorMap, get_strategy
+
+
+def test_module_duration_format():
+    """The latest duration leads, followed by the trend when there is one."""
+    entry = ModuleDuration(Path("pkg/a.py"), (2.0, 2.5, 3.0))
+    assert entry.latest == 3.0
+    assert entry.change == 50.0
+    assert entry.format() == "pkg/a.py: 3.00s (2.00s -> 2.50s -> 3.00s, +50%)"
+    assert ModuleDuration(Path("pkg/b.py"), (0.5,)).format() == "pkg/b.py: 0.50s"
+    assert ModuleDuration(Path("pkg/c.py"), (0.0, 1.0)).change == 0.0
+
+
+def test_history_round_trip_and_trim(tmp_path, monkeypatch):
+    """Runs are saved, reloaded and trimmed to the most recent ones."""
+    monkeypatch.setattr(durations, "MAX_RECORDED_RUNS", 3)
+    history = DurationHistory(tmp_path)
+    for seconds in range(5):
+        history.record({"test_a.py": float(seconds)})
+    history.save()
+    assert DurationHistory(tmp_path).runs == [{"test_a.py": s} for s in (2.0, 3.0, 4.0)]
+
+    (tmp_path / durations.DURATIONS_CACHE_FILE_NAME).write_text('{"version": 0}')
+    assert DurationHistory(tmp_path).runs == []
+
+
+def test_history_per_module_trend(tmp_path):
+    """Each module's trend only holds the runs that included it."""
+    history = DurationHistory(tmp_path)
+    history.record({"test_a.py": 1.0, "test_b.py": 5.0})
+    history.record({"test_a.py": 2.0})
+    history.record({"test_a.py": 3.0})
+    assert history.history(runs=2) == {"test_a.py": [2.0, 3.0], "test_b.py": [5.0]}
+    assert history.latest() == {"test_a.py": 3.0, "test_b.py": 5.0}
+
+
+def test_load_durations_reads_latest(tmp_path):
+    """A saved history file yields each module's latest duration."""
+    history = DurationHistory(tmp_path)
+    history.record({"test_a.py": 1.0, "test_b.py": 5.0})
+    history.record({"test_a.py": 2.0})
+    history.save()
+    path = tmp_path / durations.DURATIONS_CACHE_FILE_NAME
+    assert load_durations(path) == {"test_a.py": 2.0, "test_b.py": 5.0}
+
+    path.write_text('{"version": 0}')
+    with pytest.raises(ValueError, match="not a pytest-mirror durations file"):
+        load_durations(path)
+    with pytest.raises(FileNotFoundError, match="does not exist"):
+        load_durations(tmp_path / "missing.json")
+
+
+def test_module_durations_slowest_first(tmp_path):
+    """Durations are attributed to modules; tests without a module are dropped."""
+    history = DurationHistory(tmp_path)
+    history.record({"test_a.py": 1.0, "test_b.py": 4.0, "test_gone.py": 9.0})
+    history.record({"test_a.py": 2.0})
+    mirror_map = MirrorMap.build(get_strategy("mirror"), ["a.py", "b.py"])
+    pkg = tmp_path / "pkg"
+    assert module_durations(history, pkg, mirror_map) == [
+        ModuleDuration(pkg / "b.py", (4.0,)),
+        ModuleDuration(pkg / "a.py", (1.0, 2.0)),
+    ]
@@ -65,7 +65,7 @@ def test_mirrorspecs_validate_test_structure_invocation():
     specs = hookspecs.MirrorSpecs()
     # Should raise NotImplementedError since it's a stub
     with pytest.raises(NotImplementedError):
-        specs.validate_test_structure(Path("foo"), Path("bar"))
+        specs.validate_test_structure(Path("foo"), Path("bar"), None, False, False)
 
 
 def test_mirrorspecs_class_instantiation():
@@ -100,3 +100,20 @@ def test_mirrorspecs_method_annotations():
 
     # Check that method is properly defined
     assert callable(method)
+
+
+def test_mirror_map_test_paths_is_firstresult():
+    """mirror_map_test_paths is a batched firstresult hook."""
+    method = hookspecs.MirrorSpecs.mirror_map_test_paths
+    params = list(inspect.signature(method).parameters)
+    assert params == ["self", "package_dir", "tests_dir", "source_paths"]
+    opts = method.pytest_mirror_spec
+    assert opts["firstresult"] is True
+
+
+def test_mirror_render_stubs_is_firstresult():
+    """mirror_render_stubs is a batched firstresult hook."""
+    method = hookspecs.MirrorSpecs.mirror_render_stubs
+    params = list(inspect.signature(method).parameters)
+    assert params == ["self", "package_dir", "source_paths", "stub_mode"]
+    assert method.pytest_mirror_spec["firstresult"] is True
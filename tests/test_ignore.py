@@ -0,0 +1,73 @@
+"""Unit tests for pytest_mirror.ignore gitignore matching."""
+
+import pytest
+
+from pytest_mirror.ignore import IgnoreRules, IgnoreScope, ancestor_scopes, is_ignored
+
+
+@pytest.mark.parametrize(
+    "pattern,path,is_dir,expected",
+    [
+        (".venv", ".venv", True, True),
+        (".venv", "pkg/.venv", True, True),
+        ("build/", "build", True, True),
+        ("build/", "build", False, None),
+        ("*.egg-info", "pkg/x.egg-info", True, True),
+        ("/htmlcov", "htmlcov", True, True),
+        ("/htmlcov", "pkg/htmlcov", True, None),
+        ("docs/_build", "docs/_build", True, True),
+        ("docs/_build", "pkg/docs/_build", True, None),
+        ("**/node_modules", "a/b/node_modules", True, True),
+        ("gen/**", "gen/x.py", False, True),
+        ("a/**/b", "a/x/y/b", True, True),
+        ("a/**/b", "a/b", True, True),
+        ("mod?.py", "mod1.py", False, True),
+        ("mod[0-9].py", "modx.py", False, None),
+        ("\\#notes", "#notes", False, True),
+    ],
+)
+def test_rules_match(pattern, path, is_dir, expected):
+    """Patterns follow gitignore anchoring, directory and glob semantics."""
+    rules = IgnoreRules([pattern])
+    name = path.rpartition("/")[2]
+    assert rules.match(path, name, is_dir) is expected
+
+
+def test_rules_skip_comments_and_blanks():
+    """Comments and blank lines produce no rules."""
+    assert not IgnoreRules(["# comment", "", "   "])
+
+
+def test_negation_last_match_wins():
+    """A later negated pattern re-includes a previously ignored path."""
+    rules = IgnoreRules(["*.py", "!keep.py"])
+    assert rules.match("drop.py", "drop.py", False) is True
+    assert rules.match("keep.py", "keep.py", False) is False
+
+
+def test_nested_scope_takes_precedence():
+    """Deeper .gitignore scopes override shallower ones."""
+    outer = IgnoreScope(IgnoreRules(["gen"]))
+    inner = IgnoreScope(IgnoreRules(["!gen"]), strip=len("sub/"))
+    assert is_ignored((outer,), "sub/gen", "gen", True) is True
+    assert is_ignored((outer, inner), "sub/gen", "gen", True) is False
+
+
+def test_ancestor_scopes_loads_git_root(tmp_path):
+    """Ancestor .gitignore files up to the git root are prefixed to the walk root."""
+    (tmp_path / ".git").mkdir()
+    (tmp_path / ".gitignore").write_text("/src/pkg/generated/\n")
+    root = tmp_path / "src" / "pkg"
+    root.mkdir(parents=True)
+    scopes = ancestor_scopes(root)
+    assert len(scopes) == 1
+    assert is_ignored(scopes, "generated", "generated", True) is True
+    assert is_ignored(scopes, "other", "other", True) is False
+
+
+def test_ancestor_scopes_outside_git(tmp_path):
+    """Outside a git work tree no ancestor files are consulted."""
+    (tmp_path / ".gitignore").write_text("pkg\n")
+    root = tmp_path / "pkg"
+    root.mkdir()
+    assert ancestor_scopes(root) == ()
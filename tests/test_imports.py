@@ -0,0 +1,122 @@
+"""Unit tests for pytest_mirror.imports."""
+
+import os
+
+import pytest
+
+from pytest_mirror import imports
+from pytest_mirror.imports import (
+    ImportCache,
+    extract_imports,
+    load_import_graph,
+    module_name,
+    parse_imports,
+)
+
+
+def _stats(package_dir):
+    """Return the stat data of every module below package_dir, in walk order."""
+    return {
+        path.relative_to(package_dir).as_posix(): path.stat()
+        for path in sorted(package_dir.rglob("*.py"))
+    }
+
+
+def _write(package_dir, files):
+    """Write modules below package_dir."""
+    for name, text in files.items():
+        path = package_dir / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(text)
+
+
+@pytest.fixture
+def package(tmp_path):
+    """Return a package where c imports b, b imports a and d imports nothing."""
+    pkg = tmp_path / "pkg"
+    _write(
+        pkg,
+        {
+            "__init__.py": "",
+            "a.py": "import os\n",
+            "sub/__init__.py": "",
+            "sub/b.py": "def f():\n    from ..a import x\n",
+            "c.py": "from pkg.sub import b\n",
+            "d.py": "import json\n",
+        },
+    )
+    return pkg
+
+
+def test_extract_imports():
+    """Plain, from, relative and nested imports are all reported."""
+    source = (
+        b"import a.b, c\n"
+        b"from d import e\n"
+        b"from d import *\n"
+        b"from . import f\n"
+        b"def g():\n"
+        b"    from ..h import i\n"
+    )
+    assert extract_imports(source) == ("a.b", "c", "d", "d.e", ".f", "..h", "..h.i")
+    assert extract_imports(b"def (") == ()
+
+
+def test_module_name():
+    """Packages are named after their directory."""
+    assert module_name("pkg", "__init__.py") == "pkg"
+    assert module_name("pkg", "sub/__init__.py") == "pkg.sub"
+    assert module_name("pkg", "sub/b.py") == "pkg.sub.b"
+
+
+def test_parse_imports_uses_cache(tmp_path):
+    """Contents seen before are not parsed again."""
+    module = tmp_path / "m.py"
+    module.write_text("import os\n")
+    cache = ImportCache(tmp_path / "cache")
+    assert parse_imports([module], cache, workers=1) == [("os",)]
+    cache.save()
+    reloaded = ImportCache(tmp_path / "cache")
+    assert len(reloaded) == 1
+    assert parse_imports([module], reloaded, workers=1) == [("os",)]
+
+
+def test_dependents_are_transitive(tmp_path, package):
+    """A change reaches importers of importers, and nothing else."""
+    graph = load_import_graph(package, _stats(package), tmp_path / "cache", 1)
+    assert graph.dependents(["a.py"]) == {"a.py", "sub/b.py", "c.py"}
+    assert graph.dependents(["c.py"]) == {"c.py"}
+    # Every import of pkg.sub.* runs the package's __init__ modules first.
+    assert graph.dependents(["__init__.py"]) == {"__init__.py", "sub/b.py", "c.py"}
+
+
+def test_unchanged_tree_reads_no_module(tmp_path, package, monkeypatch):
+    """A warm run on an unchanged tree only reads the graph cache."""
+    cache_dir = tmp_path / "cache"
+    load_import_graph(package, _stats(package), cache_dir, 1)
+
+    def fail(*args, **kwargs):
+        raise AssertionError("module parsed")
+
+    monkeypatch.setattr(imports, "parse_imports", fail)
+    graph = load_import_graph(package, _stats(package), cache_dir, 1)
+    assert graph.dependents(["a.py"]) == {"a.py", "sub/b.py", "c.py"}
+
+
+def test_graph_updates_changed_added_and_deleted_modules(tmp_path, package):
+    """Edits re-resolve their module; additions and deletions keep importers."""
+    cache_dir = tmp_path / "cache"
+    _write(package, {"e.py": "from pkg.sub import later\n"})
+    load_import_graph(package, _stats(package), cache_dir, 1)
+
+    _write(package, {"d.py": "from . import a\n", "sub/later.py": ""})
+    stats = _stats(package)
+    # Visible even where file-system timestamps are coarse.
+    os.utime(package / "d.py", ns=(0, stats["d.py"].st_mtime_ns + 1))
+    graph = load_import_graph(package, _stats(package), cache_dir, 1)
+    assert graph.dependents(["a.py"]) == {"a.py", "sub/b.py", "c.py", "d.py"}
+    assert graph.dependents(["sub/later.py"]) == {"sub/later.py", "e.py"}
+
+    (package / "sub" / "later.py").unlink()
+    graph = load_import_graph(package, _stats(package), cache_dir, 1)
+    assert graph.dependents(["sub/later.py"]) == {"sub/later.py", "e.py"}
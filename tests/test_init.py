@@ -27,16 +27,25 @@ class TestInitModule:
         """Test __all__ contains expected exports."""
         from pytest_mirror import __all__
 
-        expected = {"find_missing_tests", "generate_missing_tests"}
+        expected = {
+            "MirrorReport",
+            "build_import_graph",
+            "find_mirror_coverage",
+            "find_missing_tests",
+            "find_module_durations",
+            "find_untested_symbols",
+            "generate_missing_tests",
+            "prune_orphaned_tests",
+        }
         assert set(__all__) == expected
 
     def test_find_missing_tests_integration(self, tmp_path, project_structure):
         """Test find_missing_tests function."""
-        from pytest_mirror import find_missing_tests
+        from pytest_mirror import MirrorReport, find_missing_tests
 
         pkg, tests = project_structure(tmp_path)
         missing = find_missing_tests(pkg, tests)
-        assert isinstance(missing, list)
+        assert isinstance(missing, MirrorReport)
 
     def test_generate_missing_tests_integration(self, tmp_path, project_structure):
         """Test generate_missing_tests function."""
@@ -0,0 +1,62 @@
+"""Unit tests for pytest_mirror.layout package detection and caching."""
+
+import os
+
+from pytest_mirror import layout
+from pytest_mirror.layout import cached_package_dir, detect_package_dir
+
+
+def test_detect_package_dir_skips_tooling_dirs(tmp_path):
+    """VCS, virtualenv, build and test directories are never detected."""
+    for name in (".git", ".venv", "build", "node_modules", "tests", "x.egg-info"):
+        (tmp_path / name).mkdir()
+    (tmp_path / "aenv").mkdir()
+    (tmp_path / "aenv" / "pyvenv.cfg").write_text("")
+    assert detect_package_dir(tmp_path) == tmp_path
+
+    (tmp_path / "zpkg").mkdir()
+    assert detect_package_dir(tmp_path) == tmp_path / "zpkg"
+
+
+def test_detect_package_dir_prefers_src_and_packages(tmp_path):
+    """src/ wins over the root, and regular packages over plain directories."""
+    (tmp_path / "scripts").mkdir()
+    (tmp_path / "rootpkg").mkdir()
+    (tmp_path / "rootpkg" / "__init__.py").write_text("")
+    assert detect_package_dir(tmp_path) == tmp_path / "rootpkg"
+
+    (tmp_path / "src" / "assets").mkdir(parents=True)
+    (tmp_path / "src" / "mypkg").mkdir()
+    (tmp_path / "src" / "mypkg" / "__init__.py").write_text("")
+    assert detect_package_dir(tmp_path) == tmp_path / "src" / "mypkg"
+
+
+def test_cached_package_dir_invalidated_by_pyproject(tmp_path, monkeypatch):
+    """The cached layout is reused until pyproject.toml changes."""
+    cache_dir = tmp_path / ".cache"
+    pyproject = tmp_path / "pyproject.toml"
+    pyproject.write_text("")
+    (tmp_path / "b").mkdir()
+    assert cached_package_dir(tmp_path, cache_dir) == tmp_path / "b"
+
+    (tmp_path / "a").mkdir()
+    calls = []
+    real = layout.detect_package_dir
+    monkeypatch.setattr(
+        layout, "detect_package_dir", lambda root: calls.append(root) or real(root)
+    )
+    assert cached_package_dir(tmp_path, cache_dir) == tmp_path / "b"
+    assert calls == []
+
+    mtime = pyproject.stat().st_mtime_ns + 1_000_000_000
+    os.utime(pyproject, ns=(mtime, mtime))
+    assert cached_package_dir(tmp_path, cache_dir) == tmp_path / "a"
+    assert calls == [tmp_path]
+
+
+def test_cached_package_dir_root_fallback_not_cached(tmp_path):
+    """A project without candidates is detected again on the next run."""
+    cache_dir = tmp_path / ".cache"
+    assert cached_package_dir(tmp_path, cache_dir) == tmp_path
+    (tmp_path / "pkg").mkdir()
+    assert cached_package_dir(tmp_path, cache_dir) == tmp_path / "pkg"
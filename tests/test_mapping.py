@@ -0,0 +1,175 @@
+"""Unit tests for pytest_mirror.mapping strategies and MirrorMap."""
+
+import pytest
+
+from pytest_mirror.mapping import (
+    MirrorMap,
+    PackageStrategy,
+    get_strategy,
+    resolve_strategy,
+)
+
+
+@pytest.mark.parametrize(
+    "name,source,expected",
+    [
+        ("mirror", "foo.py", "test_foo.py"),
+        ("mirror", "sub/foo.py", "sub/test_foo.py"),
+        ("suffix", "sub/foo.py", "sub/foo_test.py"),
+        ("flat", "sub/deep/foo.py", "test_foo.py"),
+        ("package", "sub/foo.py", "sub/foo/test_foo.py"),
+        ("package", "foo.py", "foo/test_foo.py"),
+    ],
+)
+def test_named_strategies(name, source, expected):
+    """Named strategies map sources onto their conventional test paths."""
+    assert get_strategy(name).test_path(source) == expected
+
+
+def test_template_strategy():
+    """Template strategies format matched groups and skip unmatched sources."""
+    strategy = get_strategy(
+        {
+            "pattern": r"(?P<dir>.*/)?(?P<name>[^/_][^/]*)\.py",
+            "template": "{dir}{name}_spec.py",
+        }
+    )
+    assert strategy.test_path("a/foo.py") == "a/foo_spec.py"
+    assert strategy.test_path("foo.py") == "foo_spec.py"
+    assert strategy.test_path("a/_private.py") is None
+    positional = get_strategy({"pattern": r"(.*/)?(\w+)\.py", "template": "{}t_{}.py"})
+    assert positional.test_path("a/foo.py") == "a/t_foo.py"
+
+
+def test_get_strategy_errors():
+    """Unknown names, incomplete tables and bad patterns raise ValueError."""
+    with pytest.raises(ValueError, match="Unknown mapping strategy"):
+        get_strategy("nope")
+    with pytest.raises(ValueError, match="pattern"):
+        get_strategy({"template": "x"})
+    with pytest.raises(ValueError, match="Invalid mapping pattern"):
+        get_strategy({"pattern": "(", "template": "x"})
+    with pytest.raises(ValueError, match="Invalid mapping template"):
+        get_strategy({"pattern": "(.*)", "template": "{0"})
+
+
+@pytest.mark.parametrize(
+    "template,group",
+    [
+        ("{dir}{nme}_test.py", "nme"),
+        ("{2}_test.py", "2"),
+        ("{}{}{}_test.py", "2"),
+        ("{name.upper}{missing[0]}", "missing"),
+    ],
+)
+def test_template_strategy_unknown_group(template, group):
+    """Templates naming groups the pattern lacks fail when configured."""
+    pattern = r"(?P<dir>.*/)?(?P<name>[^/]+)\.py"
+    with pytest.raises(ValueError, match=f"has no group '{group}'"):
+        get_strategy({"pattern": pattern, "template": template})
+
+
+def test_mapping_strategy_requires_test_path():
+    """A strategy without ``test_path`` fails when instantiated."""
+    from pytest_mirror.mapping import MappingStrategy
+
+    class Incomplete(MappingStrategy):
+        name = "incomplete"
+
+    with pytest.raises(TypeError, match="test_path"):
+        Incomplete()
+
+
+def test_get_strategy_default_and_instance():
+    """None selects the mirror strategy; instances pass through."""
+    assert get_strategy(None).name == "mirror"
+    strategy = PackageStrategy()
+    assert get_strategy(strategy) is strategy
+
+
+def test_resolve_strategy_from_pyproject(tmp_path):
+    """Without an explicit strategy the nearest pyproject.toml decides."""
+    (tmp_path / "pyproject.toml").write_text('[tool.pytest-mirror]\nmapping = "flat"\n')
+    pkg = tmp_path / "src" / "pkg"
+    pkg.mkdir(parents=True)
+    assert resolve_strategy(None, pkg).name == "flat"
+    assert resolve_strategy("suffix", pkg).name == "suffix"
+
+
+def test_mirror_map_bidirectional_lookup():
+    """Forward and reverse lookups are dictionary hits."""
+    mirror_map = MirrorMap.build(get_strategy("mirror"), ["a.py", "sub/b.py"])
+    assert mirror_map.test_for("sub/b.py") == "sub/test_b.py"
+    assert mirror_map.source_for("sub/test_b.py") == "sub/b.py"
+    assert mirror_map.source_for("test_unknown.py") is None
+    assert mirror_map.missing({"test_a.py"}) == ["sub/test_b.py"]
+
+
+def test_mirror_map_package_strategy_any_test_counts():
+    """Any test_*.py in a module's test package covers the module."""
+    mirror_map = MirrorMap.build(get_strategy("package"), ["sub/mod.py", "other.py"])
+    assert mirror_map.source_for("sub/mod/test_edge_cases.py") == "sub/mod.py"
+    assert mirror_map.missing({"sub/mod/test_edge_cases.py"}) == ["other/test_other.py"]
+
+
+def test_mirror_map_flat_collisions_rejected():
+    """Sources sharing a test path are reported instead of merged."""
+    from pytest_mirror.mapping import MappingCollision
+
+    sources = ["a/util.py", "b/util.py", "c/util.py", "a/other.py"]
+    with pytest.raises(MappingCollision, match="flat") as excinfo:
+        MirrorMap.build(get_strategy("flat"), sources)
+    assert "test_util.py: a/util.py, b/util.py, c/util.py" in str(excinfo.value)
+    assert "a/other.py" not in str(excinfo.value)
+
+
+def test_mirror_map_orphans():
+    """Recognized test files without a mapped source are orphans."""
+    mirror_map = MirrorMap.build(get_strategy("mirror"), ["a.py"])
+    tests = {"test_a.py", "sub/test_gone.py", "conftest.py", "helpers.py"}
+    assert mirror_map.orphans(tests) == ["sub/test_gone.py"]
+
+
+def test_mirror_map_stale_uses_newest_test():
+    """A module is stale only if it changed after every test mirroring it."""
+    mirror_map = MirrorMap.build(get_strategy("package"), ["a.py", "b.py", "c.py"])
+    source_mtimes = {"a.py": 50, "b.py": 50, "c.py": 50}
+    test_mtimes = {"a/test_one.py": 10, "a/test_two.py": 60, "b/test_b.py": 20}
+    assert mirror_map.stale(source_mtimes, test_mtimes) == [("b.py", "b/test_b.py", 30)]
+
+
+def test_hook_strategy_none_without_impls():
+    """Without implementations the hook is not used."""
+    from pytest_mirror.mapping import hook_strategy
+    from pytest_mirror.plugin_manager import get_plugin_manager
+
+    pm = get_plugin_manager()
+    assert hook_strategy(pm.hook.mirror_map_test_paths, None, None) is None
+
+
+def test_hook_strategy_batches_and_falls_back():
+    """The hook receives every source at once; None defers to the fallback."""
+    from pytest_mirror.mapping import HookStrategy
+
+    calls = []
+
+    def call(sources):
+        calls.append(sources)
+        return [s.upper() for s in sources]
+
+    strategy = HookStrategy(call, get_strategy("package"))
+    assert strategy.map_paths(["a.py", "b.py"]) == ["A.PY", "B.PY"]
+    assert calls == [["a.py", "b.py"]]
+
+    deferring = HookStrategy(lambda sources: None, get_strategy("package"))
+    mirror_map = MirrorMap.build(deferring, ["m.py"])
+    assert mirror_map.source_for("m/test_other.py") == "m.py"
+
+
+def test_hook_strategy_length_mismatch():
+    """A hook returning the wrong number of paths is rejected."""
+    from pytest_mirror.mapping import HookStrategy
+
+    strategy = HookStrategy(lambda sources: [], get_strategy(None))
+    with pytest.raises(ValueError, match="returned 0 paths"):
+        strategy.map_paths(["a.py"])
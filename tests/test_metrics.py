@@ -0,0 +1,41 @@
+"""Unit tests for pytest_mirror.metrics export."""
+
+import json
+
+from pytest_mirror.metrics import render_openmetrics, write_metrics
+from pytest_mirror.profiling import COUNTER_MISSING, COUNTERS, PhaseProfile
+
+
+def _profile():
+    """Build a profile with one counter and two phases."""
+    profile = PhaseProfile()
+    profile.count(COUNTER_MISSING, 3)
+    profile.add("source walk", 0.25)
+    profile.add('hook "x"', 0.5)
+    return profile
+
+
+def test_render_openmetrics():
+    """Every counter is a gauge and phases are labelled samples."""
+    text = render_openmetrics(_profile())
+    lines = text.splitlines()
+    assert lines[-1] == "# EOF"
+    assert "# TYPE pytest_mirror_missing gauge" in lines
+    assert "pytest_mirror_missing 3" in lines
+    assert "pytest_mirror_generated 0" in lines
+    assert len([line for line in lines if line.startswith("# TYPE")]) == (
+        len(COUNTERS) + 2
+    )
+    assert 'pytest_mirror_phase_duration_seconds{phase="source walk"} 0.250000' in lines
+    assert 'pytest_mirror_phase_calls{phase="hook \\"x\\""} 1' in lines
+
+
+def test_write_metrics_format_by_suffix(tmp_path):
+    """A .json path gets JSON, anything else OpenMetrics, without temp files."""
+    profile = _profile()
+    write_metrics(tmp_path / "mirror.json", profile)
+    write_metrics(tmp_path / "mirror.prom", profile)
+    data = json.loads((tmp_path / "mirror.json").read_text())
+    assert data["counters"][COUNTER_MISSING] == 3
+    assert (tmp_path / "mirror.prom").read_text() == render_openmetrics(profile)
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["mirror.json", "mirror.prom"]
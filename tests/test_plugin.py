@@ -4,29 +4,43 @@ import pytest
 
 from pytest_mirror import plugin
 
-
-def test_get_auto_generate_config_true():
-    """Test _get_auto_generate_config returns True by default or for 'true'."""
+# Microseconds the plugin may add to pytest's own import time.
+PLUGIN_IMPORT_BUDGET_US = 40_000
+DEFERRED_MODULES = {
+    "pytest_mirror.core",
+    "pytest_mirror.mapping",
+    "pytest_mirror.plugin_manager",
+    "concurrent.futures.process",
+}
+
+
+def _auto_generate_config(tmp_path, table=None):
+    """Build a config mock rooted at a project with the given settings."""
     from unittest.mock import Mock
 
+    if table is not None:
+        (tmp_path / "pyproject.toml").write_text(f"[tool.pytest-mirror]\n{table}\n")
     cfg = Mock()
-    cfg.inicfg = {"tool.pytest-mirror.auto-generate": "true"}
+    cfg.rootpath = tmp_path
     cfg.getoption = lambda name: False
+    return cfg
+
+
+def test_get_auto_generate_config_true(tmp_path):
+    """Test _get_auto_generate_config returns True by default or for 'true'."""
+    cfg = _auto_generate_config(tmp_path / "a", None)
+    assert plugin._get_auto_generate_config(cfg) is True
+    (tmp_path / "b").mkdir()
+    cfg = _auto_generate_config(tmp_path / "b", 'auto-generate = "true"')
     assert plugin._get_auto_generate_config(cfg) is True
-    cfg2 = Mock()
-    cfg2.inicfg = {}
-    cfg2.getoption = lambda name: False
-    assert plugin._get_auto_generate_config(cfg2) is True
 
 
-def test_get_auto_generate_config_false():
+def test_get_auto_generate_config_false(tmp_path):
     """Test _get_auto_generate_config returns False for 'false', '0', 'no'."""
-    from unittest.mock import Mock
-
-    for val in ["false", "0", "no"]:
-        cfg = Mock()
-        cfg.inicfg = {"tool.pytest-mirror.auto-generate": val}
-        cfg.getoption = lambda name: False
+    for i, val in enumerate(['"false"', '"0"', '"no"', "false"]):
+        project = tmp_path / str(i)
+        project.mkdir()
+        cfg = _auto_generate_config(project, f"auto-generate = {val}")
         assert plugin._get_auto_generate_config(cfg) is False
 
 
@@ -54,15 +68,17 @@ def test_pytest_sessionstart_missing_tests_exit(monkeypatch, tmp_path):
 
     config = Mock()
     config.rootpath = tmp_path
-    config.getoption = lambda name: True
+    config.args = []
+    config.getoption = lambda name: name == "--mirror-no-generate"
     config.option = Mock(verbose=0)
     config.inicfg = {}
+    config.cache = None
     session = Mock()
     session.config = config
     pm = Mock()
     pm.hook.validate_test_structure.return_value = [[tmp_path / "tests" / "foo.py"]]
     pm.register = Mock()
-    monkeypatch.setattr(plugin, "get_plugin_manager", lambda: pm)
+    monkeypatch.setattr("pytest_mirror.plugin_manager.get_plugin_manager", lambda: pm)
     monkeypatch.setattr(plugin, "_get_auto_generate_config", lambda c: False)
     monkeypatch.setattr(
         "pytest.exit", lambda *a, **k: (_ for _ in ()).throw(SystemExit(1))
@@ -79,15 +95,17 @@ def test_pytest_sessionstart_no_missing_tests(monkeypatch, tmp_path, capsys):
 
     config = Mock()
     config.rootpath = tmp_path
+    config.args = []
     config.getoption = lambda name: False
     config.option = Mock(verbose=1)
     config.inicfg = {}
+    config.cache = None
     session = Mock()
     session.config = config
     pm = Mock()
     pm.hook.validate_test_structure.return_value = [[]]
     pm.register = Mock()
-    monkeypatch.setattr(plugin, "get_plugin_manager", lambda: pm)
+    monkeypatch.setattr("pytest_mirror.plugin_manager.get_plugin_manager", lambda: pm)
     monkeypatch.setattr(plugin, "_get_auto_generate_config", lambda c: True)
     plugin.pytest_sessionstart(session)
     out = capsys.readouterr().out
@@ -101,16 +119,18 @@ def test_pytest_sessionstart_verbose_debug(monkeypatch, tmp_path, capsys):
 
     config = Mock()
     config.rootpath = tmp_path
+    config.args = []
     config.getoption = lambda name: False
     config.option = Mock(verbose=1)
     config.inicfg = {}
+    config.cache = None
     session = Mock()
     session.config = config
     test_path = tmp_path / "tests" / "foo.py"
     pm = Mock()
     pm.hook.validate_test_structure.return_value = [[test_path]]
     pm.register = Mock()
-    monkeypatch.setattr(plugin, "get_plugin_manager", lambda: pm)
+    monkeypatch.setattr("pytest_mirror.plugin_manager.get_plugin_manager", lambda: pm)
     monkeypatch.setattr(plugin, "_get_auto_generate_config", lambda c: True)
     # Remove test file if it exists
     if test_path.exists():
@@ -127,16 +147,18 @@ def test_pytest_sessionstart_auto_generate_disabled(monkeypatch, tmp_path, capsy
 
     config = Mock()
     config.rootpath = tmp_path
+    config.args = []
     config.getoption = lambda name: False
     config.option = Mock(verbose=0)
     config.inicfg = {}
+    config.cache = None
     session = Mock()
     session.config = config
     test_path = tmp_path / "tests" / "foo.py"
     pm = Mock()
     pm.hook.validate_test_structure.return_value = [[test_path]]
     pm.register = Mock()
-    monkeypatch.setattr(plugin, "get_plugin_manager", lambda: pm)
+    monkeypatch.setattr("pytest_mirror.plugin_manager.get_plugin_manager", lambda: pm)
     monkeypatch.setattr(plugin, "_get_auto_generate_config", lambda c: False)
     monkeypatch.setattr(
         "pytest.exit", lambda *a, **k: (_ for _ in ()).throw(SystemExit(1))
@@ -149,26 +171,21 @@ def test_pytest_sessionstart_auto_generate_disabled(monkeypatch, tmp_path, capsy
     assert "Missing tests detected" in out
 
 
-def test_get_auto_generate_config_exception(monkeypatch):
-    """Test _get_auto_generate_config returns True on exception."""
-    from unittest.mock import Mock, PropertyMock
-
-    cfg = Mock()
-    type(cfg).inicfg = PropertyMock(side_effect=RuntimeError("fail"))
+def test_get_auto_generate_config_malformed_pyproject(tmp_path):
+    """Test _get_auto_generate_config returns True for an unreadable pyproject."""
+    cfg = _auto_generate_config(tmp_path)
+    (tmp_path / "pyproject.toml").write_text("[tool.pytest-mirror\n")
     assert plugin._get_auto_generate_config(cfg) is True
 
 
-def test_get_auto_generate_config_disable(monkeypatch):
+def test_get_auto_generate_config_disable(tmp_path):
     """Test _get_auto_generate_config returns False if disable-auto-generate is set true/1/yes."""
-    from unittest.mock import Mock
-
-    for val in ["true", "1", "yes"]:
-        cfg = Mock()
-        cfg.inicfg = {"tool.pytest-mirror.disable-auto-generate": val}
-        cfg.getoption = lambda name: False
-        from pytest_mirror import plugin as plugin_mod
-
-        assert plugin_mod._get_auto_generate_config(cfg) is False
+    for i, val in enumerate(['"true"', '"1"', '"yes"', "true"]):
+        project = tmp_path / str(i)
+        project.mkdir()
+        table = f"auto-generate = true\ndisable-auto-generate = {val}"
+        cfg = _auto_generate_config(project, table)
+        assert plugin._get_auto_generate_config(cfg) is False
 
 
 class TestPluginEdgeCases:
@@ -239,7 +256,13 @@ class TestPluginEdgeCases:
         (pkg / "foo.py").write_text("# module\n")
 
         # Execute the hook
-        results = pm.hook.validate_test_structure(package_dir=pkg, tests_dir=tests)
+        results = pm.hook.validate_test_structure(
+            package_dir=pkg,
+            tests_dir=tests,
+            test_files=None,
+            stale=False,
+            placeholders=False,
+        )
 
         # Should return list of lists (one per registered plugin)
         assert isinstance(results, list)
@@ -301,8 +324,10 @@ class TestPluginIntegration:
 
         missing = missing_factory(tmp_path)
         # Patch get_plugin_manager to return DummyPM
-        monkeypatch.setattr(plugin, "get_plugin_manager", lambda: self.DummyPM(missing))
-        monkeypatch.setattr(plugin, "MirrorValidator", object)
+        monkeypatch.setattr(
+            "pytest_mirror.plugin_manager.get_plugin_manager",
+            lambda: self.DummyPM(missing),
+        )
         # Patch only the project root Path
         monkeypatch.setattr(plugin, "Path", Path)
         # Patch _get_auto_generate_config
@@ -310,8 +335,10 @@ class TestPluginIntegration:
         # Use Mock for config and session to satisfy type checkers
         config = Mock()
         config.inicfg = {}
+        config.cache = None
         config._opts = {"--mirror-no-generate": flag}
         config.rootpath = tmp_path
+        config.args = []
         config.getoption = lambda name: config._opts.get(name, False)
         # Set verbose=1 if we expect 'Created' in output, else 0
         expect_created = bool(missing and not should_exit)
@@ -367,19 +394,851 @@ class TestPluginIntegration:
         parser.getgroup.assert_called_with("pytest-mirror")
         group.addoption.assert_called()
 
-    def test_get_auto_generate_config_false_cases(self):
-        """Test _get_auto_generate_config with various false-like values and exceptions."""
-        from unittest.mock import Mock, PropertyMock
+    def test_get_auto_generate_config_false_cases(self, tmp_path):
+        """Test _get_auto_generate_config follows edits to pyproject.toml."""
+        import os
 
-        cfg = Mock()
-        cfg.inicfg = {"tool.pytest-mirror.auto-generate": "false"}
-        cfg.getoption = lambda name: False
-        assert plugin._get_auto_generate_config(cfg) is False
-        cfg.inicfg = {"tool.pytest-mirror.auto-generate": "0"}
+        cfg = _auto_generate_config(tmp_path, 'auto-generate = "false"')
         assert plugin._get_auto_generate_config(cfg) is False
-        cfg.inicfg = {"tool.pytest-mirror.auto-generate": "no"}
-        assert plugin._get_auto_generate_config(cfg) is False
-        # Exception path
-        bad_cfg = Mock()
-        type(bad_cfg).inicfg = PropertyMock(side_effect=RuntimeError("fail"))
-        assert plugin._get_auto_generate_config(bad_cfg) is True
+        pyproject = tmp_path / "pyproject.toml"
+        pyproject.write_text('[tool.pytest-mirror]\nauto-generate = "yes"\n')
+        mtime = pyproject.stat().st_mtime_ns + 1_000_000_000
+        os.utime(pyproject, ns=(mtime, mtime))
+        assert plugin._get_auto_generate_config(cfg) is True
+
+
+def test_check_symbols_exits_on_untested(tmp_path, capsys, monkeypatch):
+    """--mirror-symbols fails the session when a public symbol lacks a test."""
+    from unittest.mock import Mock
+
+    pkg = tmp_path / "pkg"
+    tests = tmp_path / "tests"
+    pkg.mkdir()
+    tests.mkdir()
+    (pkg / "foo.py").write_text("def load(): ...\n")
+    config = Mock()
+    config.cache = None
+    monkeypatch.setattr(
+        "pytest.exit", lambda *a, **k: (_ for _ in ()).throw(SystemExit(1))
+    )
+    with pytest.raises(SystemExit):
+        plugin._check_symbols(config, pkg, tests, tmp_path)
+    assert "foo.py: load" in capsys.readouterr().out
+
+
+def _collection_config(tmp_path, args, opts=None):
+    """Build a config mock for collection-based validation."""
+    from unittest.mock import Mock
+
+    opts = opts or {}
+    config = Mock()
+    config.args = args
+    config.invocation_params.dir = tmp_path
+    config.getoption = lambda name: opts.get(name)
+    config.stash = pytest.Stash()
+    return config
+
+
+def test_collected_test_files_relative_to_tests_dir(tmp_path):
+    """Collected files under tests_dir replace the walk when args cover it."""
+    tests = tmp_path / "tests"
+    collected = {tests / "test_a.py", tests / "sub" / "test_b.py", tmp_path / "x.py"}
+    config = _collection_config(tmp_path, ["tests"])
+    files = plugin._collected_test_files(config, collected, tests)
+    assert sorted(files) == ["sub/test_b.py", "test_a.py"]
+
+
+def test_collected_test_files_ignore_falls_back(tmp_path):
+    """Collections narrowed by --ignore fall back to walking tests_dir."""
+    config = _collection_config(tmp_path, ["tests"], {"ignore": ["tests/sub"]})
+    assert plugin._collected_test_files(config, set(), tmp_path / "tests") is None
+
+
+def test_collected_test_files_pruned_inside_falls_back(tmp_path):
+    """Directories pruned inside tests_dir leave their tests uncollected."""
+    tests = tmp_path / "tests"
+    config = _collection_config(tmp_path, ["tests"])
+    config.stash[plugin.PRUNED_PATHS_KEY] = {tmp_path / "docs"}
+    assert plugin._collected_test_files(config, set(), tests) == []
+    config.stash[plugin.PRUNED_PATHS_KEY].add(tests / "unit")
+    assert plugin._collected_test_files(config, set(), tests) is None
+
+
+@pytest.mark.parametrize("args", [["tests/sub"], ["tests/test_a.py"], []])
+def test_collected_test_files_partial_arguments_fall_back(tmp_path, args):
+    """Arguments narrower than tests_dir leave the rest of it uncollected."""
+    (tmp_path / "tests" / "sub").mkdir(parents=True)
+    config = _collection_config(tmp_path, args)
+    assert plugin._collected_test_files(config, set(), tmp_path / "tests") is None
+
+
+@pytest.mark.parametrize(
+    "opts,hookimpls",
+    [({"--mirror-full": True}, []), ({}, [object()])],
+    ids=["mirror-full", "custom-mapping"],
+)
+def test_from_collection_walks_unscoped_targets(tmp_path, opts, hookimpls):
+    """A whole-tree target under a scoped invocation is walked, not collected."""
+    from unittest.mock import Mock
+
+    pkg = tmp_path / "pkg"
+    tests = tmp_path / "tests"
+    for name in ("sub", "unit"):
+        (pkg / name).mkdir(parents=True)
+        (pkg / name / "x.py").write_text("")
+        (tests / name).mkdir(parents=True)
+        (tests / name / "test_x.py").write_text("")
+    pm = Mock()
+    pm.hook.mirror_map_test_paths.get_hookimpls.return_value = hookimpls
+    pm.hook.validate_test_structure.return_value = []
+    config = _collection_config(tmp_path, ["tests/sub"], opts)
+    targets = plugin._validation_targets(config, pm, pkg, tests)
+    assert targets == [(pkg, tests)]
+
+    plugin._find_missing(config, pm, targets, {tests / "sub" / "test_x.py"})
+    call = pm.hook.validate_test_structure.call_args
+    assert call.kwargs["test_files"] is None
+
+
+def test_invocation_scopes(tmp_path):
+    """Directory arguments inside tests_dir become scopes; file arguments do not."""
+    tests = tmp_path / "tests"
+    (tests / "unit" / "sub").mkdir(parents=True)
+    (tests / "api").mkdir()
+    (tests / "unit" / "test_a.py").write_text("")
+    args = ["tests/unit", "tests/unit/sub", "tests/api::x", "tests/unit/test_a.py"]
+    config = _collection_config(tmp_path, args)
+    assert plugin._invocation_scopes(config, tests) == ["api", "unit"]
+    assert plugin._invocation_scopes(_collection_config(tmp_path, ["."]), tests) is None
+    assert (
+        plugin._invocation_scopes(_collection_config(tmp_path, ["docs"]), tests) == []
+    )
+
+
+@pytest.mark.parametrize(
+    "opts,args,expected",
+    [
+        ({"collectonly": True}, ["tests"], []),
+        ({"lf": True}, ["tests"], []),
+        ({"lf": True, "--mirror-full": True}, ["tests/a"], [("pkg", "tests")]),
+        ({}, ["tests"], [("pkg", "tests")]),
+        ({}, ["tests/a", "tests/b"], [("pkg/a", "tests/a")]),
+        ({}, ["tests/a/test_x.py"], []),
+    ],
+)
+def test_validation_targets(tmp_path, opts, args, expected):
+    """Invocation modes and path arguments decide which subtrees are validated."""
+    from unittest.mock import Mock
+
+    (tmp_path / "pkg" / "a").mkdir(parents=True)
+    for name in ("a", "b"):
+        (tmp_path / "tests" / name).mkdir(parents=True)
+    (tmp_path / "tests" / "a" / "test_x.py").write_text("")
+    pm = Mock()
+    pm.hook.mirror_map_test_paths.get_hookimpls.return_value = []
+    config = _collection_config(tmp_path, args, opts)
+    targets = plugin._validation_targets(
+        config, pm, tmp_path / "pkg", tmp_path / "tests"
+    )
+    assert targets == [(tmp_path / p, tmp_path / t) for p, t in expected]
+
+
+@pytest.mark.parametrize(
+    "opts,args",
+    [
+        ({"collectonly": True}, ["tests"]),
+        ({"lf": True}, ["tests"]),
+        ({"--mirror-background": True}, ["tests/test_a.py"]),
+        ({"--mirror-from-collection": True}, ["tests/test_a.py::test_x"]),
+    ],
+)
+def test_sessionstart_skips_setup_without_targets(tmp_path, monkeypatch, opts, args):
+    """Runs that validate nothing never detect the package or load plugins."""
+    from unittest.mock import Mock
+
+    (tmp_path / "tests").mkdir()
+    monkeypatch.setattr(plugin, "_prepare", Mock(side_effect=AssertionError))
+    config = _collection_config(tmp_path, args, opts)
+    config.rootpath = tmp_path
+    plugin.pytest_sessionstart(Mock(config=config))
+    assert plugin.BACKGROUND_KEY not in config.stash
+    assert plugin.COLLECTED_FILES_KEY not in config.stash
+
+
+def test_validation_targets_unscoped_for_custom_mapping(tmp_path):
+    """Scoping is disabled when a plugin maps paths itself."""
+    from unittest.mock import Mock
+
+    (tmp_path / "pkg" / "a").mkdir(parents=True)
+    (tmp_path / "tests" / "a").mkdir(parents=True)
+    pm = Mock()
+    pm.hook.mirror_map_test_paths.get_hookimpls.return_value = [object()]
+    config = _collection_config(tmp_path, ["tests/a"])
+    targets = plugin._validation_targets(
+        config, pm, tmp_path / "pkg", tmp_path / "tests"
+    )
+    assert targets == [(tmp_path / "pkg", tmp_path / "tests")]
+
+
+def test_from_collection_validates_after_collection(tmp_path, monkeypatch):
+    """--mirror-from-collection defers validation to pytest_collection_finish."""
+    from unittest.mock import Mock
+
+    pkg = tmp_path / "pkg"
+    tests = tmp_path / "tests"
+    (pkg / "sub").mkdir(parents=True)
+    (pkg / "a.py").write_text("")
+    (pkg / "sub" / "b.py").write_text("")
+    tests.mkdir()
+    # Exists on disk but was not collected: collection is the source of truth.
+    (tests / "test_a.py").write_text("")
+
+    opts = {
+        "--mirror-package-dir": str(pkg),
+        "--mirror-tests-dir": str(tests),
+        "--mirror-from-collection": True,
+        "--mirror-no-generate": True,
+    }
+    config = _collection_config(tmp_path, [str(tests)], opts)
+    config.rootpath = tmp_path
+    config.option = Mock(verbose=0)
+    config.stash = pytest.Stash()
+    session = Mock(config=config)
+    monkeypatch.setattr(
+        plugin,
+        "_handle_missing_tests",
+        lambda missing, auto, cfg: calls.append(missing),
+    )
+    calls = []
+
+    plugin.pytest_sessionstart(session)
+    assert calls == []
+    plugin.pytest_collect_file(tests / "sub" / "test_b.py", Mock(config=config))
+    plugin.pytest_collect_file(tests / "data.txt", Mock(config=config))
+    plugin.pytest_collection_finish(session)
+    assert calls == [[tests / "test_a.py"]]
+
+
+HOOK_IGNORING_UNIT = """\
+def pytest_ignore_collect(collection_path, config):
+    if collection_path.name == "unit":
+        return True
+"""
+
+
+def _background_config(tmp_path, opts):
+    """Build a config mock for background validation."""
+    from unittest.mock import Mock
+
+    config = _collection_config(tmp_path, [], opts)
+    config.rootpath = tmp_path
+    config.option = Mock(verbose=0)
+    config.stash = pytest.Stash()
+    config.cache = None
+    return config
+
+
+def test_background_validation_joined_after_collection(tmp_path, monkeypatch):
+    """Background results are applied once collection has finished."""
+    from unittest.mock import Mock
+
+    pkg = tmp_path / "pkg"
+    pkg.mkdir()
+    (pkg / "a.py").write_text("")
+    opts = {
+        "--mirror-package-dir": str(pkg),
+        "--mirror-tests-dir": str(tmp_path / "tests"),
+        "--mirror-background": True,
+        "--mirror-no-generate": True,
+    }
+    config = _background_config(tmp_path, opts)
+    session = Mock(config=config)
+    monkeypatch.setattr(
+        "pytest.exit", lambda *a, **k: (_ for _ in ()).throw(SystemExit(1))
+    )
+
+    plugin.pytest_sessionstart(session)
+    assert plugin.BACKGROUND_KEY in config.stash
+    with pytest.raises(SystemExit):
+        plugin.pytest_collection_finish(session)
+    assert plugin.BACKGROUND_KEY not in config.stash
+
+
+def test_background_validation_over_budget(tmp_path, monkeypatch):
+    """A result that misses the budget fails the session and is summarized."""
+    import threading
+    from unittest.mock import Mock
+
+    release = threading.Event()
+    missing = [tmp_path / "tests" / "test_a.py"]
+
+    def slow_find_missing(*args):
+        release.wait()
+        return missing
+
+    monkeypatch.setattr(plugin, "_find_missing", slow_find_missing)
+    monkeypatch.setattr(plugin, "_get_auto_generate_config", lambda c: False)
+    opts = {"--mirror-background": True, "--mirror-budget": 0.0}
+    config = _background_config(tmp_path, opts)
+    session = Mock(config=config, exitstatus=0)
+
+    plugin.pytest_sessionstart(session)
+    plugin.pytest_collection_finish(session)
+    assert plugin.BACKGROUND_KEY in config.stash
+    release.set()
+    plugin.pytest_sessionfinish(session)
+    assert session.exitstatus == pytest.ExitCode.TESTS_FAILED
+
+    reporter = Mock()
+    plugin.pytest_terminal_summary(reporter, config)
+    lines = [call.args[0] for call in reporter.write_line.call_args_list]
+    assert lines == [
+        "Validation exceeded the 0.0s budget; result:",
+        plugin.MISSING_TESTS_MESSAGE,
+        f"  - {missing[0]}",
+    ]
+
+
+@pytest.mark.parametrize("missing,returncode", [(False, 0), (True, 1)])
+def test_mirror_only_exits_before_collection(
+    tmp_path, monkeypatch, missing, returncode
+):
+    """--mirror-only ends the session after validation with its status."""
+    from unittest.mock import Mock
+
+    pkg = tmp_path / "pkg"
+    tests = tmp_path / "tests"
+    pkg.mkdir()
+    tests.mkdir()
+    (pkg / "a.py").write_text("")
+    if not missing:
+        (tests / "test_a.py").write_text("")
+    opts = {
+        "--mirror-package-dir": str(pkg),
+        "--mirror-tests-dir": str(tests),
+        "--mirror-only": True,
+        "--mirror-no-generate": True,
+    }
+    config = _background_config(tmp_path, opts)
+
+    def fake_exit(msg, returncode):
+        raise SystemExit(returncode)
+
+    monkeypatch.setattr("pytest.exit", fake_exit)
+    with pytest.raises(SystemExit) as exc_info:
+        plugin.pytest_sessionstart(Mock(config=config))
+    assert exc_info.value.code == returncode
+
+
+def test_mirror_profile_in_terminal_summary(tmp_path, monkeypatch):
+    """--mirror-profile records phases and reports them after the session."""
+    import json
+    from unittest.mock import Mock
+
+    from pytest_mirror import profiling
+
+    pkg = tmp_path / "pkg"
+    tests = tmp_path / "tests"
+    pkg.mkdir()
+    tests.mkdir()
+    (pkg / "a.py").write_text("")
+    (tests / "test_a.py").write_text("")
+    json_path = tmp_path / "profile.json"
+    opts = {
+        "--mirror-package-dir": str(pkg),
+        "--mirror-tests-dir": str(tests),
+        "--mirror-profile": True,
+        "--mirror-profile-json": str(json_path),
+    }
+    config = _background_config(tmp_path, opts)
+    monkeypatch.setattr(plugin, "_get_auto_generate_config", lambda c: False)
+
+    plugin.pytest_sessionstart(Mock(config=config))
+    profile = config.stash[plugin.PROFILE_KEY]
+    assert profiling.active() is profile
+
+    reporter = Mock()
+    plugin.pytest_terminal_summary(reporter, config)
+    plugin.pytest_unconfigure(config)
+    assert profiling.active() is None
+
+    reporter.write_sep.assert_called_with("-", plugin.PROFILE_SECTION_TITLE)
+    phases = json.loads(json_path.read_text())["phases"]
+    for name in (
+        profiling.PHASE_PATH_RESOLUTION,
+        profiling.PHASE_PLUGIN_MANAGER,
+        profiling.PHASE_SOURCE_WALK,
+        profiling.PHASE_TESTS_WALK,
+        "hook validate_test_structure [mirror_validator]",
+    ):
+        assert name in phases
+
+
+def test_mirror_metrics_written_at_unconfigure(tmp_path, monkeypatch):
+    """--mirror-metrics writes the run's counters when pytest shuts down."""
+    import json
+    from unittest.mock import Mock
+
+    from pytest_mirror import profiling
+
+    pkg = tmp_path / "pkg"
+    tests = tmp_path / "tests"
+    (pkg / "ignored").mkdir(parents=True)
+    tests.mkdir()
+    (pkg / ".gitignore").write_text("ignored/\n")
+    (pkg / "a.py").write_text("")
+    (pkg / "b.py").write_text("")
+    (tests / "test_a.py").write_text("")
+    metrics_path = tmp_path / "mirror.json"
+    opts = {
+        "--mirror-package-dir": str(pkg),
+        "--mirror-tests-dir": str(tests),
+        "--mirror-metrics": str(metrics_path),
+    }
+    config = _background_config(tmp_path, opts)
+    monkeypatch.setattr(plugin, "_get_auto_generate_config", lambda c: True)
+
+    plugin.pytest_sessionstart(Mock(config=config))
+    plugin.pytest_unconfigure(config)
+    assert profiling.active() is None
+    assert json.loads(metrics_path.read_text())["counters"] == {
+        "modules_scanned": 2,
+        "tests_found": 1,
+        "missing": 1,
+        "generated": 1,
+        "dirs_pruned": 1,
+    }
+
+
+def test_plugin_import_time_budget():
+    """Loading the plugin defers validation code and stays within budget."""
+    import os
+    import subprocess
+    import sys
+    from pathlib import Path
+
+    src = str(Path(plugin.__file__).parents[1])
+    pythonpath = [src, os.environ.get("PYTHONPATH", "")]
+    result = subprocess.run(
+        [
+            sys.executable,
+            "-X",
+            "importtime",
+            "-c",
+            "import pytest; import pytest_mirror.plugin",
+        ],
+        capture_output=True,
+        text=True,
+        check=True,
+        env={**os.environ, "PYTHONPATH": os.pathsep.join(filter(None, pythonpath))},
+    )
+    rows = [
+        line.removeprefix("import time:").split("|")
+        for line in result.stderr.splitlines()
+        if line.startswith("import time:") and "cumulative" not in line
+    ]
+    # pytest is imported first; everything after it is the plugin's cost.
+    start = next(i for i, (_, _, name) in enumerate(rows) if name == " pytest")
+    plugin_rows = rows[start + 1 :]
+    assert not {name.strip() for _, _, name in plugin_rows} & DEFERRED_MODULES
+    cost = sum(
+        int(cumulative)
+        for _, cumulative, name in plugin_rows
+        if not name.startswith("  ")
+    )
+    assert cost < PLUGIN_IMPORT_BUDGET_US
+
+
+def test_file_limit_exits_with_message(tmp_path, monkeypatch):
+    """Hitting the file ceiling ends the session with the walker's message."""
+    from unittest.mock import Mock
+
+    (tmp_path / "pyproject.toml").write_text("[tool.pytest-mirror]\nmax-files = 1\n")
+    pkg = tmp_path / "pkg"
+    pkg.mkdir()
+    (pkg / "a.py").write_text("")
+    (pkg / "b.py").write_text("")
+    opts = {
+        "--mirror-package-dir": str(pkg),
+        "--mirror-tests-dir": str(tmp_path / "tests"),
+    }
+    config = _background_config(tmp_path, opts)
+
+    def fake_exit(msg, returncode):
+        raise SystemExit(msg)
+
+    monkeypatch.setattr("pytest.exit", fake_exit)
+    with pytest.raises(SystemExit, match="more than 1 files"):
+        plugin.pytest_sessionstart(Mock(config=config))
+
+
+def test_mapping_collision_exits_with_message(tmp_path, monkeypatch):
+    """Modules mapped onto one test file end the session instead of merging."""
+    from unittest.mock import Mock
+
+    (tmp_path / "pyproject.toml").write_text('[tool.pytest-mirror]\nmapping = "flat"\n')
+    pkg = tmp_path / "pkg"
+    for name in ("a", "b"):
+        (pkg / name).mkdir(parents=True)
+        (pkg / name / "util.py").write_text("")
+    opts = {
+        "--mirror-package-dir": str(pkg),
+        "--mirror-tests-dir": str(tmp_path / "tests"),
+    }
+    config = _background_config(tmp_path, opts)
+
+    def fake_exit(msg, returncode):
+        raise SystemExit(msg)
+
+    monkeypatch.setattr("pytest.exit", fake_exit)
+    with pytest.raises(SystemExit, match="test_util.py: a/util.py, b/util.py"):
+        plugin.pytest_sessionstart(Mock(config=config))
+
+
+def test_auto_detected_package_dir_is_cached(tmp_path, monkeypatch):
+    """Auto-detection skips tooling directories and caches its result."""
+    from unittest.mock import Mock
+
+    monkeypatch.delenv("PYTEST_MIRROR_PACKAGE_DIR", raising=False)
+    (tmp_path / ".venv").mkdir()
+    (tmp_path / "src" / "pkg").mkdir(parents=True)
+    config = Mock()
+    config.getoption = lambda name: None
+    config.cache = None
+    assert plugin._resolve_package_dir(config, tmp_path) == tmp_path / "src" / "pkg"
+    assert (plugin._get_cache_dir(config, tmp_path) / "layout.json").is_file()
+
+
+def test_directories_and_symbols_from_pyproject(tmp_path, monkeypatch):
+    """The plugin reads the same [tool.pytest-mirror] keys as the CLI."""
+    from unittest.mock import Mock
+
+    monkeypatch.delenv("PYTEST_MIRROR_PACKAGE_DIR", raising=False)
+    monkeypatch.delenv("PYTEST_MIRROR_TESTS_DIR", raising=False)
+    (tmp_path / "pyproject.toml").write_text(
+        '[tool.pytest-mirror]\npackage-dir = "lib/pkg"\n'
+        'tests-dir = "checks"\nsymbols = true\n'
+    )
+    config = Mock()
+    config.rootpath = tmp_path
+    config.getoption = lambda name: None
+    assert plugin._resolve_package_dir(config, tmp_path) == tmp_path / "lib" / "pkg"
+    assert plugin._resolve_tests_dir(config, tmp_path) == tmp_path / "checks"
+    assert plugin._symbols_enabled(config) is True
+
+
+def test_mirror_stale_in_terminal_summary(tmp_path, monkeypatch):
+    """--mirror-stale lists modules changed after their tests, most stale first."""
+    import os
+    from unittest.mock import Mock
+
+    pkg = tmp_path / "pkg"
+    tests = tmp_path / "tests"
+    pkg.mkdir()
+    tests.mkdir()
+    for name, source_time, test_time in (("a", 2_000, 1_000), ("b", 5_000, 1_000)):
+        (pkg / f"{name}.py").write_text("")
+        (tests / f"test_{name}.py").write_text("")
+        os.utime(pkg / f"{name}.py", (source_time, source_time))
+        os.utime(tests / f"test_{name}.py", (test_time, test_time))
+    opts = {
+        "--mirror-package-dir": str(pkg),
+        "--mirror-tests-dir": str(tests),
+        "--mirror-stale": True,
+    }
+    config = _background_config(tmp_path, opts)
+    monkeypatch.setattr(plugin, "_get_auto_generate_config", lambda c: False)
+
+    plugin.pytest_sessionstart(Mock(config=config))
+    reporter = Mock()
+    plugin.pytest_terminal_summary(reporter, config)
+
+    reporter.write_sep.assert_called_with("-", plugin.STALE_SECTION_TITLE)
+    lines = [call.args[0] for call in reporter.write_line.call_args_list]
+    assert lines == [
+        f"{pkg / 'b.py'} is 1.1h newer than {tests / 'test_b.py'}",
+        f"{pkg / 'a.py'} is 16.7m newer than {tests / 'test_a.py'}",
+    ]
+
+
+def test_mirror_placeholders_in_terminal_summary(tmp_path, monkeypatch):
+    """--mirror-placeholders lists stubs nobody has filled in yet."""
+    from unittest.mock import Mock
+
+    from pytest_mirror.stubs import DEFAULT_TEST_CONTENT
+
+    pkg = tmp_path / "pkg"
+    tests = tmp_path / "tests"
+    pkg.mkdir()
+    tests.mkdir()
+    (pkg / "a.py").write_text("")
+    (pkg / "b.py").write_text("")
+    (tests / "test_a.py").write_text(DEFAULT_TEST_CONTENT)
+    (tests / "test_b.py").write_text("def test_b():\n    assert True\n")
+    opts = {
+        "--mirror-package-dir": str(pkg),
+        "--mirror-tests-dir": str(tests),
+        "--mirror-placeholders": True,
+    }
+    config = _background_config(tmp_path, opts)
+    monkeypatch.setattr(plugin, "_get_auto_generate_config", lambda c: False)
+
+    plugin.pytest_sessionstart(Mock(config=config))
+    reporter = Mock()
+    plugin.pytest_terminal_summary(reporter, config)
+
+    reporter.write_sep.assert_called_with("-", plugin.PLACEHOLDERS_SECTION_TITLE)
+    lines = [call.args[0] for call in reporter.write_line.call_args_list]
+    assert lines == [str(tests / "test_a.py")]
+
+
+def test_mirror_changed_deselects_unmirrored_tests(tmp_path):
+    """--mirror-changed keeps only the tests of the named modules."""
+    from types import SimpleNamespace
+
+    pkg = tmp_path / "pkg"
+    tests = tmp_path / "tests"
+    opts = {
+        "--mirror-package-dir": str(pkg),
+        "--mirror-tests-dir": str(tests),
+        "--mirror-changed": ["pkg/a.py"],
+    }
+    config = _background_config(tmp_path, opts)
+    items = [
+        SimpleNamespace(path=tests / "test_a.py"),
+        SimpleNamespace(path=tests / "test_b.py"),
+    ]
+    kept = items[0]
+
+    plugin.pytest_collection_modifyitems(config, items)
+
+    assert items == [kept]
+    config.hook.pytest_deselected.assert_called_once()
+
+
+def test_mirror_changed_conftest_keeps_every_test(tmp_path):
+    """A changed conftest.py may affect any test below it, so none is dropped."""
+    from types import SimpleNamespace
+
+    tests = tmp_path / "tests"
+    opts = {
+        "--mirror-package-dir": str(tmp_path / "pkg"),
+        "--mirror-tests-dir": str(tests),
+        "--mirror-changed": ["tests/conftest.py"],
+    }
+    config = _background_config(tmp_path, opts)
+    items = [
+        SimpleNamespace(path=tests / "test_a.py"),
+        SimpleNamespace(path=tests / "sub" / "test_b.py"),
+    ]
+    kept = list(items)
+
+    plugin.pytest_collection_modifyitems(config, items)
+
+    assert items == kept
+    config.hook.pytest_deselected.assert_not_called()
+
+
+def test_mirror_changed_git_failure_exits(tmp_path):
+    """An unusable git ref ends the session with the git error."""
+    opts = {
+        "--mirror-package-dir": str(tmp_path / "pkg"),
+        "--mirror-tests-dir": str(tmp_path / "tests"),
+        "--mirror-changed": ["no-such-ref"],
+    }
+    config = _background_config(tmp_path, opts)
+    with pytest.raises(pytest.exit.Exception, match="git rev-parse failed"):
+        plugin.pytest_collection_modifyitems(config, [])
+
+
+def test_mirror_transitive_selects_importers(tmp_path):
+    """--mirror-transitive also keeps the tests of modules importing a change."""
+    from types import SimpleNamespace
+
+    pkg = tmp_path / "pkg"
+    tests = tmp_path / "tests"
+    pkg.mkdir()
+    (pkg / "a.py").write_text("")
+    (pkg / "b.py").write_text("from pkg import a\n")
+    (pkg / "c.py").write_text("")
+    opts = {
+        "--mirror-package-dir": str(pkg),
+        "--mirror-tests-dir": str(tests),
+        "--mirror-changed": ["pkg/a.py"],
+        "--mirror-transitive": True,
+    }
+    config = _background_config(tmp_path, opts)
+    items = [SimpleNamespace(path=tests / f"test_{name}.py") for name in "abc"]
+    kept = items[:2]
+
+    plugin.pytest_collection_modifyitems(config, items)
+
+    assert items == kept
+
+
+def test_mirror_durations_recorded_per_mirrored_test(tmp_path):
+    """Report durations are summed per test file and saved at session end."""
+    from types import SimpleNamespace
+    from unittest.mock import Mock
+
+    from pytest_mirror.cache import default_cache_dir
+    from pytest_mirror.durations import DurationHistory
+
+    opts = {
+        "--mirror-package-dir": str(tmp_path / "pkg"),
+        "--mirror-tests-dir": str(tmp_path / "tests"),
+        "--mirror-durations": True,
+        "--mirror-from-collection": True,
+    }
+    config = _background_config(tmp_path, opts)
+    del config.workerinput
+    session = Mock(config=config)
+
+    plugin.pytest_sessionstart(session)
+    recorder = config.stash[plugin.DURATION_RECORDER_KEY]
+    config.pluginmanager.register.assert_called_once_with(recorder)
+    for nodeid, duration in (
+        ("tests/test_a.py::test_x", 0.25),
+        ("tests/test_a.py::test_y", 0.5),
+        ("tests/sub/test_b.py::TestB::test_z", 1.0),
+        ("conftest_checks.py::test_outside", 2.0),
+    ):
+        recorder.pytest_runtest_logreport(
+            SimpleNamespace(nodeid=nodeid, duration=duration)
+        )
+    plugin.pytest_sessionfinish(session)
+
+    history = DurationHistory(default_cache_dir(tmp_path))
+    assert history.runs == [{"test_a.py": 0.75, "sub/test_b.py": 1.0}]
+
+    worker = _background_config(tmp_path, opts)
+    plugin.pytest_sessionstart(Mock(config=worker))
+    assert plugin.DURATION_RECORDER_KEY not in worker.stash
+
+
+@pytest.mark.parametrize("value", ["1", "0/2", "3/2", "a/b", "-1/2"])
+def test_parse_shard_rejects_invalid_values(value):
+    """Shards are numbered from 1 up to their count."""
+    import argparse
+
+    with pytest.raises(argparse.ArgumentTypeError, match="expected I/N"):
+        plugin._parse_shard(value)
+
+
+def test_mirror_test_shard_deselects_other_shards(tmp_path):
+    """Every test lands in exactly one shard, weighted by the durations file."""
+    from types import SimpleNamespace
+
+    from pytest_mirror.durations import DurationHistory
+
+    tests = tmp_path / "tests"
+    history = DurationHistory(tmp_path / "ci")
+    history.record({"test_a.py": 3.0, "test_b.py": 2.0, "test_c.py": 2.0})
+    history.save()
+    items = [SimpleNamespace(path=tests / f"test_{name}.py") for name in "abc"]
+    shards = []
+    for index in (1, 2):
+        opts = {
+            "--mirror-package-dir": str(tmp_path / "pkg"),
+            "--mirror-tests-dir": str(tests),
+            "--mirror-test-shard": plugin._parse_shard(f"{index}/2"),
+            "--mirror-shard-durations": "ci/durations.json",
+        }
+        config = _background_config(tmp_path, opts)
+        shard = list(items)
+        plugin.pytest_collection_modifyitems(config, shard)
+        shards.append(shard)
+    assert shards == [[items[0]], items[1:]]
+
+
+def test_mirror_test_shard_ignores_cached_durations(tmp_path):
+    """Durations the nodes record into their own cache never move tests."""
+    from types import SimpleNamespace
+
+    from pytest_mirror.cache import default_cache_dir
+    from pytest_mirror.durations import DurationHistory
+
+    tests = tmp_path / "tests"
+    tests.mkdir()
+    for name, size in (("a", 30), ("b", 20), ("c", 20)):
+        (tests / f"test_{name}.py").write_text("#" * size)
+    history = DurationHistory(default_cache_dir(tmp_path))
+    history.record({"test_a.py": 1.0, "test_b.py": 9.0, "test_c.py": 1.0})
+    history.save()
+    items = [SimpleNamespace(path=tests / f"test_{name}.py") for name in "abc"]
+    opts = {
+        "--mirror-package-dir": str(tmp_path / "pkg"),
+        "--mirror-tests-dir": str(tests),
+        "--mirror-test-shard": plugin._parse_shard("1/2"),
+    }
+    config = _background_config(tmp_path, opts)
+    plugin.pytest_collection_modifyitems(config, items)
+    assert [item.path.name for item in items] == ["test_a.py"]
+
+
+def test_mirror_shard_durations_missing_file_exits(tmp_path):
+    """A durations file that cannot be read stops the run."""
+    from types import SimpleNamespace
+
+    opts = {
+        "--mirror-package-dir": str(tmp_path / "pkg"),
+        "--mirror-tests-dir": str(tmp_path / "tests"),
+        "--mirror-test-shard": plugin._parse_shard("1/2"),
+        "--mirror-shard-durations": "missing.json",
+    }
+    config = _background_config(tmp_path, opts)
+    items = [SimpleNamespace(path=tmp_path / "tests" / "test_a.py")]
+    with pytest.raises(pytest.exit.Exception, match="does not exist"):
+        plugin.pytest_collection_modifyitems(config, items)
+
+
+@pytest.mark.parametrize(
+    "files",
+    [
+        {"tests/conftest.py": 'collect_ignore = ["unit"]\n'},
+        {"pytest.ini": "[pytest]\nnorecursedirs = unit\n"},
+        {"conftest.py": HOOK_IGNORING_UNIT},
+    ],
+    ids=["collect_ignore", "norecursedirs", "pytest_ignore_collect"],
+)
+def test_from_collection_walks_tests_pruned_from_collection(tmp_path, files):
+    """Tests pytest was told not to collect still count as present."""
+    import os
+    import subprocess
+    import sys
+    from pathlib import Path
+
+    for name, text in {
+        "pkg/__init__.py": "",
+        "pkg/a.py": "",
+        "pkg/unit/x.py": "",
+        "tests/test_a.py": "def test_a():\n    pass\n",
+        "tests/unit/test_x.py": "def test_x():\n    pass\n",
+        **files,
+    }.items():
+        (tmp_path / name).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / name).write_text(text)
+    src = str(Path(plugin.__file__).parents[1])
+    pythonpath = [src, os.environ.get("PYTHONPATH", "")]
+    result = subprocess.run(
+        [
+            sys.executable,
+            "-m",
+            "pytest",
+            "-p",
+            "pytest_mirror.plugin",
+            "-p",
+            "no:cacheprovider",
+            "--mirror-package-dir=pkg",
+            "--mirror-tests-dir=tests",
+            "--mirror-from-collection",
+            "--mirror-no-generate",
+        ],
+        cwd=tmp_path,
+        capture_output=True,
+        text=True,
+        check=False,
+        env={**os.environ, "PYTHONPATH": os.pathsep.join(filter(None, pythonpath))},
+    )
+    assert result.returncode == 0, result.stdout
+    assert "1 passed" in result.stdout
@@ -0,0 +1,75 @@
+"""Unit tests for pytest_mirror.profiling phase timing."""
+
+import json
+
+import pluggy
+import pytest
+
+from pytest_mirror import profiling
+from pytest_mirror.plugin_manager import get_plugin_manager
+from pytest_mirror.profiling import PhaseProfile
+
+
+@pytest.fixture
+def profile():
+    """Activate a fresh profile for the duration of a test."""
+    profile = PhaseProfile()
+    profiling.activate(profile)
+    yield profile
+    profiling.activate(None)
+
+
+def test_phases_are_exclusive(profile, monkeypatch):
+    """Time in a nested phase is not counted in the enclosing one."""
+    ticks = iter([0.0, 1.0, 3.0, 10.0])
+    monkeypatch.setattr(profiling.time, "perf_counter", lambda: next(ticks))
+    with profiling.phase("outer"), profiling.phase("inner"):
+        pass
+    assert profile.seconds == {"inner": 2.0, "outer": 8.0}
+    assert profile.calls == {"inner": 1, "outer": 1}
+    assert profile.total == 10.0
+
+
+def test_phase_is_noop_when_inactive():
+    """Nothing is recorded while no profile is active."""
+    profiling.activate(None)
+    with profiling.phase("walk"):
+        pass
+    assert profiling.active() is None
+
+
+def test_monitor_hooks_times_each_impl(profile, tmp_path):
+    """Every hook implementation is timed as its own phase."""
+    pm = get_plugin_manager()
+    profile.monitor_hooks(pm)
+    pm.hook.validate_test_structure(
+        package_dir=tmp_path,
+        tests_dir=tmp_path / "tests",
+        test_files=None,
+        stale=False,
+        placeholders=False,
+    )
+    name = profiling.HOOK_PHASE_TEMPLATE.format(
+        hook="validate_test_structure", plugin="mirror_validator"
+    )
+    assert profile.calls[name] == 1
+    assert isinstance(pm.hook.validate_test_structure, pluggy.HookCaller)
+
+
+def test_as_dict_format_lines_and_write_json(tmp_path):
+    """Reports list phases slowest first and round-trip through JSON."""
+    profile = PhaseProfile()
+    profile.add("fast", 0.001)
+    profile.add("slow", 0.5)
+    profile.add("slow", 0.5)
+    lines = profile.format_lines()
+    assert lines[0].startswith("slow") and lines[0].endswith("x2")
+    assert lines[1].startswith("fast")
+    assert lines[-1].startswith("total")
+
+    path = tmp_path / "out" / "profile.json"
+    profile.write_json(path)
+    data = json.loads(path.read_text())
+    assert data == profile.as_dict()
+    assert data["phases"]["slow"] == {"ms": 1000.0, "calls": 2}
+    assert data["total_ms"] == 1001.0
@@ -0,0 +1,117 @@
+"""Unit tests for pytest_mirror.report MirrorReport."""
+
+import tracemalloc
+from pathlib import Path
+
+from pytest_mirror.report import MirrorReport, StaleTest
+
+
+def test_report_sequence_protocol(tmp_path):
+    """Reports index, iterate and compare like lists of full paths."""
+    report = MirrorReport(tmp_path, ["test_a.py", "sub/test_b.py"])
+    expected = [tmp_path / "test_a.py", tmp_path / "sub" / "test_b.py"]
+    assert len(report) == 2
+    assert list(report) == expected
+    assert report[1] == expected[1]
+    assert report[:1] == expected[:1]
+    assert report == expected
+    assert report.to_list() == expected
+    assert report.relative == ("test_a.py", "sub/test_b.py")
+    assert MirrorReport(tmp_path) == []
+    assert not MirrorReport(tmp_path)
+
+
+def test_report_membership(tmp_path):
+    """Membership accepts full paths and root-relative strings."""
+    report = MirrorReport(tmp_path, ["sub/test_b.py"])
+    assert tmp_path / "sub" / "test_b.py" in report
+    assert "sub/test_b.py" in report
+    assert tmp_path / "test_b.py" not in report
+    assert Path("/elsewhere/sub/test_b.py") not in report
+    assert 1 not in report
+
+
+def test_report_combine_rebases_roots(tmp_path):
+    """Reports with nested roots merge under their common root as strings."""
+    merged = MirrorReport.combine(
+        [
+            MirrorReport(tmp_path / "unit", ["test_a.py"]),
+            MirrorReport(tmp_path, ["test_b.py"]),
+        ]
+    )
+    assert merged.root == tmp_path
+    assert merged.relative == ("unit/test_a.py", "test_b.py")
+
+
+def test_report_combine_accepts_lists(tmp_path):
+    """Plain lists from third-party hook implementations are merged too."""
+    merged = MirrorReport.combine(
+        [MirrorReport(tmp_path, ["test_a.py"]), [tmp_path / "x" / "test_b.py"]]
+    )
+    assert merged == [tmp_path / "test_a.py", tmp_path / "x" / "test_b.py"]
+    assert MirrorReport.combine([]) == []
+
+
+def test_report_orphans_merge(tmp_path):
+    """Orphans and placeholders merge alongside entries but are not compared."""
+    merged = MirrorReport.combine(
+        [
+            MirrorReport(tmp_path / "unit", ["test_a.py"], ["test_old.py"]),
+            MirrorReport(tmp_path, [], ["test_gone.py"]),
+        ]
+    )
+    assert merged == [tmp_path / "unit" / "test_a.py"]
+    assert merged.orphans == [
+        tmp_path / "unit" / "test_old.py",
+        tmp_path / "test_gone.py",
+    ]
+    report = MirrorReport.from_paths([], [tmp_path / "x" / "test_old.py"])
+    assert report == []
+    assert report.orphans == [tmp_path / "x" / "test_old.py"]
+    merged = MirrorReport.combine(
+        [
+            MirrorReport(tmp_path / "unit", placeholders=["test_a.py"]),
+            [tmp_path / "test_b.py"],
+        ]
+    )
+    assert merged == [tmp_path / "test_b.py"]
+    assert merged.placeholders == [tmp_path / "unit" / "test_a.py"]
+
+
+def test_report_stale_merge_and_format(tmp_path):
+    """Stale entries from every report are combined and described by age."""
+    old = StaleTest(tmp_path / "a.py", tmp_path / "test_a.py", 90_000.0)
+    new = StaleTest(tmp_path / "b.py", tmp_path / "test_b.py", 5.0)
+    merged = MirrorReport.combine(
+        [MirrorReport(tmp_path, stale=[old]), [], MirrorReport(tmp_path, stale=[new])]
+    )
+    assert merged.stale == (old, new)
+    assert (
+        old.format()
+        == f"{tmp_path / 'a.py'} is 1.0d newer than {tmp_path / 'test_a.py'}"
+    )
+    assert new.format().endswith(f"is 5s newer than {tmp_path / 'test_b.py'}")
+
+
+def test_report_from_mixed_paths():
+    """Absolute and relative paths without a common root are kept whole."""
+    report = MirrorReport.from_paths([Path("/abs/test_a.py"), Path("rel/test_b.py")])
+    assert report == [Path("/abs/test_a.py"), Path("rel/test_b.py")]
+    assert Path("/abs/test_a.py") in report
+
+
+def test_report_smaller_than_path_list(tmp_path):
+    """A report holds entries in a fraction of the memory of a list of paths."""
+    entries = [f"pkg{i % 100}/test_mod{i}.py" for i in range(10_000)]
+
+    def allocated(build):
+        tracemalloc.start()
+        value = build()
+        size = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        del value
+        return size
+
+    report_size = allocated(lambda: MirrorReport(tmp_path, entries))
+    list_size = allocated(lambda: [tmp_path / entry for entry in entries])
+    assert report_size * 5 < list_size
@@ -0,0 +1,217 @@
+"""Unit tests for pytest_mirror.selection."""
+
+import subprocess
+from types import SimpleNamespace
+
+import pytest
+
+from pytest_mirror.imports import ImportGraph
+from pytest_mirror.mapping import get_strategy
+from pytest_mirror.selection import (
+    AffectedTests,
+    ChangedFilesError,
+    changed_files,
+    git_changed_files,
+    mirrored_tests,
+    select_items,
+    shard_items,
+)
+
+
+def _git(cwd, *args):
+    """Run a git command quietly in cwd."""
+    subprocess.run(["git", *args], cwd=cwd, check=True, capture_output=True)
+
+
+@pytest.fixture
+def repo(tmp_path):
+    """Return a git repository with one committed module and test."""
+    _git(tmp_path, "init", "-q")
+    _git(tmp_path, "config", "user.email", "dev@example.com")
+    _git(tmp_path, "config", "user.name", "dev")
+    (tmp_path / "pkg").mkdir()
+    (tmp_path / "tests").mkdir()
+    for name in ("pkg/a.py", "pkg/b.py", "tests/test_a.py", ".gitignore"):
+        (tmp_path / name).write_text("")
+    _git(tmp_path, "add", ".")
+    _git(tmp_path, "commit", "-q", "-m", "initial")
+    return tmp_path
+
+
+def test_git_changed_files(repo):
+    """Modified, staged and untracked files count; ignored ones do not."""
+    (repo / ".gitignore").write_text("*.log\n")
+    (repo / "pkg" / "a.py").write_text("x = 1\n")
+    (repo / "pkg" / "c.py").write_text("")
+    (repo / "debug.log").write_text("")
+    _git(repo, "add", ".gitignore")
+    changed = git_changed_files("HEAD", repo / "pkg")
+    assert sorted(changed) == [
+        repo / ".gitignore",
+        repo / "pkg" / "a.py",
+        repo / "pkg" / "c.py",
+    ]
+
+
+def test_git_changed_files_from_subdirectory(repo):
+    """Untracked files anywhere in the repository count, whatever the cwd."""
+    (repo / "pkg" / "c.py").write_text("")
+    (repo / "tests" / "test_b.py").write_text("")
+    changed = git_changed_files("HEAD", repo / "tests")
+    assert sorted(changed) == [repo / "pkg" / "c.py", repo / "tests" / "test_b.py"]
+
+
+def test_git_changed_files_errors(repo):
+    """Unknown refs are reported as ChangedFilesError."""
+    with pytest.raises(ChangedFilesError, match="git diff failed"):
+        git_changed_files("no-such-ref", repo)
+
+
+def test_changed_files_mixes_refs_and_paths(repo):
+    """Python files and existing paths are files, anything else a ref."""
+    (repo / "pkg" / "b.py").write_text("y = 2\n")
+    assert changed_files(["pkg/gone.py", "HEAD"], repo) == [
+        repo / "pkg" / "gone.py",
+        repo / "pkg" / "b.py",
+    ]
+
+
+def test_mirrored_tests(tmp_path):
+    """Changed modules map onto tests; changed tests select themselves."""
+    pkg = tmp_path / "pkg"
+    tests = tmp_path / "tests"
+    changed = [
+        pkg / "a.py",
+        pkg / "sub" / "b.py",
+        tests / "sub" / "test_c.py",
+        tmp_path / "README.md",
+    ]
+    assert mirrored_tests(changed, pkg, tests, get_strategy("mirror")) == (
+        AffectedTests(frozenset({"test_a.py", "sub/test_b.py", "sub/test_c.py"}))
+    )
+    affected = mirrored_tests(
+        [tests / "a" / "test_other.py"], pkg, tests, get_strategy("package")
+    )
+    assert affected.tests == {"a/test_a.py"}
+
+
+@pytest.mark.parametrize(
+    "changed,dirs,everything",
+    [
+        ("tests/conftest.py", ("",), False),
+        ("tests/sub/helpers.py", ("sub/",), False),
+        ("tests/sub/data/input.json", ("sub/data/",), False),
+        ("pkg/__init__.py", (), True),
+        ("pkg/templates/page.html", (), True),
+        ("conftest.py", (), True),
+        ("pyproject.toml", (), True),
+        ("docs/index.md", (), False),
+    ],
+)
+def test_mirrored_tests_fail_safe(tmp_path, changed, dirs, everything):
+    """Changes the mapping cannot attribute select more tests, never fewer."""
+    affected = mirrored_tests(
+        [tmp_path / changed], tmp_path / "pkg", tmp_path / "tests", get_strategy()
+    )
+    assert affected == AffectedTests(frozenset(), dirs, everything)
+
+
+def test_mirrored_tests_unmapped_module_selects_everything(tmp_path):
+    """A module the mapping leaves unmirrored may be used by any test."""
+    strategy = get_strategy({"pattern": r"api/(?P<name>.*)", "template": "{name}"})
+    pkg = tmp_path / "pkg"
+    affected = mirrored_tests([pkg / "util.py"], pkg, tmp_path / "tests", strategy)
+    assert affected.everything
+
+
+def test_mirrored_tests_through_import_graph(tmp_path):
+    """With a graph, the modules importing a changed one select their tests."""
+    pkg = tmp_path / "pkg"
+    graph = ImportGraph("pkg", ["a.py", "b.py", "c.py"], [[1], [], []])
+    affected = mirrored_tests(
+        [pkg / "a.py"], pkg, tmp_path / "tests", get_strategy("mirror"), graph
+    )
+    assert affected.tests == {"test_a.py", "test_b.py"}
+
+
+def test_select_items(tmp_path):
+    """Items are split by their file, in collection order."""
+    tests = tmp_path / "tests"
+    items = [
+        SimpleNamespace(path=tests / "test_a.py"),
+        SimpleNamespace(path=tests / "test_b.py"),
+        SimpleNamespace(path=tests / "test_a.py"),
+        SimpleNamespace(path=tmp_path / "pkg" / "a.py"),
+        SimpleNamespace(path=tests / "sub" / "test_c.py"),
+    ]
+    strategy = get_strategy("mirror")
+    selected, deselected = select_items(
+        items, tests, strategy, AffectedTests(frozenset({"test_a.py"}), ("sub/",))
+    )
+    assert selected == [items[0], items[2], items[4]]
+    assert deselected == [items[1], items[3]]
+    selected, deselected = select_items(
+        items, tests, strategy, AffectedTests(frozenset(), everything=True)
+    )
+    assert selected == items
+    assert deselected == []
+
+
+def _shards(items, tests, strategy, count, durations=None):
+    """Return the file names of each shard's items."""
+    return [
+        [
+            item.path.name
+            for item in shard_items(items, tests, strategy, i, count, durations)[0]
+        ]
+        for i in range(1, count + 1)
+    ]
+
+
+def test_shard_items_balances_recorded_durations(tmp_path):
+    """Heaviest modules go first, each to the least loaded shard."""
+    tests = tmp_path / "tests"
+    items = [SimpleNamespace(path=tests / f"test_{name}.py") for name in "abcde"]
+    durations = {
+        "test_a.py": 1.0,
+        "test_b.py": 5.0,
+        "test_c.py": 3.0,
+        "test_d.py": 3.0,
+        "test_e.py": 2.0,
+    }
+    strategy = get_strategy("mirror")
+    assert _shards(items, tests, strategy, 2, durations) == [
+        ["test_b.py", "test_e.py"],
+        ["test_a.py", "test_c.py", "test_d.py"],
+    ]
+    _, deselected = shard_items(items, tests, strategy, 2, 2, durations)
+    assert deselected == [items[1], items[4]]
+    assert _shards(items, tests, strategy, 7, durations)[5:] == [[], []]
+
+
+def test_shard_items_keeps_modules_together_and_falls_back_to_size(tmp_path):
+    """A module's test files share a shard; unrecorded ones are sized."""
+    tests = tmp_path / "tests"
+    (tests / "a").mkdir(parents=True)
+    (tests / "a" / "test_one.py").write_text("x" * 10)
+    (tests / "a" / "test_two.py").write_text("x" * 10)
+    (tests / "test_b.py").write_text("x" * 30)
+    (tests / "test_c.py").write_text("x" * 15)
+    items = [
+        SimpleNamespace(path=tests / "a" / "test_one.py"),
+        SimpleNamespace(path=tests / "test_b.py"),
+        SimpleNamespace(path=tests / "a" / "test_two.py"),
+        SimpleNamespace(path=tests / "test_c.py"),
+    ]
+    strategy = get_strategy("package")
+    assert _shards(items, tests, strategy, 2) == [
+        ["test_b.py"],
+        ["test_one.py", "test_two.py", "test_c.py"],
+    ]
+    # Recorded groups take 3.5s for 50 bytes, so test_c.py is estimated at 1.05s.
+    durations = {"test_b.py": 2.0, "a/test_a.py": 1.5}
+    assert _shards(items, tests, strategy, 3, durations) == [
+        ["test_b.py"],
+        ["test_one.py", "test_two.py"],
+        ["test_c.py"],
+    ]
@@ -0,0 +1,76 @@
+"""Unit tests for pytest_mirror.stubs rendering."""
+
+import pytest
+
+from pytest_mirror.constants import DEFAULT_TEST_CONTENT
+from pytest_mirror.stubs import is_placeholder, render_skeleton, render_stubs
+from pytest_mirror.symbols import ModuleSymbols
+
+
+def test_render_skeleton_one_test_per_symbol():
+    """Each public function or class gets its own failing test."""
+    content = render_skeleton(
+        ModuleSymbols(("load",), ("MyWidget",)), "from pkg import mod"
+    )
+    compile(content, "<skeleton>", "exec")
+    assert "from pkg import mod" in content
+    assert "def test_load():" in content
+    assert "def test_my_widget():" in content
+    assert content.count("assert False") == 2
+
+
+def test_render_skeleton_without_symbols():
+    """Modules without public symbols fall back to the placeholder."""
+    assert render_skeleton(ModuleSymbols()) == DEFAULT_TEST_CONTENT
+
+
+def test_render_stubs_modes(tmp_path):
+    """Placeholder mode skips parsing; ast mode renders per-module skeletons."""
+    pkg = tmp_path / "pkg"
+    (pkg / "sub").mkdir(parents=True)
+    (pkg / "sub" / "mod.py").write_text("def run(): ...\n")
+    assert render_stubs(pkg, ["sub/mod.py"]) == [DEFAULT_TEST_CONTENT]
+    [content] = render_stubs(pkg, ["sub/mod.py"], "ast", cache_dir=tmp_path / "c")
+    assert "from pkg.sub import mod" in content
+    assert "def test_run():" in content
+    assert (tmp_path / "c" / "symbols.json").exists()
+
+
+def test_render_stubs_unknown_mode(tmp_path):
+    """Unknown stub modes are rejected."""
+    with pytest.raises(ValueError, match="Unknown stub mode"):
+        render_stubs(tmp_path, ["a.py"], "fancy")
+
+
+def test_is_placeholder(tmp_path):
+    """Only unmodified stubs, with either line ending, match."""
+    stub = tmp_path / "test_stub.py"
+    stub.write_bytes(DEFAULT_TEST_CONTENT.encode())
+    crlf = tmp_path / "test_crlf.py"
+    crlf.write_bytes(DEFAULT_TEST_CONTENT.replace("\n", "\r\n").encode())
+    edited = tmp_path / "test_edited.py"
+    edited.write_text(DEFAULT_TEST_CONTENT + "\n\ndef test_real():\n    pass\n")
+    same_size = tmp_path / "test_same_size.py"
+    same_size.write_text(DEFAULT_TEST_CONTENT.replace("False", "True "))
+    assert is_placeholder(stub)
+    assert is_placeholder(crlf)
+    assert not is_placeholder(edited)
+    assert not is_placeholder(same_size)
+    assert not is_placeholder(tmp_path / "test_missing.py")
+
+
+def test_is_placeholder_skips_reads_on_size_mismatch(tmp_path, monkeypatch):
+    """A known size that differs from the stub's rules the file out unread."""
+    from pathlib import Path
+
+    stub = tmp_path / "test_stub.py"
+    stub.write_text(DEFAULT_TEST_CONTENT)
+    reads = []
+    real = Path.read_bytes
+    monkeypatch.setattr(
+        Path, "read_bytes", lambda self: reads.append(self) or real(self)
+    )
+    assert not is_placeholder(stub, size=1)
+    assert reads == []
+    assert is_placeholder(stub, size=stub.stat().st_size)
+    assert reads == [stub]
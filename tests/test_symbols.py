@@ -0,0 +1,118 @@
+"""Unit tests for pytest_mirror.symbols extraction and caching."""
+
+import pytest
+
+from pytest_mirror import symbols
+from pytest_mirror.symbols import (
+    ModuleSymbols,
+    SymbolCache,
+    extract_symbols,
+    index_test_names,
+    parse_modules,
+    snake_case,
+    untested_symbols,
+)
+
+SOURCE = b"""
+import os
+
+def public(): ...
+async def fetch(): ...
+def _private(): ...
+class Widget:
+    def run(self): ...
+    def _helper(self): ...
+    def __init__(self): ...
+class _Hidden:
+    def run(self): ...
+VALUE = 1
+"""
+
+
+def test_extract_symbols_public_only():
+    """Only public functions, classes and methods of public classes count."""
+    assert extract_symbols(SOURCE) == ModuleSymbols(
+        ("public", "fetch"), ("Widget",), ("Widget.run",)
+    )
+
+
+def test_extract_symbols_syntax_error():
+    """Unparseable modules have no symbols."""
+    assert extract_symbols(b"def broken(:\n") == ModuleSymbols()
+
+
+def test_symbol_cache_persists(tmp_path):
+    """Saved entries are visible to a new cache instance."""
+    cache = SymbolCache(tmp_path)
+    cache.put("key", ModuleSymbols(("f",), ("C",), ("C.m",)))
+    cache.save()
+    assert SymbolCache(tmp_path).get("key") == ModuleSymbols(("f",), ("C",), ("C.m",))
+
+
+def test_parse_modules_uses_cache(tmp_path, monkeypatch):
+    """Unchanged modules are not parsed again on a warm cache."""
+    a = tmp_path / "a.py"
+    b = tmp_path / "b.py"
+    a.write_bytes(SOURCE)
+    b.write_bytes(SOURCE)
+    calls = []
+    real = symbols.extract_symbols
+    monkeypatch.setattr(
+        symbols, "extract_symbols", lambda d: calls.append(d) or real(d)
+    )
+
+    cache = SymbolCache(tmp_path / "cache")
+    result = parse_modules([a, b], cache, workers=1)
+    assert result[0] == result[1] == extract_symbols(SOURCE)
+    assert len(calls) == 1  # identical contents parse once
+    cache.save()
+
+    calls.clear()
+    warm = SymbolCache(tmp_path / "cache")
+    assert parse_modules([a, b], warm, workers=1) == result
+    assert calls == []
+
+
+def test_parse_modules_process_pool(tmp_path, monkeypatch):
+    """Large batches of cache misses are parsed in a process pool."""
+    monkeypatch.setattr(symbols, "PARALLEL_PARSE_THRESHOLD", 2)
+    paths = []
+    for i in range(3):
+        path = tmp_path / f"m{i}.py"
+        path.write_text(f"def func_{i}(): ...\n")
+        paths.append(path)
+    result = parse_modules(paths, SymbolCache(tmp_path / "cache"), workers=2)
+    assert [s.functions for s in result] == [("func_0",), ("func_1",), ("func_2",)]
+
+
+@pytest.mark.parametrize(
+    "name,expected",
+    [("Widget", "widget"), ("MyWidget", "my_widget"), ("HTTPServer", "http_server")],
+)
+def test_snake_case(name, expected):
+    """Class names become snake_case test names."""
+    assert snake_case(name) == expected
+
+
+def test_untested_symbols_matching_rules():
+    """Tests match by name prefix at word boundaries, per symbol kind."""
+    source = ModuleSymbols(
+        ("load", "save", "loader"),
+        ("Widget", "Gadget", "MyThing"),
+        ("Widget.run", "Widget.stop", "Gadget.spin"),
+    )
+    tests = ModuleSymbols(
+        ("test_load_missing_file", "test_my_thing", "test_gadget_spin_fast"),
+        ("TestWidgetEdgeCases",),
+        ("TestWidgetEdgeCases.test_run",),
+    )
+    tokens = index_test_names([tests])
+    assert untested_symbols(source, tokens) == ["save", "loader", "Widget.stop"]
+
+
+def test_index_test_names_ignores_non_tests():
+    """Helpers and non-Test classes in test modules are not test names."""
+    tokens = index_test_names(
+        [ModuleSymbols(("helper",), ("Widget",), ("Widget.test_x",))]
+    )
+    assert tokens == set()
@@ -3,7 +3,8 @@
 Tests detection of missing test files, __init__.py handling, and nested modules.
 """
 
-from pytest_mirror.validator import MirrorValidator
+from pytest_mirror.report import MirrorReport
+from pytest_mirror.validator import MirrorValidator, hookimpl
 
 
 def test_validate_test_structure_finds_missing(tmp_path, create_file):
@@ -13,7 +14,7 @@ def test_validate_test_structure_finds_missing(tmp_path, create_file):
     foo = pkg / "foo.py"
     create_file(foo)
     validator = MirrorValidator()
-    missing = validator.validate_test_structure(pkg, tests)
+    missing = validator.validate_test_structure(pkg, tests, None, False, False)
     assert len(missing) == 1
     assert missing[0] == tests / "test_foo.py"
 
@@ -24,7 +25,7 @@ def test_validate_test_structure_ignores_init(tmp_path, create_file):
     tests = tmp_path / "tests"
     create_file(pkg / "__init__.py")
     validator = MirrorValidator()
-    missing = validator.validate_test_structure(pkg, tests)
+    missing = validator.validate_test_structure(pkg, tests, None, False, False)
     assert missing == []
 
 
@@ -36,7 +37,7 @@ def test_validate_test_structure_nested(tmp_path, create_file):
     foo = sub / "foo.py"
     create_file(foo)
     validator = MirrorValidator()
-    missing = validator.validate_test_structure(pkg, tests)
+    missing = validator.validate_test_structure(pkg, tests, None, False, False)
     assert missing == [tests / "sub" / "test_foo.py"]
 
 
@@ -47,7 +48,7 @@ def test_validate_test_structure_empty_dirs(tmp_path):
     pkg.mkdir()
     tests.mkdir()
     validator = MirrorValidator()
-    missing = validator.validate_test_structure(pkg, tests)
+    missing = validator.validate_test_structure(pkg, tests, None, False, False)
     assert missing == []
 
 
@@ -58,7 +59,7 @@ def test_validate_test_structure_non_py_files(tmp_path):
     (pkg / "foo.txt").parent.mkdir(parents=True, exist_ok=True)
     (pkg / "foo.txt").write_text("not python")
     validator = MirrorValidator()
-    missing = validator.validate_test_structure(pkg, tests)
+    missing = validator.validate_test_structure(pkg, tests, None, False, False)
     assert missing == []
 
 
@@ -72,7 +73,7 @@ def test_validate_test_structure_test_file_exists(tmp_path, create_file):
     test_file.parent.mkdir(parents=True, exist_ok=True)
     test_file.write_text("# test\n")
     validator = MirrorValidator()
-    missing = validator.validate_test_structure(pkg, tests)
+    missing = validator.validate_test_structure(pkg, tests, None, False, False)
     assert missing == []
 
 
@@ -99,8 +100,8 @@ class TestValidatorCoverage:
         pkg, tests = project_structure(tmp_path)
         v = MirrorValidator()
 
-        result = v.validate_test_structure(pkg, tests)
-        assert isinstance(result, list)
+        result = v.validate_test_structure(pkg, tests, None, False, False)
+        assert isinstance(result, MirrorReport)
         assert all(isinstance(path, Path) for path in result)
 
     def test_validator_with_missing_dirs(self, tmp_path):
@@ -112,7 +113,9 @@ class TestValidatorCoverage:
 
         # Should raise FileNotFoundError for missing package dir
         with pytest.raises(FileNotFoundError):
-            v.validate_test_structure(nonexistent, tmp_path / "tests")
+            v.validate_test_structure(
+                nonexistent, tmp_path / "tests", None, False, False
+            )
 
     def test_validator_has_hookimpl_decorator(self):
         """Test that validator method has hookimpl decorator."""
@@ -130,3 +133,38 @@ class TestValidatorCoverage:
         assert hasattr(validator, "hookimpl")
         assert hasattr(validator.hookimpl, "project_name")
         assert validator.hookimpl.project_name == "pytest_mirror"
+
+
+class _SpecMapper:
+    """Third-party plugin mapping sources to ``spec_<name>.py`` in one call."""
+
+    def __init__(self):
+        self.calls = 0
+
+    @hookimpl
+    def mirror_map_test_paths(self, package_dir, tests_dir, source_paths):
+        self.calls += 1
+        return [f"spec_{path.rpartition('/')[2]}" for path in source_paths]
+
+
+def test_validate_test_structure_uses_mapping_hook(tmp_path, create_file):
+    """A mirror_map_test_paths implementation replaces the default mapping."""
+    from pytest_mirror.plugin_manager import get_plugin_manager
+
+    pkg = tmp_path / "pkg"
+    tests = tmp_path / "tests"
+    for name in ["a.py", "sub/b.py", "sub/c.py"]:
+        create_file(pkg / name)
+    create_file(tests / "spec_a.py")
+    pm = get_plugin_manager()
+    mapper = _SpecMapper()
+    pm.register(mapper)
+    missing = pm.hook.validate_test_structure(
+        package_dir=pkg,
+        tests_dir=tests,
+        test_files=None,
+        stale=False,
+        placeholders=False,
+    )
+    assert missing == [[tests / "spec_b.py", tests / "spec_c.py"]]
+    assert mapper.calls == 1
@@ -0,0 +1,115 @@
+"""Unit tests for pytest_mirror.walker.TreeWalker."""
+
+import pytest
+
+from pytest_mirror.walker import FileLimitExceeded, SymlinkPolicy, TreeWalker
+
+
+def _touch(path):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text("# dummy\n")
+
+
+def test_iter_files_sorted_relative_paths(tmp_path):
+    """Files are yielded as sorted POSIX paths relative to the root."""
+    for rel in ["b.py", "a.py", "sub/c.py", "notes.txt"]:
+        _touch(tmp_path / rel)
+    walker = TreeWalker()
+    assert [rel for rel, _ in walker.iter_files(tmp_path)] == [
+        "a.py",
+        "b.py",
+        "sub/c.py",
+    ]
+
+
+def test_iter_files_prunes_gitignored_dirs(tmp_path):
+    """Ignored directories are pruned before descending and counted."""
+    (tmp_path / ".gitignore").write_text(".venv/\nbuild\n")
+    _touch(tmp_path / "mod.py")
+    _touch(tmp_path / ".venv" / "lib" / "site.py")
+    _touch(tmp_path / "build" / "lib" / "mod.py")
+    walker = TreeWalker()
+    assert [rel for rel, _ in walker.iter_files(tmp_path)] == ["mod.py"]
+    assert walker.dirs_pruned == 2
+    assert walker.dirs_scanned == 1
+
+
+def test_iter_files_nested_gitignore(tmp_path):
+    """A nested .gitignore applies relative to its own directory."""
+    _touch(tmp_path / "sub" / "gen" / "x.py")
+    _touch(tmp_path / "gen" / "y.py")
+    (tmp_path / "sub" / ".gitignore").write_text("/gen\n")
+    walker = TreeWalker()
+    assert [rel for rel, _ in walker.iter_files(tmp_path)] == ["gen/y.py"]
+
+
+def test_iter_files_without_gitignore(tmp_path):
+    """respect_gitignore=False walks ignored directories too."""
+    (tmp_path / ".gitignore").write_text("build\n")
+    _touch(tmp_path / "build" / "mod.py")
+    walker = TreeWalker(respect_gitignore=False)
+    assert [rel for rel, _ in walker.iter_files(tmp_path)] == ["build/mod.py"]
+
+
+def test_iter_files_missing_root(tmp_path):
+    """A missing root yields nothing."""
+    assert list(TreeWalker().iter_files(tmp_path / "missing")) == []
+
+
+def _symlink(link, target):
+    try:
+        link.symlink_to(target, target_is_directory=True)
+    except (OSError, NotImplementedError):
+        pytest.skip("Symlinks not supported or insufficient privileges.")
+
+
+def test_symlink_cycle_scanned_once(tmp_path):
+    """A link back to an ancestor never rescans the tree."""
+    _touch(tmp_path / "sub" / "mod.py")
+    _symlink(tmp_path / "sub" / "loop", tmp_path)
+    for policy in SymlinkPolicy:
+        walker = TreeWalker(symlinks=policy)
+        assert [rel for rel, _ in walker.iter_files(tmp_path)] == ["sub/mod.py"]
+        assert walker.dirs_scanned == 2
+
+
+def test_symlink_to_real_dir_prefers_real_path(tmp_path):
+    """A linked directory that is also reachable directly is reported once."""
+    _touch(tmp_path / "z_shared" / "util.py")
+    _symlink(tmp_path / "a_link", tmp_path / "z_shared")
+    walker = TreeWalker(symlinks=SymlinkPolicy.FOLLOW)
+    assert [rel for rel, _ in walker.iter_files(tmp_path)] == ["z_shared/util.py"]
+    assert walker.links_skipped == 1
+
+
+def test_symlink_policies(tmp_path):
+    """The skip policy ignores links; follow-once stops at nested links."""
+    root = tmp_path / "root"
+    _touch(root / "mod.py")
+    _touch(tmp_path / "outer" / "a.py")
+    _touch(tmp_path / "inner" / "b.py")
+    _symlink(root / "outer", tmp_path / "outer")
+    _symlink(tmp_path / "outer" / "inner", tmp_path / "inner")
+
+    def walk(policy):
+        return [rel for rel, _ in TreeWalker(symlinks=policy).iter_files(root)]
+
+    assert walk("skip") == ["mod.py"]
+    assert walk("follow-once") == ["mod.py", "outer/a.py"]
+    assert walk("follow") == ["mod.py", "outer/a.py", "outer/inner/b.py"]
+
+
+def test_invalid_symlink_policy():
+    """Unknown policy names are rejected."""
+    with pytest.raises(ValueError):
+        TreeWalker(symlinks="sometimes")
+
+
+def test_iter_files_file_limit(tmp_path):
+    """Walks abort once more files than max_files have been listed."""
+    for rel in ["a.py", "b.txt", "sub/c.py"]:
+        _touch(tmp_path / rel)
+    assert len(list(TreeWalker(max_files=3).iter_files(tmp_path))) == 2
+    assert len(list(TreeWalker(max_files=0).iter_files(tmp_path))) == 2
+    with pytest.raises(FileLimitExceeded, match="more than 2 files"):
+        list(TreeWalker(max_files=2).iter_files(tmp_path))